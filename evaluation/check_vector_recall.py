@@ -0,0 +1,96 @@
+"""
+Recall guard for the approximate vector index.
+Runs the golden dataset questions through match_documents (HNSW index) and
+match_documents_exact (full float32 cosine scan, migration 008) and fails
+if the index misses too many of the exact top-k chunks.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Add the root path so Python can find the 'src' module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.graph.container import ServiceContainer
+
+GOLDEN_DATASET_PATH = "evaluation/golden_dataset.json"
+
+
+def recall_at_k(approximate_ids: list, exact_ids: list) -> float:
+    """
+    Fraction of the exact top-k found by the approximate search.
+
+    Args:
+        approximate_ids: Chunk ids returned by the index
+        exact_ids: Chunk ids of the exact top-k
+
+    Returns:
+        Recall in [0, 1] (1.0 if the exact search returned nothing)
+    """
+    if not exact_ids:
+        return 1.0
+    return len(set(approximate_ids) & set(exact_ids)) / len(exact_ids)
+
+
+def measure_recall(questions: list[str], k: int) -> list[float]:
+    """
+    Measures recall@k of the index for each question.
+
+    Args:
+        questions: Questions to embed and search
+        k: Results compared per question
+
+    Returns:
+        Recall per question
+    """
+    container = ServiceContainer()
+    recalls = []
+    for question in questions:
+        params = {
+            "query_embedding": container.embeddings.embed_query(question),
+            "match_count": k,
+        }
+        approximate = container.supabase.rpc("match_documents", params).execute()
+        exact = container.supabase.rpc("match_documents_exact", params).execute()
+        recalls.append(
+            recall_at_k(
+                [row["id"] for row in approximate.data or []],
+                [row["id"] for row in exact.data or []],
+            )
+        )
+    return recalls
+
+
+def main() -> None:
+    """Entry point: prints recall@k and exits non-zero below the minimum."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-k", type=int, default=5, help="Results per question")
+    parser.add_argument(
+        "--min-recall",
+        type=float,
+        default=0.95,
+        help="Minimum mean recall@k required to pass",
+    )
+    parser.add_argument("--dataset", default=GOLDEN_DATASET_PATH)
+    args = parser.parse_args()
+
+    with open(args.dataset, "r", encoding="utf-8") as f:
+        questions = [item["question"] for item in json.load(f)]
+
+    recalls = measure_recall(questions, args.k)
+    mean_recall = sum(recalls) / len(recalls) if recalls else 1.0
+
+    print(f"Questions: {len(recalls)}")
+    print(f"Mean recall@{args.k}: {mean_recall:.2%}")
+    print(f"Worst recall@{args.k}: {min(recalls, default=1.0):.2%}")
+
+    if mean_recall < args.min_recall:
+        print(f"FAILED: below the required {args.min_recall:.2%}")
+        sys.exit(1)
+    print("PASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,48 +2,105 @@
 Main entry point for the medical chatbot LangGraph agent.
 Compatible with LangGraph Studio and console execution.
 Uses async/await for all LLM operations.
+
+Usage:
+    python graph.py                          # console chat
+    python graph.py --visualize graph.mmd    # write Mermaid source (offline)
+    python graph.py --visualize graph.png    # render PNG (remote mermaid.ink)
 """
 
 import uuid
 import asyncio
+import argparse
+from functools import lru_cache
 from langchain_core.messages import HumanMessage, AIMessage
 from src import config
 from src.graph.builder import build_graph
+from src.graph.background import BackgroundSummarizer
+from src.graph.container import ServiceContainer
+from src.database.checkpointer import BoundedMemorySaver, open_checkpointer
 from src.utils.logger import configure_logging, get_logger, set_correlation_id
+from src.utils.executors import shutdown_executors
+from src.utils.metrics import MetricsTracker, ThreadMetrics
 
 # Configure structured logging
 configure_logging(level="INFO", use_structured=False)  # Use simple logs for console
 
 logger = get_logger(__name__)
 
-logger.info("graph_build_started", mode="studio")
-app = build_graph(with_checkpointer=False)
-logger.info("graph_build_completed", mode="studio")
+# Shared by every graph in this process; components are built on first use
+container = ServiceContainer()
+
+
+@lru_cache(maxsize=1)
+def get_app():
+    """
+    Returns the Studio graph (no checkpointer, the platform provides one),
+    compiling it on first call. Registered in studio/langgraph.json.
+    """
+    logger.info("graph_build_started", mode="studio")
+    studio_app = build_graph(container=container)
+    logger.info("graph_build_completed", mode="studio")
+    return studio_app
 
-console_app = build_graph(with_checkpointer=True)
-logger.info("graph_build_completed", mode="console", checkpointer=True)
+
+def __getattr__(name: str):
+    """Builds `app` lazily so importing this module stays cheap."""
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def run_console_chat():
-    """Async main loop for console chat interaction."""
+    """
+    Async main loop for console chat interaction.
+    Opens the configured checkpointer (memory, postgres, or sqlite) for the
+    whole session and builds the console graph on top of it.
+    """
     logger.info("console_mode_started")
     config.check_env_vars()
 
-    logger.info("graph_visualization_started")
-    try:
-        png_bytes = console_app.get_graph().draw_mermaid_png()
-        with open("graph.png", "wb") as f:
-            f.write(png_bytes)
-        logger.info("graph_visualization_saved", file="graph.png")
-    except Exception as e:
-        logger.warning("graph_visualization_failed", error=str(e))
-
+    async with open_checkpointer() as checkpointer:
+        console_app = build_graph(
+            checkpointer=checkpointer,
+            container=container,
+            background_summarization=config.BACKGROUND_SUMMARIZATION,
+        )
+        logger.info(
+            "graph_build_completed",
+            mode="console",
+            checkpointer=config.CHECKPOINTER_BACKEND,
+            background_summarization=config.BACKGROUND_SUMMARIZATION,
+        )
+        summarizer = (
+            BackgroundSummarizer(console_app, container.memory_service)
+            if config.BACKGROUND_SUMMARIZATION
+            else None
+        )
+        try:
+            await _chat_loop(console_app, summarizer)
+        finally:
+            if summarizer is not None:
+                await summarizer.aclose()
+            await container.aclose()
+            shutdown_executors()
+
+
+async def _chat_loop(console_app, summarizer: BackgroundSummarizer | None = None):
+    """
+    Reads questions from stdin and streams the graph's answers.
+
+    Args:
+        console_app: Compiled graph with a checkpointer
+        summarizer: Background summarizer, or None to summarize inside turns
+    """
     logger.info("medical_bot_initialized", version="async_production")
     thread_id = str(uuid.uuid4())
     set_correlation_id(thread_id)
     logger.info("conversation_started", thread_id=thread_id)
 
     run_config = {"configurable": {"thread_id": thread_id}}
+    thread_metrics = ThreadMetrics(thread_id)
 
     print("\n" + "=" * 60)
     print("Medical Chatbot (Async) - Type 'exit' or 'quit' to stop")
@@ -51,15 +108,22 @@ async def run_console_chat():
 
     while True:
         try:
-            question = input("\nYour question: ")
+            # Read in a worker thread so background summaries keep running
+            question = await asyncio.to_thread(input, "\nYour question: ")
             if question.lower() in ["exit", "quit"]:
                 break
 
             inputs = {"messages": [HumanMessage(content=question)]}
 
             print("\n--- Processing... ---")
+            if summarizer is not None:
+                await summarizer.wait(run_config)
+            tracker = MetricsTracker()
             async for event in console_app.astream(
-                inputs, config=run_config, stream_mode="values"
+                inputs,
+                config=run_config,
+                stream_mode="values",
+                durability=config.CHECKPOINT_DURABILITY,
             ):
                 if "intent" in event and event["intent"]:
                     print(f"-> Intent: {event['intent']}")
@@ -68,6 +132,14 @@ async def run_console_chat():
                 if isinstance(last_message, AIMessage) and not last_message.tool_calls:
                     print(f"\nBot Response:\n{last_message.content}")
 
+            thread_metrics.add_turn(tracker.finalize())
+            if summarizer is not None:
+                summarizer.schedule(run_config)
+            if isinstance(console_app.checkpointer, BoundedMemorySaver):
+                logger.info(
+                    "checkpointer_stats", **console_app.checkpointer.get_stats()
+                )
+
         except KeyboardInterrupt:
             logger.info("conversation_interrupted_by_user")
             break
@@ -76,9 +148,45 @@ async def run_console_chat():
             print(f"\nError: {e}")
             break
 
+    thread_metrics.summary()
     logger.info("conversation_ended", thread_id=thread_id)
     print("\nGoodbye! Take care.")
 
 
+def visualize_graph(path: str) -> None:
+    """
+    Writes a diagram of the agent graph. ".png" paths are rendered by the
+    remote mermaid.ink service; any other path gets the Mermaid source,
+    which needs no network access.
+
+    Args:
+        path: Output file (e.g., "graph.mmd" or "graph.png")
+    """
+    drawable = build_graph(container=container).get_graph()
+    if path.endswith(".png"):
+        with open(path, "wb") as f:
+            f.write(drawable.draw_mermaid_png())
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(drawable.draw_mermaid())
+    logger.info("graph_visualization_saved", file=path)
+
+
+def main() -> None:
+    """Parses command-line options and runs the selected mode."""
+    parser = argparse.ArgumentParser(description="Medical chatbot console")
+    parser.add_argument(
+        "--visualize",
+        metavar="PATH",
+        help="Write the graph diagram to PATH (.mmd offline, .png remote) and exit",
+    )
+    args = parser.parse_args()
+
+    if args.visualize:
+        visualize_graph(args.visualize)
+    else:
+        asyncio.run(run_console_chat())
+
+
 if __name__ == "__main__":
-    asyncio.run(run_console_chat())
+    main()
@@ -17,6 +17,7 @@ from src.models.embeddings import get_embeddings_model
 from src.services.pdf_service import PDFService
 from src.services.chunking_service import ChunkingService
 from src.services.ingestion_service import IngestionService, IngestionError
+from src.utils.metrics import MetricsTracker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +25,13 @@ logging.basicConfig(
 )
 
 
+def _markdown_path(pdf_filename: str) -> str:
+    """Cached markdown path of a PDF for the configured parsing model."""
+    model_slug = config.PDF_PARSE_MODEL.replace(".", "-")
+    md_filename = f"parsed_by_{model_slug}_{pdf_filename.replace('.pdf', '.md')}"
+    return os.path.join(config.MARKDOWN_PATH, md_filename)
+
+
 def main() -> int:
     """
     Main CLI entry point for ingestion pipeline.
@@ -35,9 +43,21 @@ def main() -> int:
         description="Ingest medicine leaflet PDF into RAG database"
     )
     parser.add_argument(
-        "pdf_filename",
+        "pdf_filenames",
         type=str,
-        help="PDF filename (must be in data/ folder)",
+        nargs="*",
+        help="PDF filenames (must be in data/ folder)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Ingest every PDF in data/ (e.g., to re-chunk the catalogue)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes chunking documents in parallel (default: 1, inline)",
     )
     parser.add_argument(
         "--force-reparse",
@@ -69,7 +89,10 @@ def main() -> int:
             api_key=config.GOOGLE_API_KEY,
         )
 
-        chunking_service = ChunkingService(window_size=2)
+        chunking_service = ChunkingService(
+            window_size=2,
+            sentence_splitter=config.CHUNKING_SENTENCE_SPLITTER,
+        )
 
         ingestion_service = IngestionService(
             pdf_service=pdf_service,
@@ -78,28 +101,58 @@ def main() -> int:
             supabase_client=supabase,
         )
 
-        pdf_path = os.path.join(config.DATA_PATH, args.pdf_filename)
-        if not os.path.exists(pdf_path):
-            logging.error(f"PDF file not found: {pdf_path}")
+        pdf_filenames = (
+            sorted(f for f in os.listdir(config.DATA_PATH) if f.endswith(".pdf"))
+            if args.all
+            else args.pdf_filenames
+        )
+        if not pdf_filenames:
+            logging.error("No PDF given (pass filenames or --all)")
             return 1
 
-        model_slug = config.PDF_PARSE_MODEL.replace(".", "-")
-        md_filename = f"parsed_by_{model_slug}_{args.pdf_filename.replace('.pdf', '.md')}"
-        markdown_path = os.path.join(config.MARKDOWN_PATH, md_filename)
-
-        stats = ingestion_service.run_pipeline(
-            pdf_path=pdf_path,
-            markdown_path=markdown_path,
-            force_reparse=args.force_reparse,
-        )
+        documents = []
+        for pdf_filename in pdf_filenames:
+            pdf_path = os.path.join(config.DATA_PATH, pdf_filename)
+            if not os.path.exists(pdf_path):
+                logging.error(f"PDF file not found: {pdf_path}")
+                return 1
+            documents.append((pdf_path, _markdown_path(pdf_filename)))
+
+        tracker = MetricsTracker()
+        if len(documents) == 1:
+            results = [
+                ingestion_service.run_pipeline(
+                    pdf_path=documents[0][0],
+                    markdown_path=documents[0][1],
+                    force_reparse=args.force_reparse,
+                )
+            ]
+        else:
+            results = ingestion_service.run_pipelines(
+                documents,
+                max_workers=args.workers,
+                force_reparse=args.force_reparse,
+            )
+
+        failed = [stats for stats in results if stats["status"] != "success"]
 
         logging.info("=" * 60)
-        logging.info("Ingestion completed successfully!")
-        logging.info(f"Medicine: {stats['medicine_name']}")
-        logging.info(f"Chunks created: {stats['total_chunks']}")
+        logging.info(
+            f"Ingestion completed: {len(results) - len(failed)} succeeded, "
+            f"{len(failed)} failed"
+        )
+        for stats in results:
+            if stats["status"] == "success":
+                logging.info(
+                    f"Medicine: {stats['medicine_name']} "
+                    f"({stats['total_chunks']} chunks)"
+                )
+            else:
+                logging.error(f"Failed: {stats['pdf_file']}: {stats['error']}")
+        logging.info(f"LLM cost (USD): {tracker.finalize()['cost']:.4f}")
         logging.info("=" * 60)
 
-        return 0
+        return 1 if failed else 0
 
     except IngestionError as e:
         logging.error(f"Ingestion failed: {e}")
@@ -0,0 +1,104 @@
+"""
+CLI for profiling import-time startup cost.
+Runs `python -X importtime` in a fresh interpreter and reports the slowest
+imports by cumulative time.
+"""
+
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# e.g. "import time:       353 |     995973 |       src.graph.builder"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_imports(module: str) -> list[dict]:
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import (e.g., "graph")
+
+    Returns:
+        One entry per imported module with self/cumulative microseconds
+        and nesting depth, in import order
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                {
+                    "name": name,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": len(indent) // 2,
+                }
+            )
+    return entries
+
+
+def main() -> int:
+    """
+    Main CLI entry point for startup profiling.
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    parser = argparse.ArgumentParser(
+        description="Report the slowest imports of a module (default: graph)"
+    )
+    parser.add_argument(
+        "--module", default="graph", help="Module to import (default: graph)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=25, help="Number of imports to show (default: 25)"
+    )
+    args = parser.parse_args()
+
+    try:
+        entries = profile_imports(args.module)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    total_us = sum(e["cumulative_us"] for e in entries if e["depth"] == 0)
+    # A module can be listed twice when a package import re-enters it
+    by_name = {}
+    for entry in entries:
+        seen = by_name.get(entry["name"])
+        if seen is None or entry["cumulative_us"] > seen["cumulative_us"]:
+            by_name[entry["name"]] = entry
+    slowest = sorted(
+        by_name.values(), key=lambda e: e["cumulative_us"], reverse=True
+    )
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in slowest[: args.top]:
+        print(
+            f"{entry['cumulative_us'] / 1000:>14.1f} "
+            f"{entry['self_us'] / 1000:>9.1f}  {entry['name']}"
+        )
+    print(f"\nTotal import time of '{args.module}': {total_us / 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+-- match_documents puede devolver el embedding de cada chunk, para que el bot
+-- re-ordene en local los documentos ya recuperados en la conversación.
+-- El tipo de retorno cambia, así que hay que borrar la función anterior.
+drop function if exists match_documents(vector, int, text[]);
+
+create or replace function match_documents (
+  query_embedding vector(1536),
+  match_count int,
+  filter_medicines text[] default '{}',
+  include_embedding boolean default false
+)
+returns table (
+  id bigint,
+  content text,
+  metadata jsonb,
+  similarity float,
+  embedding vector(1536)
+)
+language plpgsql
+as $$
+begin
+  return query
+  select
+    documents.id,
+    documents.content,
+    documents.metadata,
+    1 - (documents.embedding <=> query_embedding) as similarity,
+    case when include_embedding then documents.embedding else null end as embedding
+  from documents
+  where
+    (array_length(filter_medicines, 1) is null or documents.metadata->>'medicine_name' = any(filter_medicines))
+  order by documents.embedding <=> query_embedding
+  limit match_count;
+end;
+$$;
@@ -0,0 +1,17 @@
+-- Principios activos extraídos de cada prospecto durante la ingesta
+-- (metadata->'active_ingredients'), para que el bot reconozca preguntas
+-- por principio activo ("metamizol" -> nolotil).
+create or replace function get_medicine_active_ingredients()
+returns table(medicine_name text, active_ingredient text) as $$
+begin
+  return query
+    select distinct
+      documents.metadata->>'medicine_name' as medicine_name,
+      ingredient.value as active_ingredient
+    from documents,
+      jsonb_array_elements_text(
+        coalesce(documents.metadata->'active_ingredients', '[]'::jsonb)
+      ) as ingredient(value)
+    where documents.metadata->>'medicine_name' is not null;
+end;
+$$ language plpgsql;
@@ -0,0 +1,28 @@
+-- Versión del catálogo de medicamentos. La ingesta la incrementa y los
+-- procesos del chat la consultan cada pocos segundos para recargar la lista
+-- de medicamentos sin reiniciarse.
+create table if not exists catalogue_version (
+  id boolean primary key default true check (id),
+  version bigint not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+insert into catalogue_version default values on conflict do nothing;
+
+create or replace function bump_catalogue_version()
+returns bigint as $$
+  update catalogue_version
+  set version = version + 1, updated_at = now()
+  where id
+  returning version;
+$$ language sql;
+
+-- Marcador + id máximo de documents: detecta también ingestas que no
+-- incrementan el marcador. Ambas lecturas usan la clave primaria.
+create or replace function get_catalogue_version()
+returns text as $$
+  select
+    coalesce((select version from catalogue_version where id), 0)::text
+    || ':' ||
+    coalesce((select max(id) from documents), 0)::text;
+$$ language sql stable;
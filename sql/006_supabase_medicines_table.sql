@@ -0,0 +1,92 @@
+-- Tabla de medicamentos mantenida por la ingesta. Sustituye el
+-- "select distinct" sobre el jsonb de todos los chunks que se ejecutaba en
+-- cada arranque: la lista de medicamentos pasa a ser un recorrido del índice
+-- de la clave primaria, independiente del tamaño del corpus.
+create table if not exists medicines (
+  medicine_name text primary key,
+  source text not null,
+  chunk_count int not null,
+  active_ingredients text[] not null default '{}',
+  ingested_at timestamptz not null default now(),
+  corpus_version bigint not null default 0
+);
+
+create index if not exists medicines_source_idx on medicines (source);
+
+-- Rellenar con los prospectos ya ingeridos
+insert into medicines (medicine_name, source, chunk_count, active_ingredients)
+select
+  metadata->>'medicine_name',
+  min(metadata->>'source'),
+  count(*),
+  coalesce(
+    (
+      select array_agg(distinct ingredient)
+      from documents d2,
+        jsonb_array_elements_text(
+          coalesce(d2.metadata->'active_ingredients', '[]'::jsonb)
+        ) as ingredient
+      where d2.metadata->>'medicine_name' = documents.metadata->>'medicine_name'
+    ),
+    '{}'
+  )
+from documents
+where metadata->>'medicine_name' is not null
+group by metadata->>'medicine_name'
+on conflict (medicine_name) do nothing;
+
+-- Registra (o actualiza) un prospecto e incrementa la versión del catálogo
+-- en la misma transacción, así los procesos del chat nunca ven la versión
+-- nueva sin el medicamento.
+create or replace function register_medicine(
+  p_medicine_name text,
+  p_source text,
+  p_chunk_count int,
+  p_active_ingredients text[] default '{}'
+)
+returns bigint as $$
+declare
+  new_version bigint;
+begin
+  new_version := bump_catalogue_version();
+
+  -- Un mismo fichero re-ingerido con otro nombre no deja filas huérfanas
+  delete from medicines
+  where source = p_source and medicine_name <> p_medicine_name;
+
+  insert into medicines (
+    medicine_name, source, chunk_count, active_ingredients,
+    ingested_at, corpus_version
+  )
+  values (
+    p_medicine_name, p_source, p_chunk_count, p_active_ingredients,
+    now(), new_version
+  )
+  on conflict (medicine_name) do update set
+    source = excluded.source,
+    chunk_count = excluded.chunk_count,
+    active_ingredients = excluded.active_ingredients,
+    ingested_at = excluded.ingested_at,
+    corpus_version = excluded.corpus_version;
+
+  return new_version;
+end;
+$$ language plpgsql;
+
+-- Mismas firmas que en 002 y 004, ahora sobre la tabla medicines
+create or replace function get_distinct_medicine_names()
+returns table(medicine_name text) as $$
+begin
+  return query
+    select medicines.medicine_name from medicines order by medicines.medicine_name;
+end;
+$$ language plpgsql;
+
+create or replace function get_medicine_active_ingredients()
+returns table(medicine_name text, active_ingredient text) as $$
+begin
+  return query
+    select medicines.medicine_name, ingredient
+    from medicines, unnest(medicines.active_ingredients) as ingredient;
+end;
+$$ language plpgsql;
@@ -0,0 +1,46 @@
+-- Columnas generadas para los campos de metadata por los que se filtra.
+-- Con sus índices btree, el borrado al re-ingerir un prospecto (por source)
+-- y las búsquedas filtradas por medicamento dejan de evaluar el jsonb fila
+-- a fila sobre toda la tabla.
+alter table documents
+  add column if not exists medicine_name text
+    generated always as (metadata->>'medicine_name') stored,
+  add column if not exists source text
+    generated always as (metadata->>'source') stored;
+
+create index if not exists documents_medicine_name_idx on documents (medicine_name);
+create index if not exists documents_source_idx on documents (source);
+
+analyze documents;
+
+-- Misma firma que en 003, filtrando por la columna indexada
+create or replace function match_documents (
+  query_embedding vector(1536),
+  match_count int,
+  filter_medicines text[] default '{}',
+  include_embedding boolean default false
+)
+returns table (
+  id bigint,
+  content text,
+  metadata jsonb,
+  similarity float,
+  embedding vector(1536)
+)
+language plpgsql
+as $$
+begin
+  return query
+  select
+    documents.id,
+    documents.content,
+    documents.metadata,
+    1 - (documents.embedding <=> query_embedding) as similarity,
+    case when include_embedding then documents.embedding else null end as embedding
+  from documents
+  where
+    (array_length(filter_medicines, 1) is null or documents.medicine_name = any(filter_medicines))
+  order by documents.embedding <=> query_embedding
+  limit match_count;
+end;
+$$;
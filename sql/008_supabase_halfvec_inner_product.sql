@@ -0,0 +1,74 @@
+-- Ruta opcional a vectores de media precisión (requiere pgvector >= 0.7.0).
+-- La ingesta guarda embeddings normalizados, así que el producto interno es
+-- igual a la similitud coseno: el índice HNSW pasa a ser halfvec_ip_ops,
+-- con la mitad de memoria y distancias más baratas.
+--
+-- 1. Aplicar esta migración.
+-- 2. Comprobar el recall: python evaluation/check_vector_recall.py
+-- 3. Si pasa, ejecutar el paso opcional del final para borrar el índice
+--    antiguo (coseno sobre float32).
+
+-- Copia normalizada en media precisión, mantenida por Postgres
+alter table documents
+  add column if not exists embedding_half halfvec(1536)
+    generated always as (l2_normalize(embedding)::halfvec(1536)) stored;
+
+create index if not exists documents_embedding_half_ip_idx
+  on documents using hnsw (embedding_half halfvec_ip_ops);
+
+-- Misma firma que en 007; <#> devuelve el producto interno negado
+create or replace function match_documents (
+  query_embedding vector(1536),
+  match_count int,
+  filter_medicines text[] default '{}',
+  include_embedding boolean default false
+)
+returns table (
+  id bigint,
+  content text,
+  metadata jsonb,
+  similarity float,
+  embedding vector(1536)
+)
+language plpgsql
+as $$
+declare
+  query_half halfvec(1536) := l2_normalize(query_embedding)::halfvec(1536);
+begin
+  return query
+  select
+    documents.id,
+    documents.content,
+    documents.metadata,
+    -(documents.embedding_half <#> query_half) as similarity,
+    case when include_embedding then documents.embedding else null end as embedding
+  from documents
+  where
+    (array_length(filter_medicines, 1) is null or documents.medicine_name = any(filter_medicines))
+  order by documents.embedding_half <#> query_half
+  limit match_count;
+end;
+$$;
+
+-- Referencia exacta (float32, coseno, sin índice) para medir el recall
+create or replace function match_documents_exact (
+  query_embedding vector(1536),
+  match_count int,
+  filter_medicines text[] default '{}'
+)
+returns table (id bigint, similarity float)
+language sql
+set enable_indexscan = off
+as $$
+  select
+    documents.id,
+    1 - (documents.embedding <=> query_embedding) as similarity
+  from documents
+  where
+    (array_length(filter_medicines, 1) is null or documents.medicine_name = any(filter_medicines))
+  order by documents.embedding <=> query_embedding
+  limit match_count;
+$$;
+
+-- Paso opcional, tras comprobar el recall:
+-- drop index if exists documents_embedding_idx;
@@ -0,0 +1,54 @@
+-- Búsqueda con calidad ajustable por llamada (usada por el retriever cuando
+-- se configura ef_search, min_similarity o max_similarity_gap):
+--   * ef_search: tamaño de la lista de candidatos de HNSW, solo para esta
+--     transacción (SET LOCAL). Más alto = más recall y más latencia.
+--   * min_similarity: descarta resultados por debajo de este umbral.
+--   * max_relative_gap: descarta resultados cuya similitud queda más de esa
+--     fracción por debajo del mejor (0.2 = se corta por debajo del 80 %).
+-- Envuelve a match_documents, así funciona tanto con el índice de 007 como
+-- con el de 008.
+create or replace function match_documents_adaptive (
+  query_embedding vector(1536),
+  match_count int,
+  filter_medicines text[] default '{}',
+  include_embedding boolean default false,
+  ef_search int default null,
+  min_similarity float default null,
+  max_relative_gap float default null
+)
+returns table (
+  id bigint,
+  content text,
+  metadata jsonb,
+  similarity float,
+  embedding vector(1536)
+)
+language plpgsql
+as $$
+begin
+  if ef_search is not null then
+    -- HNSW devuelve como mucho ef_search filas
+    perform set_config(
+      'hnsw.ef_search', greatest(ef_search, match_count)::text, true
+    );
+  end if;
+
+  return query
+  select ranked.id, ranked.content, ranked.metadata, ranked.similarity, ranked.embedding
+  from (
+    select
+      matches.*,
+      max(matches.similarity) over () as best_similarity
+    from match_documents(
+      query_embedding, match_count, filter_medicines, include_embedding
+    ) as matches
+  ) as ranked
+  where
+    (min_similarity is null or ranked.similarity >= min_similarity)
+    and (
+      max_relative_gap is null
+      or ranked.similarity >= ranked.best_similarity * (1 - max_relative_gap)
+    )
+  order by ranked.similarity desc;
+end;
+$$;
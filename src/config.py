@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -32,6 +33,13 @@ class Settings(BaseSettings):
         description="Multimodal model for PDF parsing",
     )
 
+    chunking_sentence_splitter: Literal["nltk", "punkt"] = Field(
+        default="nltk",
+        description="Sentence splitter for ingestion chunking: LangChain's "
+        "NLTKTextSplitter per paragraph (nltk) or the Punkt model loaded once "
+        "with Spanish abbreviations (punkt)",
+    )
+
     agent_model: str = Field(
         default="gpt-4o",
         description="Main agent LLM (ReAct reasoning)",
@@ -42,6 +50,18 @@ class Settings(BaseSettings):
         description="Fast LLM for classification and summarization",
     )
 
+    agent_fallback_model: str = Field(
+        default="gemini-2.5-flash",
+        description="Agent model used while the primary agent circuit is open "
+        "(empty to disable failover)",
+    )
+
+    router_fallback_model: str = Field(
+        default="gpt-4o-mini",
+        description="Router model used while the primary router circuit is open "
+        "(empty to disable failover)",
+    )
+
     embeddings_provider: str = Field(
         default="google",
         description="Embeddings provider (openai or google)",
@@ -71,6 +91,24 @@ class Settings(BaseSettings):
         ge=1,
         le=10,
     )
+    circuit_breaker_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive LLM errors/timeouts before a model's circuit opens",
+        ge=1,
+        le=50,
+    )
+    circuit_breaker_recovery_timeout: int = Field(
+        default=30,
+        description="Seconds a circuit stays open before half-open probing",
+        ge=1,
+        le=600,
+    )
+    circuit_breaker_half_open_successes: int = Field(
+        default=2,
+        description="Successful half-open probes required to close a circuit",
+        ge=1,
+        le=10,
+    )
     embeddings_cache_size: int = Field(
         default=100,
         description="LRU cache size for embeddings queries",
@@ -78,6 +116,32 @@ class Settings(BaseSettings):
         le=1000,
     )
 
+    # --- Fake LLM (load and latency testing, selected with model names "fake*") ---
+    fake_llm_latency_distribution: str = Field(
+        default="constant",
+        description="Latency distribution of fake models (constant, uniform, lognormal)",
+    )
+    fake_llm_latency_mean: float = Field(
+        default=0.0, description="Mean latency in seconds of fake model calls", ge=0.0
+    )
+    fake_llm_latency_stddev: float = Field(
+        default=0.0,
+        description="Latency spread in seconds (half-width for uniform)",
+        ge=0.0,
+    )
+    fake_llm_failure_rate: float = Field(
+        default=0.0, description="Probability of an injected error", ge=0.0, le=1.0
+    )
+    fake_llm_timeout_rate: float = Field(
+        default=0.0,
+        description="Probability of a call hanging until the LLM timeout",
+        ge=0.0,
+        le=1.0,
+    )
+    fake_llm_seed: int | None = Field(
+        default=None, description="Random seed for reproducible fake latencies"
+    )
+
     # --- Agent Configuration ---
     max_react_iterations: int = Field(
         default=10,
@@ -85,6 +149,158 @@ class Settings(BaseSettings):
         ge=1,
         le=20,
     )
+    agent_max_input_tokens: int = Field(
+        default=12000,
+        description="Input token budget for each agent call (older tool outputs "
+        "and turns are trimmed to fit)",
+        ge=1000,
+        le=200000,
+    )
+    agent_compressed_tool_tokens: int = Field(
+        default=300,
+        description="Tokens kept from each tool output compressed to fit the budget",
+        ge=50,
+        le=4000,
+    )
+
+    summarization_trigger_tokens: int = Field(
+        default=3000,
+        description="Message window size in tokens above which the oldest "
+        "turns are folded into the summary",
+        ge=500,
+        le=100000,
+    )
+    summarization_keep_recent_tokens: int = Field(
+        default=1000,
+        description="Tokens of the newest turns kept verbatim when summarizing",
+        ge=0,
+        le=50000,
+    )
+    summary_max_tokens: int = Field(
+        default=400,
+        description="Maximum length of the rolling conversation summary",
+        ge=50,
+        le=4000,
+    )
+    background_summarization: bool = Field(
+        default=True,
+        description="Summarize the console conversation in the background after "
+        "the answer is returned instead of inside the turn",
+    )
+
+    retain_tool_results: bool = Field(
+        default=True,
+        description="Keep pruned tool results as compact chunk records so "
+        "follow-ups on the same section skip retrieval",
+    )
+    retained_chunks_per_thread: int = Field(
+        default=50,
+        description="Chunk records kept in each conversation's state",
+        ge=1,
+        le=500,
+    )
+    retained_section_min_overlap: float = Field(
+        default=0.5,
+        description="Fraction of a section path's keywords a follow-up query "
+        "must contain to reuse that section's chunks",
+        ge=0.0,
+        le=1.0,
+    )
+    retrieval_cache_embeddings: int = Field(
+        default=0,
+        description="Newest retained chunks per conversation that keep their "
+        "embedding for re-ranking follow-ups, e.g. 10 (0 disables re-ranking "
+        "and keeps searches compatible with databases without migration 003)",
+        ge=0,
+        le=50,
+    )
+    retrieval_cache_min_similarity: float = Field(
+        default=0.8,
+        description="Cosine similarity the best retained chunk must reach to "
+        "answer a follow-up without a global search",
+        ge=0.0,
+        le=1.0,
+    )
+    chunk_store_size: int = Field(
+        default=2000,
+        description="Retrieved chunks kept in the process-local chunk store",
+        ge=0,
+    )
+
+    retriever_backend: Literal["supabase", "postgres"] = Field(
+        default="supabase",
+        description="Vector search path: PostgREST RPC (supabase) or a direct "
+        "async connection pool on postgres_conn_str (postgres)",
+    )
+    retriever_pool_max_size: int = Field(
+        default=10,
+        description="Maximum connections in the postgres retriever pool",
+        ge=1,
+        le=100,
+    )
+    retriever_top_k: int = Field(
+        default=5,
+        description="Maximum chunks returned by each vector search",
+        ge=1,
+        le=20,
+    )
+    retriever_ef_search: int = Field(
+        default=0,
+        description="HNSW ef_search for the agent's searches (0 keeps the "
+        "database default; requires migration 009)",
+        ge=0,
+        le=1000,
+    )
+    retriever_min_similarity: float = Field(
+        default=0.0,
+        description="Chunks below this similarity are not sent to the agent "
+        "(0 disables; requires migration 009)",
+        ge=0.0,
+        le=1.0,
+    )
+    retriever_max_similarity_gap: float = Field(
+        default=0.0,
+        description="Chunks more than this fraction below the best chunk's "
+        "similarity are not sent to the agent (0 disables; requires migration 009)",
+        ge=0.0,
+        le=1.0,
+    )
+    catalogue_ttl: int = Field(
+        default=300,
+        description="Seconds after which the known-medicines catalogue is "
+        "reloaded even if its version did not change (0 disables)",
+        ge=0,
+    )
+    catalogue_probe_interval: int = Field(
+        default=30,
+        description="Seconds between catalogue version probes that pick up "
+        "newly ingested leaflets (0 disables; requires migration 005)",
+        ge=0,
+    )
+    executor_embeddings_workers: int = Field(
+        default=8,
+        description="Threads for blocking embedding calls",
+        ge=1,
+        le=64,
+    )
+    executor_database_workers: int = Field(
+        default=8,
+        description="Threads for blocking Supabase calls",
+        ge=1,
+        le=64,
+    )
+    executor_pdf_workers: int = Field(
+        default=2,
+        description="Threads rendering PDF pages to images during ingestion",
+        ge=1,
+        le=16,
+    )
+    executor_slow_wait: float = Field(
+        default=1.0,
+        description="Queue wait in seconds above which an executor logs a "
+        "warning (0 disables)",
+        ge=0.0,
+    )
 
     # --- Chunking Parameters ---
     chunk_size: int = Field(default=800, description="Chunk size for text splitting")
@@ -99,6 +315,50 @@ class Settings(BaseSettings):
     )
     eval_final_k: int = Field(default=5, description="Final documents after re-ranking")
 
+    # --- Checkpointer (conversation persistence) ---
+    checkpointer_backend: str = Field(
+        default="memory",
+        description="Checkpoint storage (memory, postgres, or sqlite)",
+    )
+    checkpointer_pool_min_size: int = Field(
+        default=1,
+        description="Minimum open connections in the Postgres checkpointer pool",
+        ge=1,
+        le=50,
+    )
+    checkpointer_pool_max_size: int = Field(
+        default=10,
+        description="Maximum connections in the Postgres checkpointer pool",
+        ge=1,
+        le=100,
+    )
+    checkpointer_sqlite_path: str = Field(
+        default="checkpoints.sqlite",
+        description="Database file for the SQLite checkpointer",
+    )
+    checkpointer_max_threads: int = Field(
+        default=1000,
+        description="Threads kept by the in-memory checkpointer before LRU eviction",
+        ge=1,
+    )
+    checkpointer_thread_ttl: int = Field(
+        default=3600,
+        description="Seconds of inactivity before the in-memory checkpointer "
+        "evicts a thread",
+        ge=60,
+    )
+    checkpointer_max_checkpoints_per_thread: int = Field(
+        default=20,
+        description="Checkpoints retained per thread by the in-memory checkpointer",
+        ge=1,
+        le=1000,
+    )
+    checkpoint_durability: Literal["sync", "async", "exit"] = Field(
+        default="async",
+        description="When checkpoints are written: every step and waited for "
+        "(sync), every step in the background (async), or once per run (exit)",
+    )
+
     # --- API Keys (Required) ---
     google_api_key: str = Field(..., description="Google API key for Gemini")
     openai_api_key: str = Field(..., description="OpenAI API key")
@@ -150,36 +410,94 @@ def get_settings() -> Settings:
 
 
 # Expose settings as module-level variables for backward compatibility
-# Only expose non-sensitive configuration values
-settings = get_settings()
-
-# Directory paths
-BASE_DIR = settings.base_dir
-DATA_PATH = settings.data_path
-MARKDOWN_PATH = settings.markdown_path
-
-# Model parameters
-PDF_PARSE_MODEL = settings.pdf_parse_model
-AGENT_MODEL = settings.agent_model
-ROUTER_MODEL = settings.router_model
-EMBEDDINGS_PROVIDER = settings.embeddings_provider
-EMBEDDINGS_MODEL = settings.embeddings_model
-
-# LLM Service parameters
-LLM_TIMEOUT = settings.llm_timeout
-LLM_MAX_RETRIES = settings.llm_max_retries
-LLM_RATE_LIMIT = settings.llm_rate_limit
-EMBEDDINGS_CACHE_SIZE = settings.embeddings_cache_size
-MAX_REACT_ITERATIONS = settings.max_react_iterations
-
-# Chunking parameters
-CHUNK_SIZE = settings.chunk_size
-CHUNK_OVERLAP = settings.chunk_overlap
-
-# Evaluation parameters
-EVAL_USE_RERANKER = settings.eval_use_reranker
-EVAL_INITIAL_K = settings.eval_initial_k
-EVAL_FINAL_K = settings.eval_final_k
+# Only expose non-sensitive configuration values. They are resolved on first
+# access (PEP 562) so importing this module does not read the environment.
+_SETTING_ATTRIBUTES = {
+    # Directory paths
+    "BASE_DIR": "base_dir",
+    "DATA_PATH": "data_path",
+    "MARKDOWN_PATH": "markdown_path",
+    # Model parameters
+    "PDF_PARSE_MODEL": "pdf_parse_model",
+    "CHUNKING_SENTENCE_SPLITTER": "chunking_sentence_splitter",
+    "AGENT_MODEL": "agent_model",
+    "ROUTER_MODEL": "router_model",
+    "AGENT_FALLBACK_MODEL": "agent_fallback_model",
+    "ROUTER_FALLBACK_MODEL": "router_fallback_model",
+    "EMBEDDINGS_PROVIDER": "embeddings_provider",
+    "EMBEDDINGS_MODEL": "embeddings_model",
+    # LLM Service parameters
+    "LLM_TIMEOUT": "llm_timeout",
+    "LLM_MAX_RETRIES": "llm_max_retries",
+    "LLM_RATE_LIMIT": "llm_rate_limit",
+    "CIRCUIT_BREAKER_FAILURE_THRESHOLD": "circuit_breaker_failure_threshold",
+    "CIRCUIT_BREAKER_RECOVERY_TIMEOUT": "circuit_breaker_recovery_timeout",
+    "CIRCUIT_BREAKER_HALF_OPEN_SUCCESSES": "circuit_breaker_half_open_successes",
+    "EMBEDDINGS_CACHE_SIZE": "embeddings_cache_size",
+    "MAX_REACT_ITERATIONS": "max_react_iterations",
+    "AGENT_MAX_INPUT_TOKENS": "agent_max_input_tokens",
+    "AGENT_COMPRESSED_TOOL_TOKENS": "agent_compressed_tool_tokens",
+    "SUMMARIZATION_TRIGGER_TOKENS": "summarization_trigger_tokens",
+    "SUMMARIZATION_KEEP_RECENT_TOKENS": "summarization_keep_recent_tokens",
+    "SUMMARY_MAX_TOKENS": "summary_max_tokens",
+    "BACKGROUND_SUMMARIZATION": "background_summarization",
+    "RETAIN_TOOL_RESULTS": "retain_tool_results",
+    "RETAINED_CHUNKS_PER_THREAD": "retained_chunks_per_thread",
+    "RETAINED_SECTION_MIN_OVERLAP": "retained_section_min_overlap",
+    "RETRIEVAL_CACHE_EMBEDDINGS": "retrieval_cache_embeddings",
+    "RETRIEVAL_CACHE_MIN_SIMILARITY": "retrieval_cache_min_similarity",
+    "CHUNK_STORE_SIZE": "chunk_store_size",
+    "RETRIEVER_BACKEND": "retriever_backend",
+    "RETRIEVER_POOL_MAX_SIZE": "retriever_pool_max_size",
+    "RETRIEVER_TOP_K": "retriever_top_k",
+    "RETRIEVER_EF_SEARCH": "retriever_ef_search",
+    "RETRIEVER_MIN_SIMILARITY": "retriever_min_similarity",
+    "RETRIEVER_MAX_SIMILARITY_GAP": "retriever_max_similarity_gap",
+    "CATALOGUE_TTL": "catalogue_ttl",
+    "CATALOGUE_PROBE_INTERVAL": "catalogue_probe_interval",
+    "EXECUTOR_EMBEDDINGS_WORKERS": "executor_embeddings_workers",
+    "EXECUTOR_DATABASE_WORKERS": "executor_database_workers",
+    "EXECUTOR_PDF_WORKERS": "executor_pdf_workers",
+    "EXECUTOR_SLOW_WAIT": "executor_slow_wait",
+    # Fake LLM parameters
+    "FAKE_LLM_LATENCY_DISTRIBUTION": "fake_llm_latency_distribution",
+    "FAKE_LLM_LATENCY_MEAN": "fake_llm_latency_mean",
+    "FAKE_LLM_LATENCY_STDDEV": "fake_llm_latency_stddev",
+    "FAKE_LLM_FAILURE_RATE": "fake_llm_failure_rate",
+    "FAKE_LLM_TIMEOUT_RATE": "fake_llm_timeout_rate",
+    "FAKE_LLM_SEED": "fake_llm_seed",
+    # Checkpointer parameters
+    "CHECKPOINTER_BACKEND": "checkpointer_backend",
+    "CHECKPOINTER_POOL_MIN_SIZE": "checkpointer_pool_min_size",
+    "CHECKPOINTER_POOL_MAX_SIZE": "checkpointer_pool_max_size",
+    "CHECKPOINTER_SQLITE_PATH": "checkpointer_sqlite_path",
+    "CHECKPOINTER_MAX_THREADS": "checkpointer_max_threads",
+    "CHECKPOINTER_THREAD_TTL": "checkpointer_thread_ttl",
+    "CHECKPOINTER_MAX_CHECKPOINTS_PER_THREAD": (
+        "checkpointer_max_checkpoints_per_thread"
+    ),
+    "CHECKPOINT_DURABILITY": "checkpoint_durability",
+    # Chunking parameters
+    "CHUNK_SIZE": "chunk_size",
+    "CHUNK_OVERLAP": "chunk_overlap",
+    # Evaluation parameters
+    "EVAL_USE_RERANKER": "eval_use_reranker",
+    "EVAL_INITIAL_K": "eval_initial_k",
+    "EVAL_FINAL_K": "eval_final_k",
+}
+
+
+def __getattr__(name: str):
+    """Resolves `settings` and the constants above on first access."""
+    if name == "settings":
+        value = get_settings()
+    elif name in _SETTING_ATTRIBUTES:
+        value = getattr(get_settings(), _SETTING_ATTRIBUTES[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
 # NOTE: API keys and credentials are NOT exposed globally for security.
 # Access them via get_settings() when needed:
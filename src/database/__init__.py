@@ -1,11 +1,36 @@
 """
-Database package exports for Supabase integration.
+Database package exports for Supabase integration and checkpoint storage.
 """
 
 from src.database.supabase import (
+    VectorSearchRetriever,
     SupabaseRetriever,
     get_known_medicines,
+    get_active_ingredients,
+    get_catalogue_version,
     DatabaseError,
 )
+from src.database.postgres_retriever import PostgresRetriever, create_retriever_pool
+from src.database.catalogue import MedicineCatalogue
+from src.database.chunk_store import ChunkStore
+from src.database.checkpointer import (
+    BoundedMemorySaver,
+    create_memory_checkpointer,
+    open_checkpointer,
+)
 
-__all__ = ["SupabaseRetriever", "get_known_medicines", "DatabaseError"]
+__all__ = [
+    "VectorSearchRetriever",
+    "SupabaseRetriever",
+    "PostgresRetriever",
+    "create_retriever_pool",
+    "get_known_medicines",
+    "get_active_ingredients",
+    "get_catalogue_version",
+    "DatabaseError",
+    "MedicineCatalogue",
+    "ChunkStore",
+    "BoundedMemorySaver",
+    "create_memory_checkpointer",
+    "open_checkpointer",
+]
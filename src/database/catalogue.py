@@ -0,0 +1,187 @@
+"""
+Hot-reloadable catalogue of known medicines.
+Keeps the medicine list and active ingredients in sync with the database so
+newly ingested leaflets go live without restarting the process.
+"""
+
+import time
+import asyncio
+from typing import Callable
+
+from supabase import Client
+
+from src.database.supabase import (
+    DatabaseError,
+    get_active_ingredients,
+    get_catalogue_version,
+    get_known_medicines,
+)
+from src.utils.executors import DATABASE, get_executor
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MedicineCatalogue:
+    """
+    Versioned snapshot of the known medicines, refreshed in the background.
+
+    maybe_refresh() is called once per turn and never blocks it: every
+    probe_interval seconds a worker thread probes the catalogue version
+    (a single-row lookup) and reloads only if it changed; after ttl seconds
+    it reloads unconditionally. Subscribers (e.g., MedicineService) rebuild
+    their indexes in that same thread and swap them in atomically, so turns
+    keep using the previous snapshot until the new one is ready. Failed
+    refreshes are logged and the previous snapshot stays live.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        ttl: float = 300.0,
+        probe_interval: float = 30.0,
+    ):
+        """
+        Initialize catalogue (empty until load() is called).
+
+        Args:
+            client: Supabase client instance
+            ttl: Seconds after which the catalogue is reloaded even if the
+                version did not change (0 disables)
+            probe_interval: Seconds between version probes (0 disables)
+        """
+        self.client = client
+        self.ttl = ttl
+        self.probe_interval = probe_interval
+
+        self.version: str | None = None
+        self.medicines: list[str] = []
+        self.active_ingredients: dict[str, list[str]] = {}
+
+        self._loaded_at = 0.0
+        self._probed_at = 0.0
+        self._listeners: list[Callable[["MedicineCatalogue"], None]] = []
+        self._refresh_task: asyncio.Task | None = None
+
+    def subscribe(self, listener: Callable[["MedicineCatalogue"], None]) -> None:
+        """
+        Registers a callback run after every reload (in the refreshing thread).
+
+        Args:
+            listener: Callable receiving the reloaded catalogue
+        """
+        self._listeners.append(listener)
+
+    def load(self) -> None:
+        """
+        Loads the catalogue and notifies subscribers.
+
+        Raises:
+            DatabaseError: If the medicine list cannot be loaded
+        """
+        start = time.perf_counter()
+        version = self._probe()
+        medicines = get_known_medicines(self.client)
+        try:
+            active_ingredients = get_active_ingredients(self.client)
+        except DatabaseError:
+            logger.warning("active_ingredients_unavailable", fallback="product_names")
+            active_ingredients = {}
+
+        self.medicines, self.active_ingredients = medicines, active_ingredients
+        self.version = version
+        self._loaded_at = self._probed_at = time.monotonic()
+
+        for listener in self._listeners:
+            listener(self)
+
+        logger.info(
+            "catalogue_loaded",
+            version=version,
+            medicines=len(medicines),
+            duration=round(time.perf_counter() - start, 3),
+        )
+
+    def maybe_refresh(self) -> asyncio.Task | None:
+        """
+        Starts a background refresh if a probe or reload is due.
+
+        Returns:
+            The refresh task, or None if nothing is due or one is running
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return None
+        if not self._probe_due() and not self._reload_due():
+            return None
+
+        self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> bool:
+        """
+        Probes the version and reloads if it changed or the TTL expired.
+
+        Returns:
+            True if the catalogue was reloaded
+        """
+        try:
+            return await get_executor(DATABASE).run(self.refresh)
+        except Exception as e:
+            logger.error(
+                "catalogue_refresh_failed",
+                exc_info=True,
+                error=str(e),
+                version=self.version,
+            )
+            return False
+
+    def refresh(self) -> bool:
+        """
+        Synchronous refresh: reloads if the version changed or the TTL
+        expired.
+
+        Returns:
+            True if the catalogue was reloaded
+
+        Raises:
+            DatabaseError: If the reload fails
+        """
+        reason = "ttl" if self._reload_due() else None
+        if reason is None:
+            version = self._probe()
+            self._probed_at = time.monotonic()
+            if version is None or version == self.version:
+                return False
+            reason = "version_changed"
+
+        previous = self.version
+        self.load()
+        logger.info(
+            "catalogue_refreshed",
+            reason=reason,
+            previous_version=previous,
+            version=self.version,
+        )
+        return True
+
+    def _probe(self) -> str | None:
+        """Current version, or None if it cannot be probed (TTL still applies)."""
+        try:
+            return get_catalogue_version(self.client)
+        except DatabaseError as e:
+            logger.warning(
+                "catalogue_version_unavailable", error=str(e), fallback="ttl"
+            )
+            return None
+
+    def _probe_due(self) -> bool:
+        return (
+            self.probe_interval > 0
+            and time.monotonic() - self._probed_at >= self.probe_interval
+        )
+
+    def _reload_due(self) -> bool:
+        return self.ttl > 0 and time.monotonic() - self._loaded_at >= self.ttl
+
+    def __len__(self) -> int:
+        return len(self.medicines)
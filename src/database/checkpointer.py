@@ -0,0 +1,299 @@
+"""
+Checkpointer factory for conversation state persistence.
+Selects bounded in-memory, Postgres (pooled, async), or SQLite storage for
+LangGraph checkpoints.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def open_checkpointer(
+    backend: str | None = None,
+) -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    Opens a checkpointer for the configured backend and closes it on exit.
+
+    Postgres uses an async connection pool shared by all graph runs, so
+    several workers can serve the same thread_id without keeping state in
+    process memory. SQLite is a single-file stand-in for local runs.
+
+    Args:
+        backend: "memory", "postgres", or "sqlite" (defaults to
+            CHECKPOINTER_BACKEND)
+
+    Yields:
+        Checkpointer ready to pass to build_graph()
+
+    Raises:
+        ValueError: If the backend is not supported
+        ImportError: If the backend's optional package is not installed
+    """
+    backend = (backend or config.CHECKPOINTER_BACKEND).lower()
+
+    if backend == "memory":
+        logger.info("checkpointer_opened", backend=backend)
+        yield create_memory_checkpointer()
+
+    elif backend == "postgres":
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+        settings = config.get_settings()
+        async with AsyncConnectionPool(
+            conninfo=settings.postgres_conn_str,
+            min_size=config.CHECKPOINTER_POOL_MIN_SIZE,
+            max_size=config.CHECKPOINTER_POOL_MAX_SIZE,
+            open=False,
+            # Settings required by AsyncPostgresSaver; prepare_threshold=None
+            # keeps it compatible with transaction poolers (pgbouncer, Supabase)
+            kwargs={
+                "autocommit": True,
+                "prepare_threshold": None,
+                "row_factory": dict_row,
+            },
+        ) as pool:
+            checkpointer = AsyncPostgresSaver(pool)
+            await checkpointer.setup()
+            logger.info(
+                "checkpointer_opened",
+                backend=backend,
+                pool_min_size=config.CHECKPOINTER_POOL_MIN_SIZE,
+                pool_max_size=config.CHECKPOINTER_POOL_MAX_SIZE,
+            )
+            yield checkpointer
+        logger.info("checkpointer_closed", backend=backend)
+
+    elif backend == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError as e:
+            raise ImportError(
+                "SQLite checkpointer requires 'langgraph-checkpoint-sqlite'. "
+                "Install it with: pip install langgraph-checkpoint-sqlite"
+            ) from e
+
+        async with AsyncSqliteSaver.from_conn_string(
+            config.CHECKPOINTER_SQLITE_PATH
+        ) as checkpointer:
+            logger.info(
+                "checkpointer_opened",
+                backend=backend,
+                path=config.CHECKPOINTER_SQLITE_PATH,
+            )
+            yield checkpointer
+        logger.info("checkpointer_closed", backend=backend)
+
+    else:
+        raise ValueError(
+            f"Unsupported checkpointer backend: {backend}. "
+            "Supported: 'memory', 'postgres', 'sqlite'"
+        )
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer with bounded growth for long-running processes.
+
+    - Threads idle for longer than thread_ttl are evicted.
+    - At most max_threads threads are kept; the least recently used go first.
+    - Each thread keeps only its newest max_checkpoints_per_thread
+      checkpoints (per namespace), together with the writes and channel
+      blobs they still reference.
+
+    Evicted threads start over as new conversations; trimmed checkpoints
+    are no longer available for time travel.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1000,
+        thread_ttl: float = 3600.0,
+        max_checkpoints_per_thread: int = 20,
+        **kwargs: Any,
+    ):
+        """
+        Initialize bounded in-memory checkpointer.
+
+        Args:
+            max_threads: Maximum resident threads before LRU eviction
+            thread_ttl: Seconds of inactivity before a thread is evicted
+            max_checkpoints_per_thread: Checkpoints retained per thread namespace
+            **kwargs: Passed to InMemorySaver (e.g., serde)
+        """
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.thread_ttl = thread_ttl
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+
+        # thread_id -> last access time, least recently used first
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        # (thread_id, checkpoint_ns, checkpoint_id) -> channel versions it reads
+        self._channel_versions: dict[tuple[str, str, str], ChannelVersions] = {}
+        self._lock = threading.RLock()
+        self.evicted_threads = 0
+        self.trimmed_checkpoints = 0
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Gets a checkpoint and marks its thread as recently used."""
+        self._touch(config["configurable"]["thread_id"])
+        return super().get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """Lists checkpoints, marking the requested thread as recently used."""
+        if config:
+            self._touch(config["configurable"]["thread_id"])
+        return super().list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Saves a checkpoint, then applies retention and eviction limits."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            self._channel_versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(
+                checkpoint["channel_versions"]
+            )
+            self._trim_thread(thread_id, checkpoint_ns)
+        self._touch(thread_id)
+        return next_config
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Deletes all checkpoints, writes, and blobs of a thread."""
+        with self._lock:
+            super().delete_thread(thread_id)
+            self._last_access.pop(thread_id, None)
+            for key in [k for k in self._channel_versions if k[0] == thread_id]:
+                del self._channel_versions[key]
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Returns resident size counters. Walks all stored entries, so call it
+        for periodic reporting rather than per request.
+
+        Returns:
+            Dictionary with resident threads, checkpoints, and serialized bytes
+        """
+        with self._lock:
+            checkpoints = sum(
+                len(by_id)
+                for namespaces in self.storage.values()
+                for by_id in namespaces.values()
+            )
+            checkpoint_bytes = sum(
+                len(saved[0][1]) + len(saved[1][1])
+                for namespaces in self.storage.values()
+                for by_id in namespaces.values()
+                for saved in by_id.values()
+            )
+            write_bytes = sum(
+                len(write[2][1])
+                for task_writes in self.writes.values()
+                for write in task_writes.values()
+            )
+            blob_bytes = sum(len(blob[1]) for blob in self.blobs.values())
+
+            return {
+                "threads": len(self.storage),
+                "checkpoints": checkpoints,
+                "bytes": checkpoint_bytes + write_bytes + blob_bytes,
+                "evicted_threads": self.evicted_threads,
+                "trimmed_checkpoints": self.trimmed_checkpoints,
+            }
+
+    def _touch(self, thread_id: str) -> None:
+        """Marks a thread as used now and evicts idle or excess threads."""
+        now = time.monotonic()
+        with self._lock:
+            self._last_access[thread_id] = now
+            self._last_access.move_to_end(thread_id)
+
+            while self._last_access:
+                oldest_id, last_used = next(iter(self._last_access.items()))
+                if now - last_used > self.thread_ttl:
+                    reason = "ttl"
+                elif len(self._last_access) > self.max_threads:
+                    reason = "lru"
+                else:
+                    break
+                self.delete_thread(oldest_id)
+                self.evicted_threads += 1
+                logger.info(
+                    "checkpointer_thread_evicted", thread_id=oldest_id, reason=reason
+                )
+
+    def _trim_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Drops checkpoints beyond the retention limit with their writes and blobs."""
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        excess = len(checkpoints) - self.max_checkpoints_per_thread
+        if excess <= 0:
+            return
+
+        # Checkpoint ids are time-ordered, so the smallest are the oldest
+        for checkpoint_id in sorted(checkpoints)[:excess]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self._channel_versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        self.trimmed_checkpoints += excess
+
+        referenced = {
+            (channel, version)
+            for (t_id, ns, _), versions in self._channel_versions.items()
+            if t_id == thread_id and ns == checkpoint_ns
+            for channel, version in versions.items()
+        }
+        for key in [
+            k
+            for k in self.blobs
+            if k[0] == thread_id and k[1] == checkpoint_ns
+            and (k[2], k[3]) not in referenced
+        ]:
+            del self.blobs[key]
+
+
+def create_memory_checkpointer() -> BoundedMemorySaver:
+    """
+    Creates the in-memory checkpointer with the configured bounds.
+
+    Returns:
+        BoundedMemorySaver instance
+    """
+    return BoundedMemorySaver(
+        max_threads=config.CHECKPOINTER_MAX_THREADS,
+        thread_ttl=config.CHECKPOINTER_THREAD_TTL,
+        max_checkpoints_per_thread=config.CHECKPOINTER_MAX_CHECKPOINTS_PER_THREAD,
+    )
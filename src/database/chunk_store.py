@@ -0,0 +1,76 @@
+"""
+Process-local store of retrieved chunks.
+Lets follow-up turns re-materialize previously retrieved documents by id
+without another embedding call or vector search.
+"""
+
+import threading
+from collections import OrderedDict
+
+from langchain_core.documents import Document
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChunkStore:
+    """
+    LRU cache of retrieved documents keyed by chunk id.
+
+    Shared by all conversations in the process. Threads only keep compact
+    records (ids, paths, similarity) in their state and look the documents
+    up here; evicted chunks are fetched again through a normal search.
+    """
+
+    def __init__(self, max_size: int = 2000):
+        """
+        Initialize chunk store.
+
+        Args:
+            max_size: Maximum number of chunks kept before LRU eviction
+        """
+        self.max_size = max_size
+        self._chunks: OrderedDict[str, Document] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put_many(self, docs: list[Document]) -> None:
+        """
+        Stores documents that have an id, evicting the least recently used.
+
+        Args:
+            docs: Retrieved documents
+        """
+        with self._lock:
+            for doc in docs:
+                if doc.id is None:
+                    continue
+                self._chunks[doc.id] = doc
+                self._chunks.move_to_end(doc.id)
+
+            evicted = 0
+            while len(self._chunks) > self.max_size:
+                self._chunks.popitem(last=False)
+                evicted += 1
+        if evicted:
+            logger.info("chunk_store_evicted", count=evicted, size=len(self))
+
+    def get_many(self, ids: list[str]) -> list[Document] | None:
+        """
+        Looks up documents by id, in the given order.
+
+        Args:
+            ids: Chunk ids
+
+        Returns:
+            The documents, or None if any of them is no longer stored
+        """
+        with self._lock:
+            if any(chunk_id not in self._chunks for chunk_id in ids):
+                return None
+            for chunk_id in ids:
+                self._chunks.move_to_end(chunk_id)
+            return [self._chunks[chunk_id] for chunk_id in ids]
+
+    def __len__(self) -> int:
+        return len(self._chunks)
@@ -0,0 +1,148 @@
+"""
+Direct async Postgres retrieval.
+Calls the match_documents functions over an async connection pool with
+binary pgvector parameters, bypassing PostgREST and the database executor.
+"""
+
+from typing import Any
+
+from langchain_core.documents import Document
+from pydantic import Field
+
+from src.database.supabase import DatabaseError, VectorSearchRetriever, _to_document
+from src.utils.executors import EMBEDDINGS, get_executor
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def create_retriever_pool(conn_str: str, min_size: int = 1, max_size: int = 10):
+    """
+    Creates an unopened async connection pool whose connections load the
+    pgvector types (vector and, if installed, halfvec) in binary format.
+
+    Args:
+        conn_str: PostgreSQL connection string
+        min_size: Connections kept open
+        max_size: Maximum concurrent connections
+
+    Returns:
+        psycopg_pool.AsyncConnectionPool, opened on first search
+
+    Raises:
+        ImportError: If psycopg, psycopg-pool, or pgvector is not installed
+    """
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+    from pgvector.psycopg import register_vector_async
+
+    return AsyncConnectionPool(
+        conninfo=conn_str,
+        min_size=min_size,
+        max_size=max_size,
+        open=False,
+        configure=register_vector_async,
+        # prepare_threshold=None keeps it compatible with transaction poolers
+        kwargs={"autocommit": True, "prepare_threshold": None, "row_factory": dict_row},
+    )
+
+
+class PostgresRetriever(VectorSearchRetriever):
+    """
+    Vector retriever talking to Postgres directly.
+
+    Same functions, parameters, and documents as SupabaseRetriever, but the
+    query vector is sent as a binary pgvector value over a pooled async
+    connection instead of JSON over HTTP from a worker thread. Async only.
+    """
+
+    pool: Any = Field(description="psycopg_pool.AsyncConnectionPool")
+
+    def _get_relevant_documents(self, query: str, **kwargs) -> list[Document]:
+        """
+        Not supported: the connection pool is async.
+
+        Raises:
+            DatabaseError: Always; use ainvoke()
+        """
+        raise DatabaseError("PostgresRetriever is async-only; use ainvoke()")
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        filter_medicines: list[str] | None = None,
+        **overrides,
+    ) -> list[Document]:
+        """
+        Embeds the query and runs the search function on a pooled connection.
+
+        Args:
+            query: User query to search for
+            filter_medicines: Canonical medicine names to restrict the
+                search to (None or empty searches all leaflets)
+            **overrides: Per-call ef_search, min_similarity, or
+                max_similarity_gap
+
+        Returns:
+            List of relevant documents with metadata and similarity
+
+        Raises:
+            DatabaseError: If embedding generation or search fails
+        """
+        import numpy as np
+
+        try:
+            logger.info("embedding_started", query=query)
+            query_embedding = np.asarray(
+                await get_executor(EMBEDDINGS).run(
+                    self.embeddings_model.embed_query, query
+                ),
+                dtype=np.float32,
+            )
+
+            # Function name comes from _rpc_call, never from user input
+            function, params = self._rpc_call(
+                query_embedding, filter_medicines, overrides
+            )
+            arguments = ", ".join(
+                f"{name} => %({name})b" if name == "query_embedding"
+                else f"{name} => %({name})s"
+                for name in params
+            )
+
+            logger.info(
+                "database_search_started",
+                top_k=self.top_k,
+                filter_medicines=filter_medicines,
+                rpc=function,
+                backend="postgres",
+            )
+            await self.pool.open()
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(
+                    f"select * from {function}({arguments})", params
+                )
+                rows = await cursor.fetchall()
+
+            if rows:
+                logger.info(
+                    "documents_found",
+                    count=len(rows),
+                    best_similarity=round(rows[0]["similarity"], 3),
+                )
+                return [_to_document(_plain_row(row)) for row in rows]
+
+            logger.warning("no_documents_found")
+            return []
+
+        except Exception as e:
+            logger.error("retrieval_failed", exc_info=True, error=str(e))
+            raise DatabaseError(f"Failed to retrieve documents: {e}") from e
+
+
+def _plain_row(row: dict) -> dict:
+    """Converts pgvector values to lists so documents stay serializable."""
+    embedding = row.get("embedding")
+    if embedding is not None and not isinstance(embedding, list):
+        row = {**row, "embedding": embedding.tolist()}
+    return row
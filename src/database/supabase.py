@@ -3,13 +3,14 @@ Supabase database integration with fail-fast error handling.
 Provides retriever for RAG operations and medicine database queries.
 """
 
-import asyncio
+import json
 from supabase import Client
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.retrievers import BaseRetriever
 from pydantic import BaseModel, Field
 
+from src.utils.executors import DATABASE, EMBEDDINGS, get_executor
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,29 +20,130 @@ class DatabaseError(Exception):
     """Raised when database operations fail."""
 
 
-class SupabaseRetriever(BaseRetriever):
+def _to_document(row: dict) -> Document:
     """
-    Custom retriever that searches Supabase using vector similarity.
-    Implements LangChain's BaseRetriever interface.
+    Converts a match_documents row into a Document carrying its chunk id,
+    similarity score, and (if requested) embedding.
+    """
+    metadata = {**row["metadata"], "similarity": row["similarity"]}
+    embedding = row.get("embedding")
+    if embedding is not None:
+        # PostgREST serializes pgvector values as "[0.1,0.2,...]"
+        metadata["embedding"] = (
+            json.loads(embedding) if isinstance(embedding, str) else embedding
+        )
+
+    return Document(
+        id=str(row["id"]) if row.get("id") is not None else None,
+        page_content=row["content"],
+        metadata=metadata,
+    )
+
+
+class VectorSearchRetriever(BaseRetriever):
+    """
+    Base for retrievers calling the match_documents functions.
+
+    Search-quality settings (ef_search, min_similarity, max_similarity_gap)
+    are defaults that each call can override through ainvoke() keyword
+    arguments, so different call paths trade recall against latency
+    independently. Setting any of them routes the search through
+    match_documents_adaptive (migration 009).
     """
 
-    supabase_client: Client
     embeddings_model: Embeddings
     top_k: int = Field(default=5, ge=1, le=20, description="Number of results to return")
+    include_embeddings: bool = Field(
+        default=False,
+        description="Return chunk embeddings in metadata (requires migration 003)",
+    )
+    ef_search: int | None = Field(
+        default=None,
+        ge=1,
+        le=1000,
+        description="HNSW candidate list size for the search (None keeps the "
+        "server's hnsw.ef_search)",
+    )
+    min_similarity: float | None = Field(
+        default=None,
+        ge=-1.0,
+        le=1.0,
+        description="Drop results below this similarity",
+    )
+    max_similarity_gap: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Drop results whose similarity is more than this fraction "
+        "below the best result's",
+    )
 
     class Config:
         arbitrary_types_allowed = True
 
-    def _get_relevant_documents(self, query: str) -> list[Document]:
+    def _rpc_call(
+        self,
+        query_embedding,
+        filter_medicines: list[str] | None,
+        overrides: dict,
+    ) -> tuple[str, dict]:
+        """
+        Builds the function name and parameters for a search.
+
+        Args:
+            query_embedding: Query vector
+            filter_medicines: Canonical medicine names to restrict the search to
+            overrides: Per-call ef_search/min_similarity/max_similarity_gap
+
+        Returns:
+            (function name, parameters)
+        """
+        rpc_params = {"query_embedding": query_embedding, "match_count": self.top_k}
+        if filter_medicines:
+            rpc_params["filter_medicines"] = filter_medicines
+        if self.include_embeddings:
+            rpc_params["include_embedding"] = True
+
+        tuning = {
+            "ef_search": overrides.get("ef_search", self.ef_search),
+            "min_similarity": overrides.get("min_similarity", self.min_similarity),
+            "max_relative_gap": overrides.get(
+                "max_similarity_gap", self.max_similarity_gap
+            ),
+        }
+        tuning = {key: value for key, value in tuning.items() if value is not None}
+        if not tuning:
+            return "match_documents", rpc_params
+        return "match_documents_adaptive", {**rpc_params, **tuning}
+
+
+class SupabaseRetriever(VectorSearchRetriever):
+    """
+    Custom retriever that searches Supabase using vector similarity.
+    Implements LangChain's BaseRetriever interface through PostgREST RPCs.
+    """
+
+    supabase_client: Client
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        filter_medicines: list[str] | None = None,
+        **overrides,
+    ) -> list[Document]:
         """
         Sync retrieval (fallback for compatibility).
         Prefer using async version via ainvoke().
 
         Args:
             query: User query to search for
+            filter_medicines: Canonical medicine names to restrict the
+                search to (None or empty searches all leaflets)
+            **overrides: Per-call ef_search, min_similarity, or
+                max_similarity_gap
 
         Returns:
-            List of relevant documents with metadata
+            List of relevant documents with metadata and similarity
 
         Raises:
             DatabaseError: If embedding generation or search fails
@@ -50,17 +152,21 @@ class SupabaseRetriever(BaseRetriever):
             logger.info("embedding_started_sync", query=query)
             query_embedding = self.embeddings_model.embed_query(query)
 
-            rpc_params = {"query_embedding": query_embedding, "match_count": self.top_k}
+            rpc_name, rpc_params = self._rpc_call(
+                query_embedding, filter_medicines, overrides
+            )
 
-            logger.info("database_search_started_sync", top_k=self.top_k)
-            response = self.supabase_client.rpc("match_documents", rpc_params).execute()
+            logger.info(
+                "database_search_started_sync",
+                top_k=self.top_k,
+                filter_medicines=filter_medicines,
+                rpc=rpc_name,
+            )
+            response = self.supabase_client.rpc(rpc_name, rpc_params).execute()
 
             if response.data:
                 logger.info("documents_found_sync", count=len(response.data))
-                return [
-                    Document(page_content=doc["content"], metadata=doc["metadata"])
-                    for doc in response.data
-                ]
+                return [_to_document(doc) for doc in response.data]
 
             logger.warning("no_documents_found_sync")
             return []
@@ -69,39 +175,56 @@ class SupabaseRetriever(BaseRetriever):
             logger.error("retrieval_failed_sync", exc_info=True, error=str(e))
             raise DatabaseError(f"Failed to retrieve documents: {e}") from e
 
-    async def _aget_relevant_documents(self, query: str) -> list[Document]:
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        filter_medicines: list[str] | None = None,
+        **overrides,
+    ) -> list[Document]:
         """
         Async retrieval implementation for true non-blocking operations.
         This is the preferred method for async contexts.
 
         Args:
             query: User query to search for
+            filter_medicines: Canonical medicine names to restrict the
+                search to (None or empty searches all leaflets)
+            **overrides: Per-call ef_search, min_similarity, or
+                max_similarity_gap
 
         Returns:
-            List of relevant documents with metadata
+            List of relevant documents with metadata and similarity
 
         Raises:
             DatabaseError: If embedding generation or search fails
         """
         try:
             logger.info("embedding_started", query=query)
-            query_embedding = await asyncio.to_thread(
+            query_embedding = await get_executor(EMBEDDINGS).run(
                 self.embeddings_model.embed_query, query
             )
 
-            rpc_params = {"query_embedding": query_embedding, "match_count": self.top_k}
+            rpc_name, rpc_params = self._rpc_call(
+                query_embedding, filter_medicines, overrides
+            )
 
-            logger.info("database_search_started", top_k=self.top_k)
-            response = await asyncio.to_thread(
-                lambda: self.supabase_client.rpc("match_documents", rpc_params).execute()
+            logger.info(
+                "database_search_started",
+                top_k=self.top_k,
+                filter_medicines=filter_medicines,
+                rpc=rpc_name,
+            )
+            response = await get_executor(DATABASE).run(
+                lambda: self.supabase_client.rpc(rpc_name, rpc_params).execute()
             )
 
             if response.data:
-                logger.info("documents_found", count=len(response.data))
-                return [
-                    Document(page_content=doc["content"], metadata=doc["metadata"])
-                    for doc in response.data
-                ]
+                logger.info(
+                    "documents_found",
+                    count=len(response.data),
+                    best_similarity=round(response.data[0]["similarity"], 3),
+                )
+                return [_to_document(doc) for doc in response.data]
 
             logger.warning("no_documents_found")
             return []
@@ -113,7 +236,9 @@ class SupabaseRetriever(BaseRetriever):
 
 def get_known_medicines(client: Client) -> list[str]:
     """
-    Fetches list of known medicine names from database.
+    Fetches list of known medicine names from database. With migration 006
+    this reads the medicines table maintained by ingestion (an index scan)
+    instead of scanning every chunk.
 
     Args:
         client: Supabase client instance
@@ -139,3 +264,58 @@ def get_known_medicines(client: Client) -> list[str]:
     except Exception as e:
         logger.error("fetch_medicines_failed", exc_info=True, error=str(e))
         raise DatabaseError(f"Could not load medicine list: {e}") from e
+
+
+def get_active_ingredients(client: Client) -> dict[str, list[str]]:
+    """
+    Fetches the active ingredients extracted from each leaflet.
+
+    Args:
+        client: Supabase client instance
+
+    Returns:
+        Active ingredient names per medicine name (lowercase)
+
+    Raises:
+        DatabaseError: If database query fails (e.g., migration 004 missing)
+    """
+    try:
+        logger.info("fetching_active_ingredients")
+        response = client.rpc("get_medicine_active_ingredients", {}).execute()
+
+        ingredients: dict[str, list[str]] = {}
+        for item in response.data or []:
+            medicine = item["medicine_name"].lower()
+            ingredient = item["active_ingredient"].lower()
+            if ingredient not in ingredients.setdefault(medicine, []):
+                ingredients[medicine].append(ingredient)
+
+        logger.info("active_ingredients_loaded", medicines=len(ingredients))
+        return ingredients
+
+    except Exception as e:
+        logger.error("fetch_active_ingredients_failed", exc_info=True, error=str(e))
+        raise DatabaseError(f"Could not load active ingredients: {e}") from e
+
+
+def get_catalogue_version(client: Client) -> str | None:
+    """
+    Fetches the catalogue version: the marker bumped by ingestion plus the
+    highest chunk id, so ingestions that skip the marker are noticed too.
+
+    Args:
+        client: Supabase client instance
+
+    Returns:
+        Opaque version string (None if the database returned nothing)
+
+    Raises:
+        DatabaseError: If the query fails (e.g., migration 005 missing)
+    """
+    try:
+        response = client.rpc("get_catalogue_version", {}).execute()
+        return str(response.data) if response.data is not None else None
+
+    except Exception as e:
+        logger.error("catalogue_version_probe_failed", error=str(e))
+        raise DatabaseError(f"Could not probe catalogue version: {e}") from e
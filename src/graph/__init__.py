@@ -3,19 +3,25 @@ Graph package for LangGraph agent workflow.
 """
 
 from src.graph.builder import build_graph
+from src.graph.background import BackgroundSummarizer
+from src.graph.container import ServiceContainer
 from src.graph.nodes import GraphNodes
 from src.graph.edges import (
     route_after_router,
     should_continue_react,
+    route_after_retrieval_cache,
     route_after_tools,
     should_summarize_or_end,
 )
 
 __all__ = [
     "build_graph",
+    "BackgroundSummarizer",
+    "ServiceContainer",
     "GraphNodes",
     "route_after_router",
     "should_continue_react",
+    "route_after_retrieval_cache",
     "route_after_tools",
     "should_summarize_or_end",
 ]
@@ -0,0 +1,128 @@
+"""
+Background conversation summarization.
+Runs the summarizer after a turn's answer has been returned and writes the
+result into the thread's checkpoint before the next turn starts.
+"""
+
+import time
+import asyncio
+
+from langchain_core.runnables import RunnableConfig
+
+from src.graph.edges import should_summarize_or_end
+from src.services.memory_service import MemoryService
+from src.utils.metrics import MetricsTracker
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundSummarizer:
+    """
+    Schedules summarization off the user's critical path, one task per thread.
+
+    Usage per turn:
+        await summarizer.wait(run_config)       # before streaming the turn
+        ...stream the graph...
+        summarizer.schedule(run_config)         # after the answer is shown
+
+    The graph must be built with background_summarization=True so that it
+    ends the turn without summarizing. The summary is applied with
+    aupdate_state(as_node="summarizer"), producing the same checkpoint the
+    inline summarizer node would. The next turn only waits if the summary
+    has not finished yet.
+    """
+
+    def __init__(self, graph, memory_service: MemoryService):
+        """
+        Initialize background summarizer.
+
+        Args:
+            graph: Compiled graph with a checkpointer
+            memory_service: Service producing the summary update
+        """
+        self.graph = graph
+        self.memory_service = memory_service
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def schedule(self, run_config: RunnableConfig) -> asyncio.Task | None:
+        """
+        Starts summarizing the thread in the background if it is due.
+
+        Args:
+            run_config: Run config identifying the thread
+
+        Returns:
+            The scheduled task, or None if one is already pending
+        """
+        thread_id = run_config["configurable"]["thread_id"]
+        pending = self._tasks.get(thread_id)
+        if pending is not None and not pending.done():
+            return None
+
+        task = asyncio.create_task(self._summarize(run_config))
+        self._tasks[thread_id] = task
+        return task
+
+    async def wait(self, run_config: RunnableConfig) -> None:
+        """
+        Waits for the thread's pending summary, if any. Failures are logged
+        and the turn proceeds with the unsummarized history.
+
+        Args:
+            run_config: Run config identifying the thread
+        """
+        thread_id = run_config["configurable"]["thread_id"]
+        task = self._tasks.pop(thread_id, None)
+        if task is None:
+            return
+
+        pending = not task.done()
+        start = time.perf_counter()
+        try:
+            await task
+        except Exception as e:
+            logger.error(
+                "background_summarization_failed",
+                thread_id=thread_id,
+                error=str(e),
+                exc_info=True,
+            )
+        if pending:
+            logger.info(
+                "background_summarization_awaited",
+                thread_id=thread_id,
+                wait_time=round(time.perf_counter() - start, 3),
+            )
+
+    async def aclose(self) -> None:
+        """Waits for all pending summaries so they reach the checkpointer."""
+        for thread_id in list(self._tasks):
+            await self.wait({"configurable": {"thread_id": thread_id}})
+
+    async def _summarize(self, run_config: RunnableConfig) -> bool:
+        """
+        Summarizes the latest checkpointed state if the policy says so.
+
+        Returns:
+            True if a summary was written
+        """
+        snapshot = await self.graph.aget_state(run_config)
+        if should_summarize_or_end(snapshot.values) != "summarize":
+            return False
+
+        # Own tracker: the turn's metrics are already finalized
+        tracker = MetricsTracker()
+        update = await self.memory_service.summarize_conversation(snapshot.values)
+        if not update:
+            return False
+        await self.graph.aupdate_state(run_config, update, as_node="summarizer")
+
+        metrics = tracker.finalize()
+        logger.info(
+            "background_summarization_completed",
+            thread_id=run_config["configurable"]["thread_id"],
+            duration=round(metrics["total_time"], 3),
+            cost=metrics["cost"],
+        )
+        return True
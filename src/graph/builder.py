@@ -3,121 +3,53 @@ Graph builder for constructing the LangGraph agent workflow.
 Assembles nodes, edges, and services into executable graph.
 """
 
-from supabase import create_client
-from langchain_core.tools import Tool
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from src import config
-from src.utils.logger import get_logger
-
-logger = get_logger(__name__)
 from src.models.domain import AgentState
-from src.models.schemas import MedicineToolInput
-from src.models.embeddings import get_embeddings_model
-from src.database.supabase import SupabaseRetriever, get_known_medicines
-from src.services.llm_service import LLMService, create_llm
-from src.services.retrieval_service import (
-    RetrievalService,
-    format_docs_with_sources,
-)
-from src.services.medicine_service import MedicineService
-from src.services.memory_service import MemoryService
-from src.graph.nodes import GraphNodes
+from src.database.checkpointer import create_memory_checkpointer
+from src.graph.container import ServiceContainer
 from src.graph.edges import (
     route_after_router,
     should_continue_react,
+    route_after_retrieval_cache,
     route_after_tools,
     should_summarize_or_end,
 )
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
-def build_graph(with_checkpointer: bool = False):
+def build_graph(
+    with_checkpointer: bool = False,
+    checkpointer: BaseCheckpointSaver | None = None,
+    container: ServiceContainer | None = None,
+    background_summarization: bool = False,
+):
     """
     Builds and compiles the LangGraph agent workflow.
 
     Args:
-        with_checkpointer: If True, compiles with MemorySaver for persistence
+        with_checkpointer: If True, compiles with a bounded in-memory
+            checkpointer for persistence
+        checkpointer: Checkpointer to compile with (e.g., from
+            open_checkpointer()); takes precedence over with_checkpointer
+        container: Shared services to wire into the graph; a new one is
+            created if omitted
+        background_summarization: If True, turns end without summarizing;
+            a BackgroundSummarizer applies summaries between turns
 
     Returns:
         Compiled graph ready for execution
     """
     logger.info("graph_components_initializing")
 
-    settings = config.get_settings()
-
-    supabase = create_client(settings.supabase_url, settings.supabase_service_key)
-    known_medicines = get_known_medicines(supabase)
-
-    embeddings = get_embeddings_model(
-        provider=config.EMBEDDINGS_PROVIDER.lower(),
-        model=config.EMBEDDINGS_MODEL,
-        api_key=(
-            settings.google_api_key
-            if config.EMBEDDINGS_PROVIDER.lower() == "google"
-            else settings.openai_api_key
-        ),
-        cache_size=config.EMBEDDINGS_CACHE_SIZE,
-    )
-
-    supabase_retriever = SupabaseRetriever(
-        supabase_client=supabase, embeddings_model=embeddings
-    )
-
-    agent_llm = create_llm(
-        model_name=config.AGENT_MODEL,
-        api_key=(
-            settings.openai_api_key
-            if "gpt" in config.AGENT_MODEL
-            else settings.google_api_key
-        ),
-    )
-
-    router_llm = create_llm(
-        model_name=config.ROUTER_MODEL,
-        api_key=(
-            settings.openai_api_key
-            if "gpt" in config.ROUTER_MODEL
-            else settings.google_api_key
-        ),
-    )
-
-    router_llm_service = LLMService(
-        model=router_llm,
-        max_retries=config.LLM_MAX_RETRIES,
-        timeout=config.LLM_TIMEOUT,
-        rate_limit=config.LLM_RATE_LIMIT,
-    )
-
-    retrieval_service = RetrievalService(supabase_retriever, router_llm_service)
-    medicine_service = MedicineService(router_llm_service, known_medicines)
-    memory_service = MemoryService(router_llm_service)
-
-    async def medicine_tool_func(query: str) -> str:
-        """Async tool function for medicine information retrieval."""
-        docs = await retrieval_service.search_medicine_info(query)
-        return format_docs_with_sources(docs)
-
-    medicine_tool = Tool(
-        name="get_information_about_medicine",
-        description="Busca en la BBDD de prospectos información sobre un medicamento.",
-        func=medicine_tool_func,
-        args_schema=MedicineToolInput,
-        coroutine=medicine_tool_func,
-    )
-
-    agent_llm_with_tools = agent_llm.bind_tools([medicine_tool])
-
-    nodes = GraphNodes(
-        medicine_service=medicine_service,
-        retrieval_service=retrieval_service,
-        memory_service=memory_service,
-        agent_llm_with_tools=agent_llm_with_tools,
-        rewriter_llm=router_llm,
-    )
-
-    tool_node = ToolNode([medicine_tool])
+    container = container or ServiceContainer()
+    nodes = container.nodes
+    tool_node = ToolNode([container.medicine_tool])
 
     logger.info("graph_workflow_building")
     workflow = StateGraph(AgentState)
@@ -129,6 +61,7 @@ def build_graph(with_checkpointer: bool = False):
     workflow.add_node("agent", nodes.agent_node)
     workflow.add_node("tools", tool_node)
     workflow.add_node("query_rewriter", nodes.query_rewriter_node)
+    workflow.add_node("retrieval_cache", nodes.retrieval_cache_node)
     workflow.add_node("conversational", nodes.conversational_node)
     workflow.add_node("unauthorized", nodes.unauthorized_question_node)
     workflow.add_node("handle_retrieval_failure", nodes.handle_retrieval_failure_node)
@@ -154,27 +87,41 @@ def build_graph(with_checkpointer: bool = False):
         {"tools": "query_rewriter", "end_of_turn": "pruning"},
     )
 
-    workflow.add_conditional_edges(
-        "end_of_turn",
-        should_summarize_or_end,
-        {"summarize": "summarizer", "end": END},
-    )
+    if background_summarization:
+        workflow.add_edge("end_of_turn", END)
+    else:
+        workflow.add_conditional_edges(
+            "end_of_turn",
+            should_summarize_or_end,
+            {"summarize": "summarizer", "end": END},
+        )
 
     workflow.add_conditional_edges(
         "tools", route_after_tools, {"success": "agent", "failure": "handle_retrieval_failure"}
     )
 
-    workflow.add_edge("query_rewriter", "tools")
+    workflow.add_edge("query_rewriter", "retrieval_cache")
+    workflow.add_conditional_edges(
+        "retrieval_cache",
+        route_after_retrieval_cache,
+        {"cached": "agent", "search": "tools"},
+    )
     workflow.add_edge("conversational", "end_of_turn")
     workflow.add_edge("unauthorized", "end_of_turn")
     workflow.add_edge("handle_retrieval_failure", "end_of_turn")
     workflow.add_edge("pruning", "end_of_turn")
     workflow.add_edge("summarizer", END)
 
-    if with_checkpointer:
-        memory = MemorySaver()
-        logger.info("graph_compiling", checkpointer=True)
-        return workflow.compile(checkpointer=memory)
+    if checkpointer is None and with_checkpointer:
+        checkpointer = create_memory_checkpointer()
+
+    if checkpointer is not None:
+        logger.info(
+            "graph_compiling",
+            checkpointer=True,
+            checkpointer_type=type(checkpointer).__name__,
+        )
+        return workflow.compile(checkpointer=checkpointer)
     else:
         logger.info("graph_compiling", checkpointer=False)
         return workflow.compile()
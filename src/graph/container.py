@@ -0,0 +1,315 @@
+"""
+Service container for graph construction.
+Builds clients, models, and services lazily and shares them between all
+graphs compiled in the process.
+"""
+
+from functools import cached_property
+from typing import Annotated, Any
+
+from supabase import Client, create_client
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import InjectedState
+
+from src import config
+from src.models.schemas import MedicineToolInput
+from src.models.embeddings import get_embeddings_model
+from src.database.supabase import SupabaseRetriever, VectorSearchRetriever
+from src.database.postgres_retriever import PostgresRetriever, create_retriever_pool
+from src.database.catalogue import MedicineCatalogue
+from src.database.chunk_store import ChunkStore
+from src.services.llm_service import LLMService, create_llm, get_model_name
+from src.services.retrieval_service import (
+    RetrievalService,
+    chunk_records,
+    format_docs_with_sources,
+)
+from src.services.medicine_service import MedicineService
+from src.services.memory_service import MemoryService
+from src.services.context_service import ContextBuilder
+from src.utils.circuit_breaker import get_circuit_breaker
+from src.graph.nodes import GraphNodes
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _get_api_key(model_name: str, settings: config.Settings) -> str:
+    """
+    Picks the provider API key matching a model name.
+
+    Args:
+        model_name: Model identifier (e.g., "gpt-4o", "gemini-2.5-flash")
+        settings: Application settings
+
+    Returns:
+        OpenAI key for GPT models, Google key otherwise
+    """
+    return settings.openai_api_key if "gpt" in model_name else settings.google_api_key
+
+
+def _create_llm_service(model, fallback_model=None) -> LLMService:
+    """
+    Wraps a model (and optional fallback) in an LLMService whose circuit
+    breakers use the configured thresholds.
+
+    Args:
+        model: Primary chat model (optionally bound with tools)
+        fallback_model: Model used while the primary circuit is open
+
+    Returns:
+        Configured LLMService
+    """
+    breaker_kwargs = {
+        "failure_threshold": config.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        "recovery_timeout": config.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+        "half_open_successes": config.CIRCUIT_BREAKER_HALF_OPEN_SUCCESSES,
+    }
+    return LLMService(
+        model=model,
+        max_retries=config.LLM_MAX_RETRIES,
+        timeout=config.LLM_TIMEOUT,
+        rate_limit=config.LLM_RATE_LIMIT,
+        fallback_model=fallback_model,
+        circuit_breaker=get_circuit_breaker(get_model_name(model), **breaker_kwargs),
+        fallback_circuit_breaker=(
+            get_circuit_breaker(get_model_name(fallback_model), **breaker_kwargs)
+            if fallback_model is not None
+            else None
+        ),
+    )
+
+
+class MedicineToolArgs(MedicineToolInput):
+    """
+    Tool arguments plus the medicines resolved by the router, injected from
+    state by the ToolNode and hidden from the model's tool schema.
+    """
+
+    medicines: Annotated[list[str], InjectedState("resolved_medicines")] = []
+
+
+def _rerank_retained_chunks() -> bool:
+    """True if follow-ups re-rank retained chunks by their embeddings."""
+    return config.RETAIN_TOOL_RESULTS and config.RETRIEVAL_CACHE_EMBEDDINGS > 0
+
+
+class ServiceContainer:
+    """
+    Lazily built, shared components of the agent graph.
+
+    Each component is created on first access and reused afterwards, so the
+    Studio graph and the checkpointed console graph share one Supabase
+    client, one embeddings model, one set of LLM clients, and one
+    known-medicines catalogue.
+    """
+
+    def __init__(self, settings: config.Settings | None = None):
+        """
+        Initialize container.
+
+        Args:
+            settings: Application settings (defaults to get_settings())
+        """
+        self._settings = settings
+
+    @cached_property
+    def settings(self) -> config.Settings:
+        """Application settings."""
+        return self._settings or config.get_settings()
+
+    @cached_property
+    def supabase(self) -> Client:
+        """Supabase client."""
+        logger.info("container_component_initializing", component="supabase")
+        return create_client(
+            self.settings.supabase_url, self.settings.supabase_service_key
+        )
+
+    @cached_property
+    def catalogue(self) -> MedicineCatalogue:
+        """Known medicines and active ingredients, refreshed in the background."""
+        catalogue = MedicineCatalogue(
+            self.supabase,
+            ttl=config.CATALOGUE_TTL,
+            probe_interval=config.CATALOGUE_PROBE_INTERVAL,
+        )
+        catalogue.load()
+        return catalogue
+
+    @property
+    def known_medicines(self) -> list[str]:
+        """Medicine names available in the database (current snapshot)."""
+        return self.catalogue.medicines
+
+    @cached_property
+    def embeddings(self):
+        """Query embeddings model with LRU cache."""
+        logger.info("container_component_initializing", component="embeddings")
+        provider = config.EMBEDDINGS_PROVIDER.lower()
+        return get_embeddings_model(
+            provider=provider,
+            model=config.EMBEDDINGS_MODEL,
+            api_key=(
+                self.settings.google_api_key
+                if provider == "google"
+                else self.settings.openai_api_key
+            ),
+            cache_size=config.EMBEDDINGS_CACHE_SIZE,
+        )
+
+    @cached_property
+    def retriever(self) -> VectorSearchRetriever:
+        """
+        Vector similarity retriever: PostgREST RPCs, or a direct async
+        Postgres pool when RETRIEVER_BACKEND is "postgres".
+        """
+        search_settings = {
+            "embeddings_model": self.embeddings,
+            "top_k": config.RETRIEVER_TOP_K,
+            "include_embeddings": _rerank_retained_chunks(),
+            "ef_search": config.RETRIEVER_EF_SEARCH or None,
+            "min_similarity": config.RETRIEVER_MIN_SIMILARITY or None,
+            "max_similarity_gap": config.RETRIEVER_MAX_SIMILARITY_GAP or None,
+        }
+        if config.RETRIEVER_BACKEND == "postgres":
+            logger.info("container_component_initializing", component="retriever_pool")
+            pool = create_retriever_pool(
+                self.settings.postgres_conn_str,
+                max_size=config.RETRIEVER_POOL_MAX_SIZE,
+            )
+            return PostgresRetriever(pool=pool, **search_settings)
+        return SupabaseRetriever(supabase_client=self.supabase, **search_settings)
+
+    @cached_property
+    def chunk_store(self) -> ChunkStore:
+        """Process-local store of retrieved chunks for follow-up turns."""
+        return ChunkStore(max_size=config.CHUNK_STORE_SIZE)
+
+    @cached_property
+    def chat_models(self) -> dict[str, Any]:
+        """
+        Chat model clients keyed by role ("agent", "router", and their
+        fallbacks, None when failover is disabled).
+        """
+        logger.info("container_component_initializing", component="chat_models")
+        models = {}
+        for role, model_name in (
+            ("agent", config.AGENT_MODEL),
+            ("router", config.ROUTER_MODEL),
+            ("agent_fallback", config.AGENT_FALLBACK_MODEL),
+            ("router_fallback", config.ROUTER_FALLBACK_MODEL),
+        ):
+            models[role] = (
+                create_llm(
+                    model_name=model_name,
+                    api_key=_get_api_key(model_name, self.settings),
+                )
+                if model_name
+                else None
+            )
+        return models
+
+    @cached_property
+    def router_llm_service(self) -> LLMService:
+        """LLM service for routing, rewriting, and summarization."""
+        return _create_llm_service(
+            self.chat_models["router"], self.chat_models["router_fallback"]
+        )
+
+    @cached_property
+    def retrieval_service(self) -> RetrievalService:
+        """RAG search and query rewriting."""
+        return RetrievalService(
+            self.retriever,
+            self.router_llm_service,
+            chunk_store=self.chunk_store if config.RETAIN_TOOL_RESULTS else None,
+            section_min_overlap=config.RETAINED_SECTION_MIN_OVERLAP,
+            embeddings=self.embeddings if _rerank_retained_chunks() else None,
+            cache_min_similarity=config.RETRIEVAL_CACHE_MIN_SIMILARITY,
+        )
+
+    @cached_property
+    def medicine_service(self) -> MedicineService:
+        """Intent classification and medicine validation."""
+        catalogue = self.catalogue
+        service = MedicineService(
+            self.router_llm_service, catalogue.medicines, catalogue.active_ingredients
+        )
+        catalogue.subscribe(
+            lambda c: service.update_catalogue(c.medicines, c.active_ingredients)
+        )
+        return service
+
+    @cached_property
+    def memory_service(self) -> MemoryService:
+        """Summarization and message pruning."""
+        return MemoryService(
+            self.router_llm_service,
+            model_name=config.AGENT_MODEL,
+            keep_recent_tokens=config.SUMMARIZATION_KEEP_RECENT_TOKENS,
+            max_summary_tokens=config.SUMMARY_MAX_TOKENS,
+            retain_tool_results=config.RETAIN_TOOL_RESULTS,
+            max_retained_chunks=config.RETAINED_CHUNKS_PER_THREAD,
+            max_embedded_chunks=config.RETRIEVAL_CACHE_EMBEDDINGS,
+        )
+
+    @cached_property
+    def medicine_tool(self) -> StructuredTool:
+        """Retrieval tool exposed to the agent."""
+        retrieval_service = self.retrieval_service
+
+        async def medicine_tool_func(
+            query: str, medicines: list[str] | None = None
+        ) -> tuple[str, list[dict]]:
+            """
+            Async tool function for medicine information retrieval, filtered
+            to the medicines resolved from the user's message. The artifact
+            carries compact chunk records kept after pruning.
+            """
+            docs = await retrieval_service.search_medicine_info(query, medicines)
+            return format_docs_with_sources(docs), chunk_records(docs, query)
+
+        return StructuredTool.from_function(
+            name="get_information_about_medicine",
+            description="Busca en la BBDD de prospectos información sobre un medicamento.",
+            coroutine=medicine_tool_func,
+            args_schema=MedicineToolArgs,
+            response_format="content_and_artifact",
+        )
+
+    @cached_property
+    def agent_llm_service(self) -> LLMService:
+        """LLM service wrapping the tool-bound agent model and its fallback."""
+        fallback = self.chat_models["agent_fallback"]
+        return _create_llm_service(
+            self.chat_models["agent"].bind_tools([self.medicine_tool]),
+            (
+                fallback.bind_tools([self.medicine_tool])
+                if fallback is not None
+                else None
+            ),
+        )
+
+    @cached_property
+    def nodes(self) -> GraphNodes:
+        """Graph node functions wired to the shared services."""
+        return GraphNodes(
+            medicine_service=self.medicine_service,
+            catalogue=self.catalogue,
+            retrieval_service=self.retrieval_service,
+            memory_service=self.memory_service,
+            agent_llm_service=self.agent_llm_service,
+            rewriter_llm=self.chat_models["router"],
+            context_builder=ContextBuilder(
+                model_name=config.AGENT_MODEL,
+                max_input_tokens=config.AGENT_MAX_INPUT_TOKENS,
+                compressed_tool_tokens=config.AGENT_COMPRESSED_TOOL_TOKENS,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Closes the postgres retriever pool, if one was opened."""
+        retriever = self.__dict__.get("retriever")
+        if isinstance(retriever, PostgresRetriever):
+            await retriever.pool.close()
@@ -4,6 +4,7 @@ Contains all conditional logic for graph traversal.
 """
 
 from langchain_core.messages import AIMessage, ToolMessage
+from src import config
 from src.models.domain import AgentState
 from src.utils.prompts import load_prompts
 from src.utils.logger import get_logger
@@ -13,7 +14,6 @@ logger = get_logger(__name__)
 
 PROMPTS = load_prompts()
 RETRIEVAL_FAILURE_MESSAGE = PROMPTS["constants"]["retrieval_failure_message"]
-SUMMARIZATION_TURN_THRESHOLD = 3
 
 
 def route_after_router(state: AgentState) -> str:
@@ -72,6 +72,21 @@ def should_continue_react(state: AgentState) -> str:
     return "end_of_turn"
 
 
+def route_after_retrieval_cache(state: AgentState) -> str:
+    """
+    Routes to the agent when the retrieval cache answered the tool calls.
+
+    Args:
+        state: Current agent state
+
+    Returns:
+        "cached" if the last message is a tool result, "search" otherwise
+    """
+    if state.get("messages") and isinstance(state["messages"][-1], ToolMessage):
+        return "cached"
+    return "search"
+
+
 def route_after_tools(state: AgentState) -> str:
     """
     Routes after tool execution based on retrieval success.
@@ -105,21 +120,23 @@ def route_after_tools(state: AgentState) -> str:
 
 def should_summarize_or_end(state: AgentState) -> str:
     """
-    Decides if conversation should be summarized based on turn count.
+    Decides if conversation should be summarized based on the size of the
+    message window recorded by end_of_turn.
 
     Args:
         state: Current agent state
 
     Returns:
-        "summarize" if threshold reached, "end" otherwise
+        "summarize" if the window exceeds the token threshold, "end" otherwise
     """
-    turn_count = state.get("turn_count", 0)
+    window_tokens = state.get("window_tokens", 0)
+    threshold = config.SUMMARIZATION_TRIGGER_TOKENS
     logger.info(
-        "turn_count_check",
-        turn_count=turn_count,
-        threshold=SUMMARIZATION_TURN_THRESHOLD
+        "window_tokens_check",
+        window_tokens=window_tokens,
+        threshold=threshold,
     )
 
-    if turn_count >= SUMMARIZATION_TURN_THRESHOLD:
+    if window_tokens > threshold:
         return "summarize"
     return "end"
@@ -3,8 +3,9 @@ Graph nodes implementing the agent's decision points.
 Each node is thin and delegates business logic to services.
 """
 
-from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.messages import AIMessage, ToolMessage
 from src.models.domain import AgentState
+from src.services.retrieval_service import chunk_records, format_docs_with_sources
 from src.utils.prompts import load_prompts
 from src.utils.logger import get_logger
 
@@ -23,8 +24,10 @@ class GraphNodes:
         medicine_service,
         retrieval_service,
         memory_service,
-        agent_llm_with_tools,
+        agent_llm_service,
         rewriter_llm,
+        context_builder,
+        catalogue=None,
     ):
         """
         Initialize graph nodes with required services.
@@ -33,21 +36,29 @@ class GraphNodes:
             medicine_service: Service for medicine operations
             retrieval_service: Service for RAG operations
             memory_service: Service for memory management
-            agent_llm_with_tools: LLM bound with tools for agent
+            agent_llm_service: LLM service wrapping the tool-bound agent model
             rewriter_llm: LLM for query rewriting
+            context_builder: Builder enforcing the agent input token budget
+            catalogue: Medicine catalogue refreshed between turns (None
+                keeps the medicines loaded at startup)
         """
         self.medicine_service = medicine_service
         self.retrieval_service = retrieval_service
         self.memory_service = memory_service
-        self.agent_llm_with_tools = agent_llm_with_tools
+        self.agent_llm_service = agent_llm_service
         self.rewriter_llm = rewriter_llm
+        self.context_builder = context_builder
+        self.catalogue = catalogue
 
     async def router_node(self, state: AgentState) -> dict:
         """
         Entry point node that classifies intent and validates medicine (async).
-        Delegates to MedicineService.
+        Delegates to MedicineService. Starts a background catalogue refresh
+        when one is due; this turn still uses the current catalogue.
         """
         logger.info("node_started", node="router", action="classifying_intent")
+        if self.catalogue is not None:
+            self.catalogue.maybe_refresh()
         return await self.medicine_service.classify_intent_and_validate(state)
 
     async def agent_node(self, state: AgentState) -> dict:
@@ -56,17 +67,15 @@ class GraphNodes:
         """
         logger.info("node_started", node="agent", action="processing_with_tools")
 
-        agent_system_prompt = PROMPTS["agent_system"]["content"]
-        context = [SystemMessage(content=agent_system_prompt)]
-
-        if state.get("summary"):
-            context.append(
-                SystemMessage(f"Resumen de la conversación:\n{state['summary']}")
-            )
-
-        context.extend(state["messages"])
+        context, _ = self.context_builder.build(
+            system_prompt=PROMPTS["agent_system"]["content"],
+            messages=state["messages"],
+            summary=state.get("summary"),
+        )
 
-        response = await self.agent_llm_with_tools.ainvoke(context)
+        response = await self.agent_llm_service.invoke_with_retry(
+            context, node="agent"
+        )
         return {"messages": [response]}
 
     async def query_rewriter_node(self, state: AgentState) -> dict:
@@ -101,6 +110,45 @@ class GraphNodes:
         all_but_last = state["messages"][:-1]
         return {"messages": all_but_last + [new_message]}
 
+    async def retrieval_cache_node(self, state: AgentState) -> dict:
+        """
+        Answers the agent's tool calls from chunks retrieved in earlier turns
+        (by section, then by re-ranking their embeddings), skipping the
+        vector search. Otherwise leaves the calls to the tools node (async).
+        """
+        logger.info("node_started", node="retrieval_cache")
+
+        retained = state.get("retrieved_chunks")
+        last_message = state["messages"][-1]
+        if not retained or not last_message.tool_calls:
+            return {}
+
+        # Only chunks of this turn's resolved medicines, or of the
+        # conversation's when the follow-up names none
+        medicines = state.get("resolved_medicines") or state.get(
+            "current_medicines", []
+        )
+
+        tool_messages = []
+        for tool_call in last_message.tool_calls:
+            query = tool_call["args"]["query"]
+            docs = await self.retrieval_service.search_retained(
+                query, retained, medicines
+            )
+            if docs is None:
+                return {}
+            tool_messages.append(
+                ToolMessage(
+                    content=format_docs_with_sources(docs),
+                    artifact=chunk_records(docs, query),
+                    name=tool_call["name"],
+                    tool_call_id=tool_call["id"],
+                )
+            )
+
+        logger.info("retrieval_cache_hit", tool_calls=len(tool_messages))
+        return {"messages": tool_messages}
+
     def conversational_node(self, state: AgentState) -> dict:  # noqa: ARG002
         """Handles simple greetings and farewells."""
         logger.info("node_started", node="conversational", action="handling_greeting")
@@ -139,9 +187,17 @@ class GraphNodes:
         return await self.memory_service.summarize_conversation(state)
 
     def end_of_turn_node(self, state: AgentState) -> dict:
-        """Increments turn counter at end of conversation turn."""
+        """
+        Increments turn counter and records the message window size used
+        to decide on summarization.
+        """
         logger.info("node_started", node="end_of_turn", action="incrementing_counter")
-        return self.memory_service.increment_turn_count(state)
+        return {
+            **self.memory_service.increment_turn_count(state),
+            "window_tokens": self.memory_service.count_window_tokens(
+                state["messages"]
+            ),
+        }
 
     def pruning_node(self, state: AgentState) -> dict:
         """
@@ -1,15 +1,25 @@
 """
 Models package exports for domain, schemas, and embeddings.
+Exports are imported on first access so provider SDKs load only when used.
 """
 
-from src.models.domain import AgentState
-from src.models.schemas import UserIntent, MedicineToolInput
-from src.models.embeddings import get_embeddings_model, CustomGoogleEmbeddings
-
-__all__ = [
-    "AgentState",
-    "UserIntent",
-    "MedicineToolInput",
-    "get_embeddings_model",
-    "CustomGoogleEmbeddings",
-]
+from importlib import import_module
+
+_EXPORTS = {
+    "AgentState": "src.models.domain",
+    "UserIntent": "src.models.schemas",
+    "MedicineToolInput": "src.models.schemas",
+    "get_embeddings_model": "src.models.embeddings",
+    "normalize_embeddings": "src.models.embeddings",
+    "CustomGoogleEmbeddings": "src.models.google_embeddings",
+    "FakeChatModel": "src.models.fake_llm",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Imports an exported name from its module on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name]), name)
@@ -17,13 +17,23 @@ class AgentState(TypedDict):
     Attributes:
         messages: Sliding window of recent conversation messages.
         summary: Long-term conversation summary for context management.
-        turn_count: Explicit counter for triggering summarization.
+        turn_count: Turns since the last summarization.
+        window_tokens: Token size of the message window at the end of the
+            last turn, used to trigger summarization.
         current_medicines: List of validated medicine names mentioned.
+        resolved_medicines: Canonical medicine names resolved from the last
+            user message, used to filter the vector search.
         intent: Classified intent of the last user message.
+        retrieved_chunks: Compact records (id, medicine_name, path,
+            similarity, query) of chunks retrieved in earlier turns; the
+            documents themselves live in the process ChunkStore.
     """
 
     messages: Annotated[list[BaseMessage], add_messages]
     summary: str
     turn_count: int
+    window_tokens: int
     current_medicines: list[str]
+    resolved_medicines: list[str]
     intent: str
+    retrieved_chunks: list[dict]
@@ -2,50 +2,18 @@
 Embeddings model factory and custom wrappers.
 Centralizes embeddings provider selection (OpenAI vs Google).
 Includes LRU cache for query embeddings to reduce costs.
+Provider integrations are imported only when their provider is selected.
 """
 
 from typing import Literal
 from functools import lru_cache
 from langchain_core.embeddings import Embeddings
-from langchain_openai import OpenAIEmbeddings
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-class CustomGoogleEmbeddings(GoogleGenerativeAIEmbeddings):
-    """
-    Wrapper around GoogleGenerativeAIEmbeddings to enforce consistent
-    output dimensionality and appropriate task_type for each call.
-    """
-
-    output_dim: int = 1536
-
-    def embed_query(self, text: str, **kwargs) -> list[float]:
-        """Embeds a query with optimized parameters for search."""
-        kwargs.pop("output_dimensionality", None)
-        kwargs.pop("task_type", None)
-        return super().embed_query(
-            text=text,
-            output_dimensionality=self.output_dim,
-            task_type="retrieval_query",
-            **kwargs,
-        )
-
-    def embed_documents(self, texts: list[str], **kwargs) -> list[list[float]]:
-        """Embeds documents with optimized parameters for storage."""
-        kwargs.pop("output_dimensionality", None)
-        kwargs.pop("task_type", None)
-        return super().embed_documents(
-            texts=texts,
-            output_dimensionality=self.output_dim,
-            task_type="retrieval_document",
-            **kwargs,
-        )
-
-
 class CachedEmbeddingsWrapper(Embeddings):
     """
     Wrapper that adds LRU cache to embed_query for cost reduction.
@@ -122,8 +90,12 @@ def get_embeddings_model(
     logger.info("embeddings_model_initializing", provider=provider, model=model)
 
     if provider == "google":
+        from src.models.google_embeddings import CustomGoogleEmbeddings
+
         base_embeddings = CustomGoogleEmbeddings(google_api_key=api_key, model=model)
     elif provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
         base_embeddings = OpenAIEmbeddings(api_key=api_key, model=model)
     else:
         raise ValueError(
@@ -137,3 +109,23 @@ def get_embeddings_model(
     else:
         logger.info("embeddings_cache_disabled")
         return base_embeddings
+
+
+def normalize_embeddings(vectors: list[list[float]]) -> list[list[float]]:
+    """
+    Scales vectors to unit length, so inner product equals cosine similarity
+    (lets the database index them with halfvec_ip_ops, see migration 008).
+
+    Args:
+        vectors: Embedding vectors
+
+    Returns:
+        Unit-length vectors (zero vectors are returned unchanged)
+    """
+    import numpy as np
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.size == 0:
+        return [list(v) for v in vectors]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms > 0, norms, 1.0)).tolist()
@@ -0,0 +1,261 @@
+"""
+Deterministic local chat model for load and latency testing.
+Stands in for the router, rewriter, summarizer, and agent models without
+calling any provider, with configurable latency, usage, and failures.
+"""
+
+import re
+import math
+import time
+import random
+import asyncio
+from typing import Any, Literal, Sequence
+
+from pydantic import Field, PrivateAttr
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+INTENT_TOOL_NAME = "UserIntent"
+MEDICINE_TOOL_NAME = "get_information_about_medicine"
+
+GREETING_PATTERN = re.compile(
+    r"\b(hola|buen[oa]s|adi[oó]s|gracias|hasta luego|chao)\b", re.IGNORECASE
+)
+ROUTER_QUESTION_PATTERN = re.compile(r"Pregunta:\s*'(.*)'", re.DOTALL)
+REWRITER_QUERY_PATTERN = re.compile(
+    r"\*\*Consulta Simple a Reescribir:\*\*\s*(.*?)\s*\*\*Consulta Reescrita", re.DOTALL
+)
+
+
+class FakeLLMError(Exception):
+    """Raised when the fake model injects a failure."""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Rule-based or scripted chat model for hermetic benchmarks.
+
+    Rule-based mode answers each graph role the way a real model would:
+    UserIntent tool calls for the router, medicine tool calls and final
+    answers for the agent, and plain text for the rewriter and summarizer.
+    Scripted mode replays a fixed list of responses in order.
+    """
+
+    model_name: str = "fake"
+    responses: list[BaseMessage | str] = Field(default_factory=list)
+    known_medicines: list[str] = Field(
+        default_factory=lambda: [
+            "ibuprofeno",
+            "nolotil",
+            "sintrom",
+            "lexatin",
+            "espidifen",
+        ]
+    )
+    latency_distribution: Literal["constant", "uniform", "lognormal"] = "constant"
+    latency_mean: float = Field(default=0.0, ge=0.0, description="Seconds")
+    latency_stddev: float = Field(default=0.0, ge=0.0, description="Seconds")
+    failure_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    timeout_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    hang_seconds: float = Field(default=3600.0, ge=0.0)
+    seed: int | None = None
+
+    _rng: random.Random = PrivateAttr()
+    _call_count: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Initializes the seeded random generator."""
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        """Identifier used by LangChain callbacks."""
+        return "fake-chat-model"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        """
+        Binds tools in OpenAI format so tool names reach the rules.
+
+        Args:
+            tools: Tools, Pydantic schemas, or tool dicts
+            **kwargs: Extra bind arguments
+
+        Returns:
+            Runnable binding of this model with the tools
+        """
+        return self.bind(
+            tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Sync generation with blocking simulated latency."""
+        call_number, delay, fail = self._plan_call()
+        time.sleep(delay)
+        if fail:
+            raise FakeLLMError(f"Injected failure in {self.model_name}")
+        return self._build_result(messages, kwargs.get("tools") or [], call_number)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Async generation with non-blocking simulated latency."""
+        call_number, delay, fail = self._plan_call()
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeLLMError(f"Injected failure in {self.model_name}")
+        return self._build_result(messages, kwargs.get("tools") or [], call_number)
+
+    def _plan_call(self) -> tuple[int, float, bool]:
+        """
+        Draws latency and failure outcome for one call.
+
+        Returns:
+            Tuple of (call number, delay in seconds, whether to raise an
+            injected failure)
+        """
+        self._call_count += 1
+        call_number = self._call_count
+
+        if self.timeout_rate and self._rng.random() < self.timeout_rate:
+            return call_number, self.hang_seconds, False
+
+        fail = bool(self.failure_rate) and self._rng.random() < self.failure_rate
+        return call_number, self._sample_latency(), fail
+
+    def _sample_latency(self) -> float:
+        """Samples a latency from the configured distribution."""
+        mean, stddev = self.latency_mean, self.latency_stddev
+        if mean <= 0:
+            return 0.0
+        if self.latency_distribution == "uniform":
+            return max(0.0, self._rng.uniform(mean - stddev, mean + stddev))
+        if self.latency_distribution == "lognormal" and stddev > 0:
+            sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+            mu = math.log(mean) - sigma**2 / 2
+            return self._rng.lognormvariate(mu, sigma)
+        return mean
+
+    def _build_result(
+        self, messages: list[BaseMessage], tools: list[Any], call_number: int
+    ) -> ChatResult:
+        """Builds the response message with usage metadata."""
+        if self.responses:
+            scripted = self.responses[(call_number - 1) % len(self.responses)]
+            message = (
+                AIMessage(content=scripted)
+                if isinstance(scripted, str)
+                else scripted.model_copy()
+            )
+        else:
+            message = self._respond(
+                messages, {_tool_name(t) for t in tools}, call_number
+            )
+
+        input_tokens = _estimate_tokens(" ".join(_text(m) for m in messages))
+        output_tokens = _estimate_tokens(_text(message) + str(message.tool_calls))
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        message.response_metadata = {"model_name": self.model_name}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _respond(
+        self, messages: list[BaseMessage], tool_names: set[str], call_number: int
+    ) -> AIMessage:
+        """
+        Rule-based response for each graph role.
+
+        Args:
+            messages: Input messages
+            tool_names: Names of tools offered to the model
+            call_number: Sequence number used for deterministic tool call ids
+
+        Returns:
+            AIMessage with content or tool calls
+        """
+        last_message = messages[-1]
+        last_text = _text(last_message)
+
+        if INTENT_TOOL_NAME in tool_names:
+            return _tool_call_message(
+                INTENT_TOOL_NAME, self._classify_intent(last_text), call_number
+            )
+
+        if MEDICINE_TOOL_NAME in tool_names:
+            if isinstance(last_message, ToolMessage):
+                return AIMessage(content=f"Según el prospecto: {last_text[:300]}")
+            question = next(
+                (_text(m) for m in reversed(messages) if isinstance(m, HumanMessage)),
+                last_text,
+            )
+            return _tool_call_message(
+                MEDICINE_TOOL_NAME, {"query": question[:500].ljust(3)}, call_number
+            )
+
+        if match := REWRITER_QUERY_PATTERN.search(last_text):
+            return AIMessage(content=match.group(1).strip())
+        if "RESUMEN ACTUAL" in last_text:
+            return AIMessage(content=f"Resumen: {last_text[-300:].strip()}")
+        return AIMessage(content=f"Respuesta simulada: {last_text[:200]}")
+
+    def _classify_intent(self, text: str) -> dict[str, Any]:
+        """Keyword-based stand-in for the router classification."""
+        if match := ROUTER_QUESTION_PATTERN.search(text):
+            text = match.group(1)
+        lowered = text.lower()
+
+        for medicine in self.known_medicines:
+            if re.search(r"\b" + re.escape(medicine.lower()) + r"\b", lowered):
+                return {"intent": "pregunta_medicamento", "medicine_name": medicine}
+        if GREETING_PATTERN.search(lowered):
+            return {"intent": "saludo_despedida", "medicine_name": None}
+        return {"intent": "pregunta_general", "medicine_name": None}
+
+
+def _tool_call_message(name: str, args: dict[str, Any], call_number: int) -> AIMessage:
+    """Builds an AIMessage with a single deterministic tool call."""
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": args, "id": f"call_fake_{call_number}"}],
+    )
+
+
+def _tool_name(tool: Any) -> str:
+    """Extracts the name of a tool given as schema, dict, or BaseTool."""
+    if isinstance(tool, dict):
+        return tool.get("function", tool).get("name", "")
+    return getattr(tool, "name", None) or getattr(tool, "__name__", "")
+
+
+def _text(message: BaseMessage) -> str:
+    """Returns message content as plain text."""
+    if isinstance(message.content, str):
+        return message.content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in message.content
+    )
+
+
+def _estimate_tokens(text: str) -> int:
+    """Approximates token count (about 4 characters per token)."""
+    return max(1, len(text) // 4)
@@ -0,0 +1,37 @@
+"""
+Google embeddings wrapper with fixed dimensionality and task types.
+Kept in its own module so the Google SDK is only imported when selected.
+"""
+
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+
+class CustomGoogleEmbeddings(GoogleGenerativeAIEmbeddings):
+    """
+    Wrapper around GoogleGenerativeAIEmbeddings to enforce consistent
+    output dimensionality and appropriate task_type for each call.
+    """
+
+    output_dim: int = 1536
+
+    def embed_query(self, text: str, **kwargs) -> list[float]:
+        """Embeds a query with optimized parameters for search."""
+        kwargs.pop("output_dimensionality", None)
+        kwargs.pop("task_type", None)
+        return super().embed_query(
+            text=text,
+            output_dimensionality=self.output_dim,
+            task_type="retrieval_query",
+            **kwargs,
+        )
+
+    def embed_documents(self, texts: list[str], **kwargs) -> list[list[float]]:
+        """Embeds documents with optimized parameters for storage."""
+        kwargs.pop("output_dimensionality", None)
+        kwargs.pop("task_type", None)
+        return super().embed_documents(
+            texts=texts,
+            output_dimensionality=self.output_dim,
+            task_type="retrieval_document",
+            **kwargs,
+        )
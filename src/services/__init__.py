@@ -1,30 +1,33 @@
 """
 Services package exports for business logic layer.
+Exports are imported on first access, so the chat path does not load the
+ingestion dependencies (PyMuPDF, NLTK, text splitters).
 """
 
-from src.services.llm_service import LLMService, create_llm, LLMError, LLMTimeoutError
-from src.services.retrieval_service import (
-    RetrievalService,
-    format_docs_with_sources,
-)
-from src.services.medicine_service import MedicineService
-from src.services.memory_service import MemoryService
-from src.services.pdf_service import PDFService, PDFParsingError
-from src.services.chunking_service import ChunkingService
-from src.services.ingestion_service import IngestionService, IngestionError
+from importlib import import_module
 
-__all__ = [
-    "LLMService",
-    "create_llm",
-    "LLMError",
-    "LLMTimeoutError",
-    "RetrievalService",
-    "format_docs_with_sources",
-    "MedicineService",
-    "MemoryService",
-    "PDFService",
-    "PDFParsingError",
-    "ChunkingService",
-    "IngestionService",
-    "IngestionError",
-]
+_EXPORTS = {
+    "LLMService": "src.services.llm_service",
+    "create_llm": "src.services.llm_service",
+    "LLMError": "src.services.llm_service",
+    "LLMTimeoutError": "src.services.llm_service",
+    "RetrievalService": "src.services.retrieval_service",
+    "format_docs_with_sources": "src.services.retrieval_service",
+    "MedicineService": "src.services.medicine_service",
+    "MemoryService": "src.services.memory_service",
+    "ContextBuilder": "src.services.context_service",
+    "PDFService": "src.services.pdf_service",
+    "PDFParsingError": "src.services.pdf_service",
+    "ChunkingService": "src.services.chunking_service",
+    "IngestionService": "src.services.ingestion_service",
+    "IngestionError": "src.services.ingestion_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Imports an exported name from its module on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name]), name)
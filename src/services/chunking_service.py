@@ -9,6 +9,8 @@ from markdown_it import MarkdownIt
 from langchain_core.documents import Document
 from langchain.text_splitter import NLTKTextSplitter
 
+from src.utils.sentence_segmenter import SentenceSegmenter
+
 
 class ChunkingService:
     """
@@ -16,19 +18,39 @@ class ChunkingService:
     Uses semantic blocking and sentence-window strategy.
     """
 
-    def __init__(self, window_size: int = 2, language: str = "spanish"):
+    def __init__(
+        self,
+        window_size: int = 2,
+        language: str = "spanish",
+        sentence_splitter: str = "nltk",
+    ):
         """
         Initialize chunking service.
 
         Args:
             window_size: Number of sentences before/after for context window
             language: Language for sentence splitting (default: spanish)
+            sentence_splitter: "nltk" (LangChain NLTKTextSplitter) or
+                "punkt" (Punkt model loaded once per process, with Spanish
+                abbreviations)
+
+        Raises:
+            ValueError: If the sentence splitter is unknown
         """
         self.window_size = window_size
-        self.sentence_splitter = NLTKTextSplitter(language=language)
+        self.language = language
+        if sentence_splitter == "punkt":
+            self.sentence_splitter = SentenceSegmenter(language=language)
+        elif sentence_splitter == "nltk":
+            self.sentence_splitter = NLTKTextSplitter(language=language)
+        else:
+            raise ValueError(
+                f"Unknown sentence splitter '{sentence_splitter}'. "
+                "Valid: ['nltk', 'punkt']"
+            )
         logging.info(
             f"Chunking service initialized (window={window_size}, "
-            f"language={language})"
+            f"language={language}, splitter={sentence_splitter})"
         )
 
     def markdown_to_semantic_blocks(
@@ -37,42 +59,29 @@ class ChunkingService:
         """
         Parses Markdown and groups into semantic blocks based on headers.
 
+        Single pass over the tokens: open list items wait on a stack for
+        their first inline token, so long lists cost linear time.
+
         Args:
             markdown_text: Input markdown content
 
         Returns:
             List of semantic blocks with path and content
         """
-        md = MarkdownIt()
-        tokens = md.parse(markdown_text)
+        tokens = MarkdownIt().parse(markdown_text)
 
-        blocks = []
+        # Block parts are strings, or [indent, text] slots of list items
+        # whose text is filled in when their first inline token arrives
+        raw_blocks = []
         current_block_content = []
         current_path = []
-
-        # Add dummy token to ensure last block is saved
-        tokens.append(
-            type("Token", (), {
-                "type": "heading_open",
-                "tag": "h0",
-                "content": "End",
-                "level": 0,
-            })()
-        )
+        open_items = []
+        previous_type = None
 
         for i, token in enumerate(tokens):
             if token.type == "heading_open":
                 if current_block_content:
-                    blocks.append(
-                        {
-                            "path": (
-                                " > ".join(current_path)
-                                if current_path
-                                else "General Information"
-                            ),
-                            "content": "".join(current_block_content).strip(),
-                        }
-                    )
+                    raw_blocks.append((current_path, current_block_content))
 
                 level = int(token.tag[1]) if token.tag else 99
 
@@ -80,38 +89,47 @@ class ChunkingService:
                 if i + 1 < len(tokens) and tokens[i + 1].type == "inline":
                     header_content = tokens[i + 1].content
 
-                if level == 0:
-                    break
-
-                while len(current_path) >= level:
-                    current_path.pop()
-                current_path.append(header_content)
-
+                current_path = current_path[: level - 1] + [header_content]
                 current_block_content = [f"{'#' * level} {header_content}\n\n"]
 
             elif token.type == "paragraph_open":
-                if i > 0 and tokens[i - 1].type == "list_item_open":
-                    continue
-                content = tokens[i + 1].content if i + 1 < len(tokens) else ""
-                current_block_content.append(f"{content}\n\n")
+                if previous_type != "list_item_open":
+                    content = tokens[i + 1].content if i + 1 < len(tokens) else ""
+                    current_block_content.append(f"{content}\n\n")
 
             elif token.type == "bullet_list_open":
                 current_block_content.append("\n")
 
             elif token.type == "list_item_open":
-                item_content = ""
-                for next_token in tokens[i + 1 :]:
-                    if (
-                        next_token.type == "list_item_close"
-                        and next_token.level == token.level
-                    ):
-                        break
-                    if next_token.type == "inline":
-                        item_content = next_token.content
+                slot = ["    " * (token.level // 2), None]
+                open_items.append(slot)
+                current_block_content.append(slot)
+
+            elif token.type == "list_item_close":
+                open_items.pop()
+
+            elif token.type == "inline":
+                # An item without text of its own takes its first nested one
+                for slot in reversed(open_items):
+                    if slot[1] is not None:
                         break
+                    slot[1] = token.content
+
+            previous_type = token.type
+
+        if current_block_content:
+            raw_blocks.append((current_path, current_block_content))
 
-                indent = "    " * (token.level // 2)
-                current_block_content.append(f"{indent}- {item_content}\n")
+        blocks = [
+            {
+                "path": " > ".join(path) if path else "General Information",
+                "content": "".join(
+                    part if isinstance(part, str) else f"{part[0]}- {part[1] or ''}\n"
+                    for part in parts
+                ).strip(),
+            }
+            for path, parts in raw_blocks
+        ]
 
         logging.info(f"Created {len(blocks)} semantic blocks")
         return blocks
@@ -135,48 +153,21 @@ class ChunkingService:
         """
         all_chunks = []
 
-        for block in blocks:
-            sentences_in_block = []
-
-            content_without_headers = "\n".join(
-                [
-                    line
-                    for line in block["content"].strip().split("\n")
-                    if not line.strip().startswith("#")
-                ]
-            )
+        # Collect every paragraph first, split them all with the configured
+        # splitter, then rebuild each block's sentences in order
+        layouts = [self._block_layout(block) for block in blocks]
+        paragraphs = [
+            text for layout in layouts for is_paragraph, text in layout if is_paragraph
+        ]
+        split_paragraphs = iter(self._split_paragraphs(paragraphs))
 
-            lines = content_without_headers.strip().split("\n")
-            paragraph_buffer = []
-
-            for line in lines:
-                stripped_line = line.strip()
-
-                if stripped_line.startswith("- "):
-                    if paragraph_buffer:
-                        full_paragraph = " ".join(paragraph_buffer)
-                        sentences_in_block.extend(
-                            self.sentence_splitter.split_text(full_paragraph)
-                        )
-                        paragraph_buffer = []
-
-                    sentences_in_block.append(stripped_line.lstrip("- ").strip())
-
-                elif not stripped_line:
-                    if paragraph_buffer:
-                        full_paragraph = " ".join(paragraph_buffer)
-                        sentences_in_block.extend(
-                            self.sentence_splitter.split_text(full_paragraph)
-                        )
-                        paragraph_buffer = []
+        for block, layout in zip(blocks, layouts):
+            sentences_in_block = []
+            for is_paragraph, text in layout:
+                if is_paragraph:
+                    sentences_in_block.extend(next(split_paragraphs))
                 else:
-                    paragraph_buffer.append(stripped_line)
-
-            if paragraph_buffer:
-                full_paragraph = " ".join(paragraph_buffer)
-                sentences_in_block.extend(
-                    self.sentence_splitter.split_text(full_paragraph)
-                )
+                    sentences_in_block.append(text)
 
             sentences = [s for s in sentences_in_block if s]
 
@@ -214,6 +205,57 @@ CONTEXT:
         )
         return all_chunks
 
+    def _block_layout(self, block: dict) -> list[tuple[bool, str]]:
+        """
+        Splits a block's content (headers removed) into paragraphs and list
+        items, in order.
+
+        Args:
+            block: Semantic block from markdown_to_semantic_blocks
+
+        Returns:
+            (is_paragraph, text) pairs; list items are kept as sentences
+        """
+        content_without_headers = "\n".join(
+            [
+                line
+                for line in block["content"].strip().split("\n")
+                if not line.strip().startswith("#")
+            ]
+        )
+
+        layout = []
+        paragraph_buffer = []
+        for line in content_without_headers.strip().split("\n"):
+            stripped_line = line.strip()
+
+            if stripped_line.startswith("- ") or not stripped_line:
+                if paragraph_buffer:
+                    layout.append((True, " ".join(paragraph_buffer)))
+                    paragraph_buffer = []
+                if stripped_line:
+                    layout.append((False, stripped_line.lstrip("- ").strip()))
+            else:
+                paragraph_buffer.append(stripped_line)
+
+        if paragraph_buffer:
+            layout.append((True, " ".join(paragraph_buffer)))
+        return layout
+
+    def _split_paragraphs(self, paragraphs: list[str]) -> list[list[str]]:
+        """
+        Splits paragraphs into sentences with the configured splitter.
+
+        Args:
+            paragraphs: Paragraph texts of one document
+
+        Returns:
+            Sentences per paragraph, in the same order
+        """
+        if isinstance(self.sentence_splitter, SentenceSegmenter):
+            return self.sentence_splitter.split_paragraphs(paragraphs)
+        return [self.sentence_splitter.split_text(text) for text in paragraphs]
+
     def extract_medicine_name(
         self, markdown_text: str, fallback_filename: str
     ) -> str:
@@ -251,6 +293,33 @@ CONTEXT:
         )
         return name_from_file
 
+    def extract_active_ingredients(self, markdown_text: str) -> list[str]:
+        """
+        Extracts active ingredient names from prospectus markdown
+        (e.g., "El principio activo es metamizol magnésico.").
+
+        Args:
+            markdown_text: Markdown content
+
+        Returns:
+            Lowercase active ingredient names in order of appearance
+            (empty if none are stated)
+        """
+        patterns = (
+            r"principios? activos? (?:es|son)\s+([^.(\n]+)",
+            r"contiene (?:el|los) principios? activos?\s+([^.(\n]+)",
+        )
+        ingredients = []
+        for pattern in patterns:
+            for match in re.finditer(pattern, markdown_text, re.IGNORECASE):
+                for name in re.split(r",|\s+y\s+", match.group(1)):
+                    name = " ".join(name.lower().split())
+                    if name and name not in ingredients:
+                        ingredients.append(name)
+
+        logging.info(f"Extracted active ingredients: {ingredients}")
+        return ingredients
+
     def standardize_medicine_name(self, raw_name: str) -> str:
         """
         Normalizes medicine name to canonical form.
@@ -0,0 +1,201 @@
+"""
+Context service assembling token-budgeted prompts for the agent.
+Compresses older tool outputs and drops the oldest turns when the
+conversation would exceed the configured input budget.
+"""
+
+import json
+from typing import Any
+
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from src.utils.tokenizer import count_message_tokens, get_token_counter
+from src.utils.metrics import record_context_usage
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRUNCATION_MARKER = "\n[... salida de herramienta recortada ...]"
+
+
+class ContextBuilder:
+    """
+    Builds the agent prompt within an input token budget.
+
+    Trimming order (earlier turns only):
+    1. Compress earlier tool outputs from oldest to newest, keeping their
+       head (sources are ranked, so the most relevant ones survive).
+    2. Drop whole earlier turns, oldest first, cutting at a HumanMessage
+       so tool calls are never separated from their results.
+
+    The system prompt, the summary, and the current turn (from the last
+    HumanMessage on) are always kept whole: the agent answers from the
+    current turn's tool outputs, so they are never truncated.
+    The static system prompt always comes first and the per-thread summary
+    after it, so the provider prompt cache can reuse the shared prefix.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_input_tokens: int,
+        compressed_tool_tokens: int = 300,
+    ):
+        """
+        Initialize context builder.
+
+        Args:
+            model_name: Model whose tokenizer is used for counting
+            max_input_tokens: Input token budget for a single call
+            compressed_tool_tokens: Tokens kept from each compressed tool output
+        """
+        self.model_name = model_name
+        self.max_input_tokens = max_input_tokens
+        self.compressed_tool_tokens = compressed_tool_tokens
+        self._count_text = get_token_counter(model_name)
+
+    def count_message_tokens(self, message: BaseMessage) -> int:
+        """
+        Counts tokens of a message, including tool call arguments.
+
+        Args:
+            message: Message to count
+
+        Returns:
+            Approximate token count of the message
+        """
+        return count_message_tokens(message, self._count_text)
+
+    def build(
+        self,
+        system_prompt: str,
+        messages: list[BaseMessage],
+        summary: str | None = None,
+    ) -> tuple[list[BaseMessage], dict[str, Any]]:
+        """
+        Assembles system prompt, summary, and history within the budget.
+
+        Args:
+            system_prompt: Agent system prompt
+            messages: Conversation messages from state
+            summary: Optional conversation summary
+
+        Returns:
+            Tuple of (messages to send, budget report)
+        """
+        prefix = [SystemMessage(content=system_prompt)]
+        if summary:
+            prefix.append(SystemMessage(f"Resumen de la conversación:\n{summary}"))
+
+        prefix_tokens = sum(self.count_message_tokens(m) for m in prefix)
+        history = list(messages)
+        history_tokens = [self.count_message_tokens(m) for m in history]
+        tokens_before = prefix_tokens + sum(history_tokens)
+
+        tool_messages_compressed = self._compress_tool_outputs(
+            history, history_tokens, prefix_tokens, _current_turn_start(history)
+        )
+        messages_dropped = self._drop_oldest_turns(
+            history, history_tokens, prefix_tokens
+        )
+
+        tokens_used = prefix_tokens + sum(history_tokens)
+        report = {
+            "model": self.model_name,
+            "budget": self.max_input_tokens,
+            "tokens_before": tokens_before,
+            "tokens_used": tokens_used,
+            "budget_used": round(tokens_used / self.max_input_tokens, 3),
+            "tool_messages_compressed": tool_messages_compressed,
+            "messages_dropped": messages_dropped,
+            "over_budget": tokens_used > self.max_input_tokens,
+        }
+
+        log = logger.warning if report["over_budget"] else logger.info
+        log("context_built", **report)
+        record_context_usage(report)
+
+        return prefix + history, report
+
+    def _compress_tool_outputs(
+        self,
+        history: list[BaseMessage],
+        history_tokens: list[int],
+        prefix_tokens: int,
+        current_start: int,
+    ) -> int:
+        """
+        Truncates tool outputs of earlier turns oldest-first until the
+        budget fits (in place). Messages from current_start on are kept.
+
+        Returns:
+            Number of tool messages compressed
+        """
+        compressed = 0
+        for i, message in enumerate(history[:current_start]):
+            if prefix_tokens + sum(history_tokens) <= self.max_input_tokens:
+                break
+            if not isinstance(message, ToolMessage):
+                continue
+
+            shortened = self._truncate(message.content)
+            if shortened is None:
+                continue
+
+            history[i] = message.model_copy(update={"content": shortened})
+            history_tokens[i] = self.count_message_tokens(history[i])
+            compressed += 1
+        return compressed
+
+    def _truncate(self, content: Any) -> str | None:
+        """Keeps the head of a tool output, or None if already short enough."""
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+        if self._count_text(content) <= self.compressed_tool_tokens:
+            return None
+
+        # Shrink by characters using the observed chars/token ratio
+        ratio = len(content) / self._count_text(content)
+        keep_chars = int(self.compressed_tool_tokens * ratio)
+        return content[:keep_chars].rstrip() + TRUNCATION_MARKER
+
+    def _drop_oldest_turns(
+        self,
+        history: list[BaseMessage],
+        history_tokens: list[int],
+        prefix_tokens: int,
+    ) -> int:
+        """
+        Removes whole turns from the start until the budget fits (in place).
+        Never removes the current turn (from the last HumanMessage on).
+
+        Returns:
+            Number of messages dropped
+        """
+        turn_starts = [
+            i for i, m in enumerate(history) if isinstance(m, HumanMessage)
+        ]
+
+        cut = 0
+        remaining = prefix_tokens + sum(history_tokens)
+        for turn_start in turn_starts:
+            if remaining <= self.max_input_tokens:
+                break
+            remaining -= sum(history_tokens[cut:turn_start])
+            cut = turn_start
+
+        del history[:cut]
+        del history_tokens[:cut]
+        return cut
+
+
+def _current_turn_start(history: list[BaseMessage]) -> int:
+    """Index of the last HumanMessage (0 if there is none: all is current)."""
+    for i in range(len(history) - 1, -1, -1):
+        if isinstance(history[i], HumanMessage):
+            return i
+    return 0
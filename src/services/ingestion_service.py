@@ -5,11 +5,14 @@ Coordinates PDF parsing, chunking, embedding generation, and database ingestion.
 
 import logging
 from pathlib import Path
+from typing import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from supabase import Client
 from langchain_core.embeddings import Embeddings
 from langchain_core.documents import Document
 from src.services.pdf_service import PDFService, PDFParsingError
 from src.services.chunking_service import ChunkingService
+from src.models.embeddings import normalize_embeddings
 
 
 class IngestionError(Exception):
@@ -74,12 +77,185 @@ class IngestionService:
             pdf_path, markdown_path, force_reparse
         )
 
-        # Step 2: Extract and standardize medicine name
+        # Steps 2-3: Medicine name, active ingredients, and chunks
+        medicine_name, active_ingredients, chunks = self._chunk_document(
+            markdown_text, md_filename, pdf_filename
+        )
+
+        # Steps 4-7: Embed, replace old data, and register
+        return self._store_document(
+            chunks, md_filename, pdf_filename, medicine_name, active_ingredients
+        )
+
+    def run_pipelines(
+        self,
+        documents: list[tuple[str, str]],
+        max_workers: int = 1,
+        force_reparse: bool = False,
+    ) -> list[dict]:
+        """
+        Executes the pipeline for several PDFs, chunking them in parallel
+        worker processes. Each document is embedded and stored as soon as
+        its chunks come back, while the rest are still being chunked.
+
+        Args:
+            documents: (pdf_path, markdown_path) pairs
+            max_workers: Chunking processes (1 chunks inline)
+            force_reparse: If True, re-parse PDFs even if markdown exists
+
+        Returns:
+            Statistics per document, in completion order; failed documents
+            have status "failed" and an error message
+        """
+        results = []
+        for pdf_filename, outcome in self.chunk_documents(
+            documents, max_workers, force_reparse
+        ):
+            try:
+                if isinstance(outcome, IngestionError):
+                    raise outcome
+                md_filename, medicine_name, active_ingredients, chunks = outcome
+                results.append(
+                    self._store_document(
+                        chunks,
+                        md_filename,
+                        pdf_filename,
+                        medicine_name,
+                        active_ingredients,
+                    )
+                )
+            except IngestionError as e:
+                logging.error(f"Pipeline failed for {pdf_filename}: {e}")
+                results.append(
+                    {"pdf_file": pdf_filename, "status": "failed", "error": str(e)}
+                )
+        return results
+
+    def chunk_documents(
+        self,
+        documents: list[tuple[str, str]],
+        max_workers: int = 1,
+        force_reparse: bool = False,
+    ) -> Iterator[tuple[str, tuple | IngestionError]]:
+        """
+        Loads (or parses) each document's markdown and chunks it, yielding
+        documents as they finish.
+
+        With max_workers > 1, chunking runs in a process pool whose workers
+        receive a copy of this service's ChunkingService and load its
+        sentence model once at start-up, so CPU-bound parsing and sentence
+        splitting use several cores.
+        Markdown is loaded in this process while workers chunk earlier
+        documents.
+
+        Args:
+            documents: (pdf_path, markdown_path) pairs
+            max_workers: Chunking processes (1 chunks inline)
+            force_reparse: If True, re-parse PDFs even if markdown exists
+
+        Yields:
+            (pdf_filename, outcome) where outcome is (md_filename,
+            medicine_name, active_ingredients, chunks) or the IngestionError
+            raised for that document
+        """
+        if max_workers <= 1:
+            for pdf_path, markdown_path in documents:
+                pdf_filename = Path(pdf_path).name
+                md_filename = Path(markdown_path).name
+                try:
+                    markdown_text = self._parse_or_load_markdown(
+                        pdf_path, markdown_path, force_reparse
+                    )
+                    yield pdf_filename, (
+                        md_filename,
+                        *self._chunk_document(markdown_text, md_filename, pdf_filename),
+                    )
+                except IngestionError as e:
+                    yield pdf_filename, e
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_chunking_worker,
+            initargs=(self.chunking_service,),
+        ) as pool:
+            pending = {}
+            for pdf_path, markdown_path in documents:
+                pdf_filename = Path(pdf_path).name
+                md_filename = Path(markdown_path).name
+                try:
+                    markdown_text = self._parse_or_load_markdown(
+                        pdf_path, markdown_path, force_reparse
+                    )
+                except IngestionError as e:
+                    yield pdf_filename, e
+                    continue
+                future = pool.submit(
+                    _chunk_in_worker, markdown_text, md_filename, pdf_filename
+                )
+                pending[future] = (pdf_filename, md_filename)
+
+                # Hand finished documents on while the next one loads
+                for done in [f for f in pending if f.done()]:
+                    yield _chunking_outcome(done, *pending.pop(done))
+
+            for done in as_completed(list(pending)):
+                yield _chunking_outcome(done, *pending.pop(done))
+
+    def _chunk_document(
+        self, markdown_text: str, md_filename: str, pdf_filename: str
+    ) -> tuple[str, list[str], list[Document]]:
+        """
+        Extracts the medicine name and active ingredients and chunks the
+        markdown.
+
+        Args:
+            markdown_text: Markdown content
+            md_filename: Markdown filename for metadata
+            pdf_filename: PDF filename for the medicine name fallback
+
+        Returns:
+            (medicine_name, active_ingredients, chunks)
+
+        Raises:
+            IngestionError: If no valid chunks are created
+        """
         medicine_name = self._extract_medicine_name(markdown_text, pdf_filename)
 
-        # Step 3: Create chunks
-        chunks = self._create_chunks(markdown_text, md_filename, medicine_name)
+        # Chunks are tagged with the leaflet's active ingredients
+        active_ingredients = self.chunking_service.extract_active_ingredients(
+            markdown_text
+        )
+        chunks = self._create_chunks(
+            markdown_text, md_filename, medicine_name, active_ingredients
+        )
+        return medicine_name, active_ingredients, chunks
+
+    def _store_document(
+        self,
+        chunks: list[Document],
+        md_filename: str,
+        pdf_filename: str,
+        medicine_name: str,
+        active_ingredients: list[str],
+    ) -> dict:
+        """
+        Embeds a document's chunks, replaces its old records, and registers
+        the medicine.
 
+        Args:
+            chunks: Document chunks
+            md_filename: Markdown filename (source in metadata)
+            pdf_filename: PDF filename for messages and statistics
+            medicine_name: Standardized medicine name
+            active_ingredients: Active ingredients extracted from the leaflet
+
+        Returns:
+            Dictionary with pipeline statistics
+
+        Raises:
+            IngestionError: If embedding or database insertion fails
+        """
         # Step 4: Generate embeddings
         embeddings_list = self._generate_embeddings(chunks, md_filename)
 
@@ -89,9 +265,15 @@ class IngestionService:
         # Step 6: Ingest new data
         self._ingest_to_database(chunks, embeddings_list, pdf_filename)
 
+        # Step 7: Register the medicine so running chat workers pick it up
+        self._register_medicine(
+            medicine_name, md_filename, len(chunks), active_ingredients
+        )
+
         stats = {
             "pdf_file": pdf_filename,
             "medicine_name": medicine_name,
+            "active_ingredients": active_ingredients,
             "total_chunks": len(chunks),
             "status": "success",
         }
@@ -155,7 +337,11 @@ class IngestionService:
         return medicine_name
 
     def _create_chunks(
-        self, markdown_text: str, md_filename: str, medicine_name: str
+        self,
+        markdown_text: str,
+        md_filename: str,
+        medicine_name: str,
+        active_ingredients: list[str] | None = None,
     ) -> list[Document]:
         """
         Creates semantic chunks from markdown.
@@ -164,6 +350,8 @@ class IngestionService:
             markdown_text: Markdown content
             md_filename: Markdown filename for metadata
             medicine_name: Standardized medicine name
+            active_ingredients: Active ingredients stored in each chunk's
+                metadata (read back by get_medicine_active_ingredients)
 
         Returns:
             List of document chunks
@@ -178,6 +366,10 @@ class IngestionService:
             blocks=blocks, source_file=md_filename, medicine_name=medicine_name
         )
 
+        if active_ingredients:
+            for chunk in chunks:
+                chunk.metadata["active_ingredients"] = active_ingredients
+
         # Validate chunks
         if not chunks:
             raise IngestionError("No chunks generated from document")
@@ -232,7 +424,8 @@ class IngestionService:
                 raise IngestionError("Generated empty embeddings")
             
             logging.info(f"Generated {len(embeddings_list)} embeddings")
-            return embeddings_list
+            # Unit vectors: inner product == cosine (halfvec_ip_ops index)
+            return normalize_embeddings(embeddings_list)
         except IngestionError:
             raise  # Re-raise validation errors
         except Exception as e:
@@ -243,19 +436,86 @@ class IngestionService:
 
     def _cleanup_old_data(self, md_filename: str) -> None:
         """
-        Removes old records from database for the same source file.
+        Removes old records from database for the same source file, using
+        the indexed source column (falls back to the jsonb path on databases
+        without migration 007).
 
         Args:
             md_filename: Source filename to clean up
         """
         logging.info(f"Cleaning old records for '{md_filename}'...")
         try:
+            # Indexed generated column (migration 007)
             self.supabase.table("documents").delete().eq(
-                "metadata->>source", md_filename
+                "source", md_filename
             ).execute()
             logging.info("Old records cleaned successfully")
         except Exception as e:
-            logging.warning(f"Cleanup warning (non-critical): {e}")
+            logging.warning(
+                f"Indexed cleanup failed ({e}); retrying on metadata->>source"
+            )
+            try:
+                self.supabase.table("documents").delete().eq(
+                    "metadata->>source", md_filename
+                ).execute()
+                logging.info("Old records cleaned successfully")
+            except Exception as e:
+                logging.warning(f"Cleanup warning (non-critical): {e}")
+
+    def _register_medicine(
+        self,
+        medicine_name: str,
+        md_filename: str,
+        chunk_count: int,
+        active_ingredients: list[str],
+    ) -> None:
+        """
+        Upserts the medicine into the medicines table and bumps the
+        catalogue version in one transaction (migration 006). Falls back to
+        bumping the version only on databases without migration 006.
+
+        Args:
+            medicine_name: Standardized medicine name
+            md_filename: Source filename (same as the chunks' metadata)
+            chunk_count: Number of chunks ingested
+            active_ingredients: Active ingredients extracted from the leaflet
+
+        Raises:
+            IngestionError: If registration fails on a migrated database
+        """
+        try:
+            response = self.supabase.rpc(
+                "register_medicine",
+                {
+                    "p_medicine_name": medicine_name,
+                    "p_source": md_filename,
+                    "p_chunk_count": chunk_count,
+                    "p_active_ingredients": active_ingredients,
+                },
+            ).execute()
+            logging.info(
+                f"Registered '{medicine_name}' in catalogue version {response.data}"
+            )
+        except Exception as e:
+            if not _is_missing_function(e):
+                logging.error(f"Medicine registration failed: {e}", exc_info=True)
+                raise IngestionError(
+                    f"Failed to register medicine '{medicine_name}': {e}"
+                ) from e
+            logging.warning(f"register_medicine not available ({e}); bumping version")
+            self._bump_catalogue_version()
+
+    def _bump_catalogue_version(self) -> None:
+        """
+        Bumps the catalogue version marker probed by running chat workers
+        (MedicineCatalogue). Without migration 005 they still pick up the
+        change through the chunk id probe or their TTL.
+        """
+        try:
+            response = self.supabase.rpc("bump_catalogue_version", {}).execute()
+            logging.info(f"Catalogue version bumped to {response.data}")
+        except Exception as e:
+            logging.warning(f"Catalogue version bump skipped (non-critical): {e}")
 
     def _ingest_to_database(
         self,
@@ -296,3 +556,54 @@ class IngestionService:
             raise IngestionError(
                 f"Failed to insert data for {pdf_filename}: {e}"
             ) from e
+
+
+def _is_missing_function(error: Exception) -> bool:
+    """Whether PostgREST rejected an RPC because the function does not exist."""
+    return (
+        getattr(error, "code", None) == "PGRST202"
+        or "Could not find the function" in str(error)
+    )
+
+
+# Chunking-only service built once per worker process by the initializer
+_worker_service: IngestionService | None = None
+
+
+def _init_chunking_worker(chunking_service: ChunkingService) -> None:
+    """
+    Process pool initializer: keeps the parent's ChunkingService (pickled
+    once per worker) and loads its sentence model before the first document
+    arrives.
+    """
+    global _worker_service
+    try:
+        chunking_service.sentence_splitter.split_text("Inicio.")
+    except LookupError as e:
+        logging.warning(f"Sentence model not preloaded: {e}")
+    # Workers only chunk: embedding and storage stay in the parent
+    _worker_service = IngestionService(
+        pdf_service=None,
+        chunking_service=chunking_service,
+        embeddings_model=None,
+        supabase_client=None,
+    )
+
+
+def _chunking_outcome(
+    future: Future, pdf_filename: str, md_filename: str
+) -> tuple[str, tuple | IngestionError]:
+    """Turns a finished chunking future into a chunk_documents() item."""
+    try:
+        return pdf_filename, (md_filename, *future.result())
+    except IngestionError as e:
+        return pdf_filename, e
+    except Exception as e:
+        return pdf_filename, IngestionError(f"Chunking failed for {pdf_filename}: {e}")
+
+
+def _chunk_in_worker(
+    markdown_text: str, md_filename: str, pdf_filename: str
+) -> tuple[str, list[str], list[Document]]:
+    """Chunks one document in a worker process (see _chunk_document)."""
+    return _worker_service._chunk_document(markdown_text, md_filename, pdf_filename)
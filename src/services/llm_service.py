@@ -1,6 +1,7 @@
 """
 LLM service providing centralized async LLM operations.
-Implements timeout, rate limiting, retry, and cost tracking for production use.
+Implements timeout, rate limiting, retry, provider failover, and cost tracking
+for production use.
 """
 
 import time
@@ -15,10 +16,16 @@ from tenacity import (
 )
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
 
+from src.models.fake_llm import FakeChatModel
 from src.utils.logger import get_logger
+from src.utils.metrics import record_llm_call
+from src.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    get_circuit_breaker,
+)
 
 logger = get_logger(__name__)
 
@@ -31,14 +38,22 @@ class LLMError(Exception):
     """Base exception for LLM-related errors."""
 
 
+_exponential_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+
 def create_llm(
     model_name: str, api_key: str, temperature: float = 0
 ) -> BaseChatModel:
     """
     Factory function to create chat model instances.
 
+    Model names starting with "fake" select the local FakeChatModel, which
+    needs no API key and is configured through the FAKE_LLM_* settings.
+    Provider integrations are imported on demand, so only the SDK of the
+    selected provider is loaded.
+
     Args:
-        model_name: Model identifier (e.g., "gpt-4o", "gemini-2.5-flash")
+        model_name: Model identifier (e.g., "gpt-4o", "gemini-2.5-flash", "fake")
         api_key: API key for the provider
         temperature: Sampling temperature (0 for deterministic)
 
@@ -48,25 +63,60 @@ def create_llm(
     Raises:
         ValueError: If model provider is not supported
     """
-    if "gemini" in model_name:
+    if model_name.startswith("fake"):
+        from src import config
+
+        return FakeChatModel(
+            model_name=model_name,
+            latency_distribution=config.FAKE_LLM_LATENCY_DISTRIBUTION,
+            latency_mean=config.FAKE_LLM_LATENCY_MEAN,
+            latency_stddev=config.FAKE_LLM_LATENCY_STDDEV,
+            failure_rate=config.FAKE_LLM_FAILURE_RATE,
+            timeout_rate=config.FAKE_LLM_TIMEOUT_RATE,
+            seed=config.FAKE_LLM_SEED,
+        )
+    elif "gemini" in model_name:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         return ChatGoogleGenerativeAI(
             google_api_key=api_key, model=model_name, temperature=temperature
         )
     elif "gpt" in model_name:
+        from langchain_openai import ChatOpenAI
+
         return ChatOpenAI(
             api_key=api_key, model=model_name, temperature=temperature
         )
     else:
         raise ValueError(
             f"Unsupported model: {model_name}. "
-            "Model name must contain 'gpt' or 'gemini'"
+            "Model name must contain 'gpt' or 'gemini', or start with 'fake'"
         )
 
 
+def get_model_name(model: BaseChatModel) -> str:
+    """
+    Returns a readable identifier for a chat model, unwrapping tool bindings.
+
+    Args:
+        model: Chat model or runnable binding (e.g., result of bind_tools)
+
+    Returns:
+        Model name, or a unique fallback identifier if none is exposed
+    """
+    target = getattr(model, "bound", model)
+    for attr in ("model_name", "model"):
+        name = getattr(target, attr, None)
+        if isinstance(name, str) and name:
+            return name
+    return f"{type(target).__name__}-{id(target)}"
+
+
 class LLMService:
     """
     Centralized async service for all LLM operations with production features.
-    Provides timeout, rate limiting, retry logic, and cost tracking.
+    Provides timeout, rate limiting, retry logic, provider failover through a
+    per-model circuit breaker, and cost tracking.
     """
 
     def __init__(
@@ -75,6 +125,9 @@ class LLMService:
         max_retries: int = 3,
         timeout: int = 30,
         rate_limit: int = 3,
+        fallback_model: BaseChatModel | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        fallback_circuit_breaker: CircuitBreaker | None = None,
     ):
         """
         Initialize async LLM service.
@@ -84,16 +137,33 @@ class LLMService:
             max_retries: Maximum retry attempts for failed calls
             timeout: Timeout in seconds for each LLM call
             rate_limit: Maximum concurrent LLM requests (Semaphore)
+            fallback_model: Model used while the primary model's circuit is open
+            circuit_breaker: Breaker for the primary model (shared per model
+                name by default)
+            fallback_circuit_breaker: Breaker for the fallback model
         """
         self.model = model
         self.max_retries = max_retries
         self.timeout = timeout
         self.semaphore = asyncio.Semaphore(rate_limit)
+        self.model_name = get_model_name(model)
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(
+            self.model_name
+        )
+
+        self.fallback_model = fallback_model
+        self.fallback_circuit_breaker = None
+        if fallback_model is not None:
+            self.fallback_circuit_breaker = (
+                fallback_circuit_breaker
+                or get_circuit_breaker(get_model_name(fallback_model))
+            )
 
     async def invoke_with_retry(
         self,
         messages: list[BaseMessage] | str,
         timeout: int | None = None,
+        node: str = "unknown",
     ) -> BaseMessage:
         """
         Invokes LLM with async retry, timeout, and rate limiting.
@@ -101,6 +171,7 @@ class LLMService:
         Args:
             messages: Input messages or single prompt string
             timeout: Override default timeout (seconds)
+            node: Caller name used to attribute tokens, latency, and cost
 
         Returns:
             LLM response as BaseMessage
@@ -108,32 +179,33 @@ class LLMService:
         Raises:
             LLMTimeoutError: If call exceeds timeout
             LLMError: If call fails after all retries
+            CircuitOpenError: If primary and fallback circuits are both open
         """
         timeout = timeout or self.timeout
         start_time = time.time()
 
         async for attempt in AsyncRetrying(
             stop=stop_after_attempt(self.max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=10),
+            wait=self._wait_before_retry,
             retry=retry_if_exception_type((LLMError, LLMTimeoutError)),
             reraise=True,
         ):
             with attempt:
+                model, breaker = self._select_model()
                 try:
                     logger.info(
                         "llm_call_started",
                         attempt=attempt.retry_state.attempt_number,
                         timeout=timeout,
-                        model=getattr(self.model, "model_name", "unknown"),
+                        model=get_model_name(model),
                     )
 
-                    async with self.semaphore:
-                        response = await asyncio.wait_for(
-                            self.model.ainvoke(messages), timeout=timeout
-                        )
+                    response = await self._call_model(
+                        model, breaker, messages, timeout
+                    )
 
                     elapsed = time.time() - start_time
-                    self._log_usage(response, elapsed)
+                    self._log_usage(response, elapsed, get_model_name(model), node)
                     return response
 
                 except asyncio.TimeoutError as e:
@@ -164,6 +236,7 @@ class LLMService:
         messages: list[BaseMessage] | str,
         output_schema: Type[BaseModel],
         timeout: int | None = None,
+        node: str = "unknown",
     ) -> BaseModel:
         """
         Invokes LLM with structured output (function calling) using async.
@@ -172,6 +245,7 @@ class LLMService:
             messages: Input messages or prompt
             output_schema: Pydantic model defining expected output structure
             timeout: Override default timeout (seconds)
+            node: Caller name used to attribute tokens, latency, and cost
 
         Returns:
             Parsed structured output matching the schema
@@ -179,30 +253,31 @@ class LLMService:
         Raises:
             LLMTimeoutError: If call exceeds timeout
             LLMError: If call fails or schema validation fails after all retries
+            CircuitOpenError: If primary and fallback circuits are both open
         """
         timeout = timeout or self.timeout
         start_time = time.time()
 
         async for attempt in AsyncRetrying(
             stop=stop_after_attempt(self.max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=10),
+            wait=self._wait_before_retry,
             retry=retry_if_exception_type((LLMError, LLMTimeoutError)),
             reraise=True,
         ):
             with attempt:
+                model, breaker = self._select_model()
                 try:
                     logger.info(
                         "llm_structured_call_started",
                         schema=output_schema.__name__,
                         timeout=timeout,
                         attempt=attempt.retry_state.attempt_number,
+                        model=get_model_name(model),
                     )
 
-                    async with self.semaphore:
-                        response = await asyncio.wait_for(
-                            self.model.ainvoke(messages, tools=[output_schema]),
-                            timeout=timeout,
-                        )
+                    response = await self._call_model(
+                        model, breaker, messages, timeout, tools=[output_schema]
+                    )
 
                     elapsed = time.time() - start_time
 
@@ -213,7 +288,7 @@ class LLMService:
                         )
 
                     tool_call = response.tool_calls[0]
-                    self._log_usage(response, elapsed)
+                    self._log_usage(response, elapsed, get_model_name(model), node)
 
                     return tool_call
 
@@ -242,26 +317,128 @@ class LLMService:
                     )
                     raise LLMError(f"Structured output invocation failed: {e}") from e
 
-    def _log_usage(self, response: BaseMessage, elapsed: float) -> None:
+    def _select_model(self) -> tuple[BaseChatModel, CircuitBreaker]:
+        """
+        Picks the model for the next attempt based on circuit state.
+
+        Returns:
+            Tuple of (model, its circuit breaker)
+
+        Raises:
+            CircuitOpenError: If no model is currently accepting calls
+        """
+        if self.circuit_breaker.allow_request():
+            return self.model, self.circuit_breaker
+
+        if (
+            self.fallback_model is not None
+            and self.fallback_circuit_breaker.allow_request()
+        ):
+            logger.warning(
+                "llm_fallback_selected",
+                primary_model=self.model_name,
+                fallback_model=get_model_name(self.fallback_model),
+            )
+            return self.fallback_model, self.fallback_circuit_breaker
+
+        logger.error("llm_circuit_open", model=self.model_name)
+        raise CircuitOpenError(
+            f"Circuit open for {self.model_name} and no fallback available"
+        )
+
+    async def _call_model(
+        self,
+        model: BaseChatModel,
+        breaker: CircuitBreaker,
+        messages: list[BaseMessage] | str,
+        timeout: int,
+        **kwargs,
+    ) -> BaseMessage:
+        """
+        Sends one rate-limited, time-bounded call and reports the outcome
+        to the model's circuit breaker.
+
+        Args:
+            model: Model selected for this attempt
+            breaker: Circuit breaker of the selected model
+            messages: Input messages or prompt
+            timeout: Timeout in seconds
+            **kwargs: Extra arguments for ainvoke (e.g., tools)
+
+        Returns:
+            Raw model response
+        """
+        try:
+            async with self.semaphore:
+                response = await asyncio.wait_for(
+                    model.ainvoke(messages, **kwargs), timeout=timeout
+                )
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        return response
+
+    def _wait_before_retry(self, retry_state) -> float:
+        """
+        Exponential backoff between attempts, skipped when the primary
+        circuit has just opened and the next attempt goes to the fallback.
+
+        Args:
+            retry_state: Tenacity retry state
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        if (
+            self.fallback_model is not None
+            and self.circuit_breaker.state != CircuitState.CLOSED
+        ):
+            return 0.0
+        return _exponential_backoff(retry_state)
+
+    def _log_usage(
+        self, response: BaseMessage, elapsed: float, model_name: str, node: str
+    ) -> None:
         """
-        Logs token usage and cost information.
+        Logs token usage and records it, with latency and cost, in the
+        active metrics.
 
         Args:
             response: LLM response message
             elapsed: Elapsed time in seconds
+            model_name: Model that served the call
+            node: Caller name for attribution
         """
+        input_tokens = output_tokens = cached_tokens = 0
+
         if hasattr(response, "usage_metadata") and response.usage_metadata:
             usage = response.usage_metadata
             input_tokens = usage.get("input_tokens", 0)
             output_tokens = usage.get("output_tokens", 0)
             total_tokens = usage.get("total_tokens", 0)
+            # Prompt prefix served from the provider cache (OpenAI, Gemini)
+            cached_tokens = (usage.get("input_token_details") or {}).get(
+                "cache_read", 0
+            ) or 0
 
             logger.info(
                 "llm_usage",
+                node=node,
+                model=model_name,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
+                cached_tokens=cached_tokens,
                 total_tokens=total_tokens,
                 elapsed=elapsed,
             )
         else:
-            logger.info("llm_call_completed", elapsed=elapsed)
+            logger.info("llm_call_completed", node=node, elapsed=elapsed)
+
+        record_llm_call(
+            node, model_name, input_tokens, output_tokens, elapsed, cached_tokens
+        )
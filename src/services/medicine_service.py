@@ -3,16 +3,22 @@ Medicine service handling intent classification and medicine validation.
 Coordinates router logic and validates medicines against known database.
 """
 
-import re
+from langchain_core.messages import HumanMessage, SystemMessage
 from src.models.domain import AgentState
 from src.models.schemas import UserIntent
 from src.services.llm_service import LLMService
+from src.utils.medicine_index import MedicineIndex
 from src.utils.prompts import load_prompts
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 PROMPTS = load_prompts()
 
+# Built once so the cacheable prefix is identical across calls
+ROUTER_SYSTEM_MESSAGE = SystemMessage(
+    content=PROMPTS["intent_classification"]["system_prompt"]
+)
+
 
 class MedicineService:
     """
@@ -20,16 +26,61 @@ class MedicineService:
     and medicine name validation.
     """
 
-    def __init__(self, llm_service: LLMService, known_medicines: list[str]):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        known_medicines: list[str],
+        active_ingredients: dict[str, list[str]] | None = None,
+    ):
         """
         Initialize medicine service.
 
         Args:
             llm_service: LLM service for intent classification
             known_medicines: List of medicine names available in database
+            active_ingredients: Active ingredients per medicine name, so
+                users can ask by ingredient (e.g., "metamizol" -> nolotil)
         """
         self.llm_service = llm_service
-        self.known_medicines = [med.lower() for med in known_medicines]
+        self.update_catalogue(known_medicines, active_ingredients)
+
+    @property
+    def known_medicines(self) -> list[str]:
+        """Medicine names available in database (lowercase)."""
+        return self._catalogue[0]
+
+    @known_medicines.setter
+    def known_medicines(self, medicines: list[str]) -> None:
+        """Replaces the medicine names, keeping the active ingredients."""
+        self.update_catalogue(medicines, self.active_ingredients)
+
+    @property
+    def active_ingredients(self) -> dict[str, list[str]]:
+        """Active ingredients per medicine name."""
+        return self._catalogue[1]
+
+    def update_catalogue(
+        self,
+        medicines: list[str],
+        active_ingredients: dict[str, list[str]] | None = None,
+    ) -> None:
+        """
+        Rebuilds the resolution index and swaps it in with the new catalogue
+        in a single assignment, so concurrent turns see either the old or
+        the new catalogue, never a mix. Safe to call from a worker thread
+        (see MedicineCatalogue.subscribe).
+
+        Args:
+            medicines: Medicine names available in database
+            active_ingredients: Active ingredients per medicine name
+        """
+        medicines = [med.lower() for med in medicines]
+        active_ingredients = active_ingredients or {}
+        index = MedicineIndex(medicines, active_ingredients)
+        self._catalogue = (medicines, active_ingredients, index)
+        logger.info(
+            "medicine_index_built", medicines=len(medicines), terms=len(index)
+        )
 
     async def classify_intent_and_validate(self, state: AgentState) -> dict:
         """
@@ -39,7 +90,8 @@ class MedicineService:
             state: Current agent state
 
         Returns:
-            Dictionary with updated intent and current_medicines
+            Dictionary with updated intent, current_medicines, and the
+            medicines resolved this turn (used to filter retrieval)
 
         Raises:
             Exception: LLM errors are propagated (fail-fast)
@@ -48,11 +100,14 @@ class MedicineService:
         last_message = state["messages"][-1].content
 
         prompt_template = PROMPTS["intent_classification"]["prompt_template"]
-        prompt = prompt_template.format(user_message=last_message)
+        prompt = [
+            ROUTER_SYSTEM_MESSAGE,
+            HumanMessage(content=prompt_template.format(user_message=last_message)),
+        ]
 
         try:
             tool_call = await self.llm_service.invoke_with_structured_output(
-                prompt, UserIntent
+                prompt, UserIntent, node="router"
             )
 
             intent = tool_call["args"]["intent"]
@@ -65,13 +120,19 @@ class MedicineService:
             )
 
             current_medicines = state.get("current_medicines", [])
+            resolved_medicines = []
 
             if medicine and intent == "pregunta_medicamento":
+                resolved_medicines = self._resolve_medicines(medicine)
                 intent = self._validate_and_update_medicines(
-                    medicine, current_medicines
+                    medicine, current_medicines, resolved_medicines
                 )
 
-            return {"intent": intent, "current_medicines": current_medicines}
+            return {
+                "intent": intent,
+                "current_medicines": current_medicines,
+                "resolved_medicines": resolved_medicines,
+            }
 
         except Exception as e:
             logger.error(
@@ -80,10 +141,13 @@ class MedicineService:
                 error=str(e),
                 default_intent="pregunta_general",
             )
-            return {"intent": "pregunta_general"}
+            return {"intent": "pregunta_general", "resolved_medicines": []}
 
     def _validate_and_update_medicines(
-        self, medicine: str, current_medicines: list[str]
+        self,
+        medicine: str,
+        current_medicines: list[str],
+        resolved_medicines: list[str] | None = None,
     ) -> str:
         """
         Validates medicine against known list and updates current medicines.
@@ -91,41 +155,44 @@ class MedicineService:
         Args:
             medicine: Extracted medicine name
             current_medicines: List of currently tracked medicines
+            resolved_medicines: Canonical names already resolved for medicine
+                (resolved here if omitted)
 
         Returns:
             Intent string ("pregunta_medicamento" or "pregunta_no_autorizada")
         """
-        medicine_lower = medicine.lower()
-
-        matched_medicine = self._find_matching_medicine(medicine_lower)
+        if resolved_medicines is None:
+            resolved_medicines = self._resolve_medicines(medicine)
 
-        if matched_medicine:
-            logger.info("medicine_validated", medicine=matched_medicine)
-            if matched_medicine not in current_medicines:
-                current_medicines.append(matched_medicine)
+        if resolved_medicines:
+            logger.info(
+                "medicine_validated", medicine=medicine, resolved=resolved_medicines
+            )
+            for matched_medicine in resolved_medicines:
+                if matched_medicine not in current_medicines:
+                    current_medicines.append(matched_medicine)
             return "pregunta_medicamento"
         else:
             logger.warning(
                 "medicine_not_in_database",
-                medicine=medicine_lower,
+                medicine=medicine.lower(),
                 action="routing_to_unauthorized",
             )
             return "pregunta_no_autorizada"
 
-    def _find_matching_medicine(self, medicine: str) -> str | None:
+    def _resolve_medicines(self, medicine: str) -> list[str]:
         """
-        Finds matching medicine using word boundary regex to avoid partial matches.
+        Resolves a medicine mention to canonical names: whole-word product
+        or active ingredient matches first, then close misspellings. The
+        index keeps the cost flat as the catalogue grows.
 
         Args:
-            medicine: Medicine name to match
+            medicine: Medicine name as extracted by the router
 
         Returns:
-            Matched medicine name or None if not found
+            Canonical medicine names (empty if not in database)
         """
-        for known_med in self.known_medicines:
-            if re.search(r"\b" + re.escape(known_med) + r"\b", medicine):
-                return known_med
-        return None
+        return self._catalogue[2].resolve(medicine)
 
     def get_unauthorized_medicine_message(self) -> str:
         """
@@ -5,6 +5,7 @@ Implements strategic context management for long conversations.
 
 from langchain_core.messages import (
     AIMessage,
+    BaseMessage,
     ToolMessage,
     SystemMessage,
     HumanMessage,
@@ -12,6 +13,7 @@ from langchain_core.messages import (
 )
 from src.models.domain import AgentState
 from src.services.llm_service import LLMService
+from src.utils.tokenizer import count_message_tokens, get_token_counter
 from src.utils.prompts import load_prompts
 from src.utils.logger import get_logger
 
@@ -19,39 +21,88 @@ logger = get_logger(__name__)
 PROMPTS = load_prompts()
 
 
+def _is_dialogue(message: BaseMessage) -> bool:
+    """True for user questions and final answers (not tool traffic)."""
+    if isinstance(message, ToolMessage):
+        return False
+    if isinstance(message, AIMessage) and message.tool_calls:
+        return False
+    return True
+
+
 class MemoryService:
     """
     Service for conversation memory management including summarization
     and message pruning.
     """
 
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        model_name: str = "gpt-4o",
+        keep_recent_tokens: int = 1000,
+        max_summary_tokens: int = 400,
+        retain_tool_results: bool = False,
+        max_retained_chunks: int = 50,
+        max_embedded_chunks: int = 10,
+    ):
         """
         Initialize memory service.
 
         Args:
             llm_service: LLM service for generating summaries
+            model_name: Model whose tokenizer is used for counting
+            keep_recent_tokens: Tokens of the newest turns kept verbatim
+                when summarizing
+            max_summary_tokens: Maximum length of the rolling summary
+            retain_tool_results: If True, pruned tool results are kept in
+                state as compact chunk records (see retrieved_chunks)
+            max_retained_chunks: Maximum chunk records kept per thread
+            max_embedded_chunks: Newest chunk records that keep their
+                embedding for re-ranking follow-ups
         """
         self.llm_service = llm_service
+        self.keep_recent_tokens = keep_recent_tokens
+        self.max_summary_tokens = max_summary_tokens
+        self.retain_tool_results = retain_tool_results
+        self.max_retained_chunks = max_retained_chunks
+        self.max_embedded_chunks = max_embedded_chunks
+        self._count_text = get_token_counter(model_name)
 
     async def summarize_conversation(self, state: AgentState) -> dict:
         """
-        Creates or updates conversation summary and resets message window (async).
+        Folds the oldest messages into the rolling summary (async).
+
+        The newest turns that fit in keep_recent_tokens (at least the last
+        one) stay verbatim; only earlier messages are summarized and removed.
+        Tool calls and tool outputs are left out of the summary prompt.
 
         Args:
             state: Current agent state
 
         Returns:
-            Dictionary with updated summary, cleared messages, and reset turn count
+            Dictionary with updated summary, removed messages, reset turn
+            count, and remaining window tokens; empty if nothing is old
+            enough to summarize
         """
-        logger.info("summarization_started", action="resetting_message_window")
+        messages = state["messages"]
+        message_tokens = [count_message_tokens(m, self._count_text) for m in messages]
+        cut = self._split_point(messages, message_tokens)
+        if cut == 0:
+            logger.info("summarization_skipped", reason="no_completed_turns_to_fold")
+            return {}
 
-        conversation_messages = state["messages"]
-        current_summary = state.get("summary", "No hay resumen previo.")
+        logger.info(
+            "summarization_started",
+            messages_summarized=cut,
+            messages_kept=len(messages) - cut,
+        )
 
+        current_summary = state.get("summary") or "No hay resumen previo."
         messages_text = "\n".join(
             f"- {type(msg).__name__}: {msg.content}"
-            for msg in conversation_messages
+            for msg in messages[:cut]
+            if _is_dialogue(msg)
         )
 
         prompt_template = PROMPTS["summarization"]["prompt_template"]
@@ -61,33 +112,90 @@ class MemoryService:
             SystemMessage(content=system_message_text),
             HumanMessage(
                 content=prompt_template.format(
-                    current_summary=current_summary, new_messages=messages_text
+                    current_summary=current_summary,
+                    new_messages=messages_text,
+                    max_words=self.max_summary_tokens * 3 // 4,
                 )
             ),
         ]
 
-        response = await self.llm_service.invoke_with_retry(summary_prompt)
-        new_summary = response.content
+        response = await self.llm_service.invoke_with_retry(
+            summary_prompt, node="summarizer"
+        )
+        new_summary = self._cap_summary(response.content)
 
-        messages_to_remove = [
-            RemoveMessage(id=msg.id) for msg in state["messages"]
-        ]
+        messages_to_remove = [RemoveMessage(id=msg.id) for msg in messages[:cut]]
 
         logger.info(
             "summarization_completed",
             messages_removed=len(messages_to_remove),
+            summary_tokens=self._count_text(new_summary),
         )
 
         return {
             "summary": new_summary,
             "messages": messages_to_remove,
             "turn_count": 0,
+            "window_tokens": sum(message_tokens[cut:]),
         }
 
+    def count_window_tokens(self, messages: list[BaseMessage]) -> int:
+        """
+        Counts tokens of the message window.
+
+        Args:
+            messages: Conversation messages from state
+
+        Returns:
+            Approximate token count of all messages
+        """
+        return sum(count_message_tokens(m, self._count_text) for m in messages)
+
+    def _split_point(
+        self, messages: list[BaseMessage], message_tokens: list[int]
+    ) -> int:
+        """
+        Finds where the verbatim tail starts, always at a HumanMessage.
+
+        Returns:
+            Index of the first kept message (0 if nothing to summarize)
+        """
+        turn_starts = [
+            i for i, m in enumerate(messages) if isinstance(m, HumanMessage)
+        ]
+        if not turn_starts:
+            return 0
+
+        cut = turn_starts[-1]
+        kept = sum(message_tokens[cut:])
+        for turn_start in reversed(turn_starts[:-1]):
+            turn_tokens = sum(message_tokens[turn_start:cut])
+            if kept + turn_tokens > self.keep_recent_tokens:
+                break
+            kept += turn_tokens
+            cut = turn_start
+        return cut
+
+    def _cap_summary(self, summary: str) -> str:
+        """Truncates a summary that exceeds max_summary_tokens."""
+        tokens = self._count_text(summary)
+        if tokens <= self.max_summary_tokens:
+            return summary
+
+        keep_chars = int(self.max_summary_tokens * len(summary) / tokens)
+        logger.warning(
+            "summary_truncated",
+            summary_tokens=tokens,
+            max_summary_tokens=self.max_summary_tokens,
+        )
+        return summary[:keep_chars].rstrip()
+
     def prune_tool_messages(self, state: AgentState) -> dict:
         """
         Removes intermediate tool-related messages after agent final response.
-        Cleans AIMessage with tool_calls and corresponding ToolMessage.
+        Cleans AIMessage with tool_calls and corresponding ToolMessage. With
+        retain_tool_results, the chunk records carried as tool artifacts are
+        kept in retrieved_chunks.
 
         Args:
             state: Current agent state
@@ -120,7 +228,42 @@ class MemoryService:
         ]
 
         logger.info("pruning_completed", messages_pruned=len(messages_to_remove))
-        return {"messages": messages_to_remove}
+        update = {"messages": messages_to_remove}
+
+        if self.retain_tool_results:
+            records = [
+                record
+                for i in indices_to_remove
+                if isinstance(messages[i], ToolMessage)
+                and isinstance(messages[i].artifact, list)
+                for record in messages[i].artifact
+            ]
+            if records:
+                update["retrieved_chunks"] = self._merge_retained(
+                    state.get("retrieved_chunks", []), records
+                )
+        return update
+
+    def _merge_retained(self, retained: list[dict], records: list[dict]) -> list[dict]:
+        """
+        Adds chunk records to the retained ones, newest last, without
+        duplicate ids, keeping at most max_retained_chunks.
+        """
+        by_id = {record["id"]: record for record in retained}
+        for record in records:
+            by_id.pop(record["id"], None)
+            by_id[record["id"]] = record
+        merged = list(by_id.values())[-self.max_retained_chunks :]
+
+        # Only the newest chunks keep their embeddings in the checkpoint
+        cutoff = len(merged) - self.max_embedded_chunks
+        for i, record in enumerate(merged[: max(cutoff, 0)]):
+            if "embedding" in record:
+                merged[i] = {k: v for k, v in record.items() if k != "embedding"}
+        logger.info(
+            "tool_results_retained", added=len(records), retained=len(merged)
+        )
+        return merged
 
     @staticmethod
     def increment_turn_count(state: AgentState) -> dict:
@@ -3,6 +3,7 @@ PDF service for converting medicine leaflets to structured Markdown.
 Uses multimodal LLM to parse PDF images and extract hierarchical structure.
 """
 
+import time
 import logging
 import base64
 import yaml
@@ -10,7 +11,9 @@ from pathlib import Path
 import fitz  # PyMuPDF
 from pydantic import BaseModel, Field
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+from src.utils.executors import PDF, get_executor
+from src.utils.metrics import record_llm_call
 
 
 def load_prompts() -> dict:
@@ -23,6 +26,18 @@ def load_prompts() -> dict:
 PROMPTS = load_prompts()
 
 
+def _render_pages(pdf_path: str) -> list[str]:
+    """Renders each page of a PDF to a base64-encoded PNG."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [
+            base64.b64encode(page.get_pixmap().tobytes("png")).decode("utf-8")
+            for page in doc
+        ]
+    finally:
+        doc.close()
+
+
 class ProspectusMarkdown(BaseModel):
     """
     Structured output schema for PDF parsing.
@@ -55,9 +70,13 @@ class PDFService:
             model_name: Multimodal model name (e.g., "gemini-1.5-flash")
             api_key: API key for the LLM provider
         """
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         self.model_name = model_name
         self.llm = ChatGoogleGenerativeAI(model=model_name, temperature=0)
-        self.structured_llm = self.llm.with_structured_output(ProspectusMarkdown)
+        self.structured_llm = self.llm.with_structured_output(
+            ProspectusMarkdown, include_raw=True
+        )
         logging.info(f"PDF service initialized with model: {model_name}")
 
     def pdf_to_base64_images(self, pdf_path: str) -> list[str]:
@@ -75,16 +94,9 @@ class PDFService:
         """
         logging.info(f"Converting PDF to images: {pdf_path}")
         try:
-            doc = fitz.open(pdf_path)
-            base64_images = []
-
-            for page in doc:
-                pix = page.get_pixmap()
-                img_bytes = pix.tobytes("png")
-                base64_image = base64.b64encode(img_bytes).decode("utf-8")
-                base64_images.append(base64_image)
-
-            doc.close()
+            # Rendering is memory-heavy: the PDF pool bounds how many
+            # leaflets are rasterized at once across ingestion threads
+            base64_images = get_executor(PDF).call(_render_pages, pdf_path)
             logging.info(f"Converted {len(base64_images)} pages to images")
             return base64_images
 
@@ -126,8 +138,15 @@ class PDFService:
         )
         try:
             prompt = [system_message, human_message]
+            start_time = time.time()
             response = self.structured_llm.invoke(prompt)
-            markdown_content = response.markdown_content
+            self._record_usage(response["raw"], time.time() - start_time)
+
+            if response["parsed"] is None:
+                raise PDFParsingError(
+                    f"Structured output parsing failed: {response['parsing_error']}"
+                )
+            markdown_content = response["parsed"].markdown_content
 
             logging.info("LLM returned structured markdown successfully")
 
@@ -140,3 +159,28 @@ class PDFService:
         except Exception as e:
             logging.error(f"LLM parsing failed: {e}", exc_info=True)
             raise PDFParsingError(f"LLM parsing failed: {e}") from e
+
+    def _record_usage(self, raw_response, elapsed: float) -> None:
+        """
+        Records token usage of the parsing call in the active metrics.
+
+        Args:
+            raw_response: Raw AIMessage returned alongside the parsed output
+            elapsed: Call latency in seconds
+        """
+        usage = getattr(raw_response, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        logging.info(
+            f"PDF parsing used {input_tokens} input / {output_tokens} output "
+            f"tokens in {elapsed:.1f}s"
+        )
+        record_llm_call(
+            "pdf_parser",
+            self.model_name,
+            input_tokens,
+            output_tokens,
+            elapsed,
+            cached_tokens or 0,
+        )
@@ -3,39 +3,93 @@ Retrieval service handling RAG operations including search and query rewriting.
 Coordinates between embeddings, database, and LLM for optimal retrieval.
 """
 
+import re
+import unicodedata
+
+import numpy as np
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_core.retrievers import BaseRetriever
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from src.database.chunk_store import ChunkStore
 from src.services.llm_service import LLMService
+from src.utils.executors import EMBEDDINGS, get_executor
 from src.utils.prompts import load_prompts
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 PROMPTS = load_prompts()
 
+# Built once so the cacheable prefix is identical across calls
+REWRITER_SYSTEM_MESSAGE = SystemMessage(
+    content=PROMPTS["query_rewriter"]["system_prompt"]
+)
+
+# Words shorter than this (articles, prepositions, section numbers) are
+# ignored when matching queries to section paths
+MIN_KEYWORD_LENGTH = 4
+
+
+def _keywords(text: str) -> set[str]:
+    """Lowercase, accent-free words of a text, without short words."""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    ascii_text = "".join(c for c in normalized if not unicodedata.combining(c))
+    return {
+        word
+        for word in re.findall(r"[a-z]+", ascii_text)
+        if len(word) >= MIN_KEYWORD_LENGTH
+    }
+
 
 class RetrievalService:
     """
     Service for RAG operations including document retrieval and query rewriting.
     """
 
-    def __init__(self, retriever: BaseRetriever, llm_service: LLMService):
+    def __init__(
+        self,
+        retriever: BaseRetriever,
+        llm_service: LLMService,
+        chunk_store: ChunkStore | None = None,
+        section_min_overlap: float = 0.5,
+        max_retained_docs: int = 5,
+        embeddings: Embeddings | None = None,
+        cache_min_similarity: float = 0.8,
+    ):
         """
         Initialize retrieval service.
 
         Args:
             retriever: Configured retriever instance (e.g., SupabaseRetriever)
             llm_service: LLM service for query rewriting
+            chunk_store: Store of retrieved chunks for follow-up turns
+                (None disables re-materialization)
+            section_min_overlap: Fraction of a section path's keywords a
+                query must contain to resolve to that section
+            max_retained_docs: Maximum documents re-materialized per query
+            embeddings: Query embeddings model for re-ranking retained chunks
+                (None disables semantic re-ranking)
+            cache_min_similarity: Cosine similarity the best retained chunk
+                must reach to skip the global search
         """
         self.retriever = retriever
         self.llm_service = llm_service
+        self.chunk_store = chunk_store
+        self.section_min_overlap = section_min_overlap
+        self.max_retained_docs = max_retained_docs
+        self.embeddings = embeddings
+        self.cache_min_similarity = cache_min_similarity
 
-    async def search_medicine_info(self, query: str) -> list[Document]:
+    async def search_medicine_info(
+        self, query: str, medicines: list[str] | None = None
+    ) -> list[Document]:
         """
         Searches database for medicine information (async).
 
         Args:
             query: Search query
+            medicines: Canonical medicine names to restrict the search to
+                (None or empty searches all leaflets)
 
         Returns:
             List of relevant documents (empty if nothing found)
@@ -43,14 +97,177 @@ class RetrievalService:
         Raises:
             Exception: Database errors are propagated (fail-fast)
         """
-        logger.info("search_started", query=query)
-        docs = await self.retriever.ainvoke(query)
+        logger.info("search_started", query=query, medicines=medicines)
+        if medicines:
+            docs = await self.retriever.ainvoke(query, filter_medicines=medicines)
+        else:
+            docs = await self.retriever.ainvoke(query)
 
         if not docs:
             logger.warning("search_completed", query=query, docs_found=0)
             return []
 
         logger.info("search_completed", query=query, docs_found=len(docs))
+        if self.chunk_store is not None:
+            self.chunk_store.put_many(docs)
+        return docs
+
+    def resolve_retained(
+        self,
+        query: str,
+        retained: list[dict],
+        medicines: list[str] | None = None,
+    ) -> list[Document] | None:
+        """
+        Re-materializes previously retrieved chunks when a query resolves to
+        a section already retrieved in this conversation.
+
+        A retained section matches if the query names its medicine and
+        contains at least section_min_overlap of its path keywords.
+
+        Args:
+            query: Search query (after rewriting)
+            retained: Chunk records kept in state (see chunk_records)
+            medicines: Canonical medicine names the turn is about (None or
+                empty considers every retained chunk)
+
+        Returns:
+            Documents of the matching sections by similarity, or None if no
+            section matches or its chunks are no longer stored
+        """
+        retained = _retained_for(retained, medicines)
+        if self.chunk_store is None or not retained:
+            return None
+
+        query_keywords = _keywords(query)
+        matches = []
+        for record in retained:
+            medicine_keywords = _keywords(record["medicine_name"])
+            if not medicine_keywords & query_keywords:
+                continue
+            section_keywords = _keywords(record["path"]) - medicine_keywords
+            if not section_keywords:
+                continue
+            overlap = len(section_keywords & query_keywords) / len(section_keywords)
+            if overlap >= self.section_min_overlap:
+                matches.append(record)
+
+        if not matches:
+            return None
+
+        matches.sort(key=lambda r: r["similarity"], reverse=True)
+        ids = [r["id"] for r in matches[: self.max_retained_docs]]
+        docs = self.chunk_store.get_many(ids)
+        if docs is None:
+            logger.info("retained_chunks_evicted", query=query, chunks=len(ids))
+            return None
+
+        logger.info(
+            "retained_chunks_resolved",
+            query=query,
+            docs_found=len(docs),
+            paths=sorted({r["path"] for r in matches}),
+        )
+        return docs
+
+    async def search_retained(
+        self,
+        query: str,
+        retained: list[dict],
+        medicines: list[str] | None = None,
+    ) -> list[Document] | None:
+        """
+        Looks for the answer to a query among chunks retrieved earlier in
+        the conversation: first by section (no embedding), then by cosine
+        similarity against the retained chunk embeddings. Only chunks of
+        the given medicines are considered, so a follow-up about another
+        medicine is never answered from this one's chunks.
+
+        Args:
+            query: Search query (after rewriting)
+            retained: Chunk records kept in state (see chunk_records)
+            medicines: Canonical medicine names the turn is about (None or
+                empty considers every retained chunk)
+
+        Returns:
+            Retained documents answering the query, or None to fall through
+            to the global search
+        """
+        retained = _retained_for(retained, medicines)
+        if not retained:
+            logger.info("retained_chunks_not_for_medicines", medicines=medicines)
+            return None
+
+        docs = self.resolve_retained(query, retained)
+        if docs is None:
+            docs = await self.rerank_retained(query, retained)
+        return docs
+
+    async def rerank_retained(
+        self,
+        query: str,
+        retained: list[dict],
+        medicines: list[str] | None = None,
+    ) -> list[Document] | None:
+        """
+        Re-ranks retained chunks by cosine similarity to the query.
+
+        The query embedding goes through the cached embeddings model, so a
+        fall-through to the global search does not embed the query again.
+
+        Args:
+            query: Search query (after rewriting)
+            retained: Chunk records kept in state (see chunk_records)
+            medicines: Canonical medicine names the turn is about (None or
+                empty considers every retained chunk)
+
+        Returns:
+            Retained documents with similarity >= cache_min_similarity, best
+            first, or None if the best one is below the threshold
+        """
+        if self.chunk_store is None or self.embeddings is None:
+            return None
+        candidates = [
+            r for r in _retained_for(retained, medicines) if r.get("embedding")
+        ]
+        if not candidates:
+            return None
+
+        query_vector = np.asarray(
+            await get_executor(EMBEDDINGS).run(self.embeddings.embed_query, query),
+            dtype=np.float32,
+        )
+        matrix = np.asarray([r["embedding"] for r in candidates], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vector)
+        similarities = matrix @ query_vector / np.maximum(norms, 1e-12)
+
+        order = np.argsort(-similarities)[: self.max_retained_docs]
+        best = float(similarities[order[0]])
+        if best < self.cache_min_similarity:
+            logger.info(
+                "retained_chunks_below_threshold",
+                query=query,
+                best_similarity=round(best, 3),
+                threshold=self.cache_min_similarity,
+            )
+            return None
+
+        ids = [
+            candidates[i]["id"]
+            for i in order
+            if similarities[i] >= self.cache_min_similarity
+        ]
+        docs = self.chunk_store.get_many(ids)
+        if docs is None:
+            logger.info("retained_chunks_evicted", query=query, chunks=len(ids))
+            return None
+
+        logger.info(
+            "retained_chunks_reranked",
+            query=query,
+            docs_found=len(docs),
+            best_similarity=round(best, 3),
+        )
         return docs
 
     async def rewrite_query_with_context(
@@ -89,17 +306,18 @@ class RetrievalService:
         )
 
         prompt_template = PROMPTS["query_rewriter"]["prompt_template"]
-        system_prompt = PROMPTS["query_rewriter"]["system_prompt"]
+        rewrite_prompt = [
+            REWRITER_SYSTEM_MESSAGE,
+            HumanMessage(
+                content=prompt_template.format(
+                    conversation_history=history_text, query=original_query
+                )
+            ),
+        ]
 
-        full_prompt = (
-            system_prompt
-            + "\n\n"
-            + prompt_template.format(
-                conversation_history=history_text, query=original_query
-            )
+        response = await self.llm_service.invoke_with_retry(
+            rewrite_prompt, node="query_rewriter"
         )
-
-        response = await self.llm_service.invoke_with_retry(full_prompt)
         rewritten_query = response.content.strip()
 
         logger.info(
@@ -110,6 +328,43 @@ class RetrievalService:
         return rewritten_query
 
 
+def _retained_for(retained: list[dict], medicines: list[str] | None) -> list[dict]:
+    """Retained records of the given medicines (all of them if none given)."""
+    if not medicines:
+        return retained
+    names = {medicine.lower() for medicine in medicines}
+    return [r for r in retained if r.get("medicine_name", "").lower() in names]
+
+
+def chunk_records(docs: list[Document], query: str) -> list[dict]:
+    """
+    Builds the compact records kept in state for retrieved documents.
+
+    Args:
+        docs: Retrieved documents (with ids)
+        query: Query that retrieved them
+
+    Returns:
+        One record per document with id, medicine, path, similarity, and
+        the chunk embedding when the retriever returned it
+    """
+    records = []
+    for doc in docs:
+        if doc.id is None:
+            continue
+        record = {
+            "id": doc.id,
+            "medicine_name": doc.metadata.get("medicine_name", ""),
+            "path": doc.metadata.get("path", ""),
+            "similarity": doc.metadata.get("similarity", 0.0),
+            "query": query,
+        }
+        if doc.metadata.get("embedding") is not None:
+            record["embedding"] = doc.metadata["embedding"]
+        records.append(record)
+    return records
+
+
 def format_docs_with_sources(docs: list[Document]) -> str:
     """
     Formats retrieved documents with source identifiers.
@@ -0,0 +1,182 @@
+"""
+Circuit breaker for protecting calls to degraded LLM providers.
+Opens after consecutive failures, then probes recovery in half-open state.
+"""
+
+import time
+import threading
+from enum import Enum
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Possible states of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker.
+
+    CLOSED: calls flow normally; consecutive failures are counted.
+    OPEN: calls are rejected until recovery_timeout has elapsed.
+    HALF_OPEN: a limited number of probe calls are allowed; enough successes
+    close the circuit, any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_successes: int = 2,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Identifier used in logs (typically the model name)
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds to stay open before probing recovery
+            half_open_successes: Successful probes required to close again
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_successes = half_open_successes
+
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._probe_successes = 0
+        self._probes_in_flight = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving OPEN to HALF_OPEN once the timeout elapsed."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether a call may be sent to the protected model.
+
+        Returns:
+            True if the call is allowed, False if it should be short-circuited
+        """
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN:
+                return False
+
+            # HALF_OPEN: only let through as many probes as needed to close
+            if self._probes_in_flight + self._probe_successes >= self.half_open_successes:
+                return False
+            self._probes_in_flight += 1
+            return True
+
+    def record_success(self) -> None:
+        """Records a successful call."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_successes:
+                    self._transition(CircuitState.CLOSED)
+            else:
+                self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Records a failed or timed-out call."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._transition(CircuitState.OPEN)
+                return
+
+            self._consecutive_failures += 1
+            if (
+                self._state == CircuitState.CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Frees a half-open probe slot without recording an outcome."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _maybe_half_open(self) -> None:
+        """Moves OPEN to HALF_OPEN after the recovery timeout (lock held)."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+
+    def _transition(self, new_state: CircuitState) -> None:
+        """Changes state and resets counters (lock held)."""
+        previous_state = self._state
+        self._state = new_state
+        self._consecutive_failures = 0
+        self._probe_successes = 0
+        self._probes_in_flight = 0
+        if new_state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+
+        logger.warning(
+            "circuit_breaker_state_changed",
+            circuit=self.name,
+            previous_state=previous_state.value,
+            new_state=new_state.value,
+        )
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    name: str,
+    failure_threshold: int = 5,
+    recovery_timeout: float = 30.0,
+    half_open_successes: int = 2,
+) -> CircuitBreaker:
+    """
+    Returns the shared circuit breaker for a model, creating it on first use.
+    Services wrapping the same model share its breaker, so one provider
+    incident is detected once rather than per service.
+
+    Args:
+        name: Model identifier
+        failure_threshold: Consecutive failures before the circuit opens
+        recovery_timeout: Seconds to stay open before probing recovery
+        half_open_successes: Successful probes required to close again
+
+    Returns:
+        CircuitBreaker instance for the model
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=failure_threshold,
+                recovery_timeout=recovery_timeout,
+                half_open_successes=half_open_successes,
+            )
+        return _breakers[name]
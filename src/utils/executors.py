@@ -0,0 +1,266 @@
+"""
+Named, bounded thread pools for blocking calls.
+Embeddings, database, and PDF rendering each get their own pool so slow work
+on one dependency cannot queue up calls to another behind it in the event
+loop's shared default executor.
+"""
+
+import time
+import asyncio
+import threading
+import contextvars
+from typing import Any, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EMBEDDINGS = "embeddings"
+DATABASE = "database"
+PDF = "pdf"
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a fixed worker count and queue metrics.
+
+    Tracks how many calls are waiting for a thread (queue depth) and how
+    long they waited, so a saturated pool shows up in the logs instead of
+    as unexplained latency. Calls run in a copy of the caller's context, so
+    the active MetricsTracker keeps recording from worker threads.
+    """
+
+    def __init__(self, name: str, max_workers: int, slow_wait: float = 1.0):
+        """
+        Initialize executor.
+
+        Args:
+            name: Pool name used in thread names, logs, and stats
+            max_workers: Maximum concurrent calls
+            slow_wait: Queue wait in seconds above which a warning is logged
+                (0 disables)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.slow_wait = slow_wait
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-executor"
+        )
+        self._lock = threading.Lock()
+
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Schedules a call on the pool.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future with the call's result
+        """
+        context = contextvars.copy_context()
+        submitted_at = time.perf_counter()
+
+        def task():
+            self._started(time.perf_counter() - submitted_at)
+            failed = True
+            try:
+                result = context.run(fn, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self._finished(failed)
+
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        try:
+            future = self._executor.submit(task)
+        except RuntimeError:
+            # Pool already shut down: undo the bookkeeping
+            with self._lock:
+                self._queued -= 1
+                self._submitted -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Awaitable drop-in for asyncio.to_thread() on this pool.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's return value
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs a call on the pool and blocks until it finishes. Bounds how
+        many such calls run at once across threads of synchronous code.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's return value
+        """
+        return self.submit(fn, *args, **kwargs).result()
+
+    def _started(self, wait: float) -> None:
+        """Moves a call from the queue to a worker and records its wait."""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            queued = self._queued
+
+        if self.slow_wait and wait > self.slow_wait:
+            logger.warning(
+                "executor_queue_wait",
+                executor=self.name,
+                wait=round(wait, 3),
+                queued=queued,
+                max_workers=self.max_workers,
+            )
+
+    def _done(self, future: Future) -> None:
+        """Takes a call cancelled while still queued off the queue."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    def _finished(self, failed: bool) -> None:
+        """Records a completed call."""
+        with self._lock:
+            self._active -= 1
+            self._completed += 1
+            self._failed += failed
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Snapshot of the pool's queue and wait-time metrics.
+
+        Returns:
+            Dictionary with current queue depth and active calls, totals
+            (including calls cancelled while queued), peak queue depth, and
+            mean/max wait in seconds
+        """
+        with self._lock:
+            started = self._submitted - self._queued - self._cancelled
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "max_queue_depth": self._max_queue_depth,
+                "mean_wait": self._total_wait / started if started else 0.0,
+                "max_wait": self._max_wait,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops accepting calls and releases the worker threads.
+
+        Args:
+            wait: Block until running and queued calls finish
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_executors: dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _pool_size(name: str) -> int:
+    """Configured worker count for a named pool."""
+    sizes = {
+        EMBEDDINGS: config.EXECUTOR_EMBEDDINGS_WORKERS,
+        DATABASE: config.EXECUTOR_DATABASE_WORKERS,
+        PDF: config.EXECUTOR_PDF_WORKERS,
+    }
+    if name not in sizes:
+        raise ValueError(f"Unknown executor '{name}'. Valid: {sorted(sizes)}")
+    return sizes[name]
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """
+    Returns the process-wide pool for a dependency, creating it on first use.
+
+    Args:
+        name: EMBEDDINGS, DATABASE, or PDF
+
+    Returns:
+        Shared BoundedExecutor sized from configuration
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    executor = _executors.get(name)
+    if executor is not None:
+        return executor
+    with _executors_lock:
+        if name not in _executors:
+            _executors[name] = BoundedExecutor(
+                name, _pool_size(name), slow_wait=config.EXECUTOR_SLOW_WAIT
+            )
+            logger.info(
+                "executor_created",
+                executor=name,
+                max_workers=_executors[name].max_workers,
+            )
+        return _executors[name]
+
+
+def executor_stats() -> dict[str, dict[str, Any]]:
+    """
+    Stats of every pool created so far.
+
+    Returns:
+        Mapping of pool name to BoundedExecutor.stats()
+    """
+    return {name: executor.stats() for name, executor in list(_executors.items())}
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """
+    Logs final stats and shuts down every pool (recreated on next use).
+
+    Args:
+        wait: Block until running and queued calls finish
+    """
+    with _executors_lock:
+        executors = dict(_executors)
+        _executors.clear()
+    for executor in executors.values():
+        logger.info("executor_stats", **executor.stats())
+        executor.shutdown(wait=wait)
@@ -0,0 +1,234 @@
+"""
+Medicine resolution index.
+Resolves what users type (brand names with typos or strengths, active
+ingredients) to the canonical medicine names stored in the database.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+
+from src.utils.medicine_matcher import MedicineMatcher
+
+# Tokens dropped before matching: strengths ("575mg", "600") and units
+UNIT_TOKENS = frozenset({"mg", "g", "mcg", "ml", "ui", "comprimidos", "capsulas"})
+
+# Salt qualifiers dropped to index the base ingredient as well
+# ("metamizol magnesico" is also found as "metamizol")
+SALT_QUALIFIERS = frozenset(
+    {
+        "magnesico",
+        "sodico",
+        "potasico",
+        "calcico",
+        "hidrocloruro",
+        "clorhidrato",
+        "arginina",
+        "lisina",
+    }
+)
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercases, strips accents and punctuation, and drops strength and
+    unit tokens, e.g. "Nolotil 575mg cápsulas" -> "nolotil".
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    ascii_text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(
+        token
+        for token in re.findall(r"[a-z0-9]+", ascii_text)
+        if not any(c.isdigit() for c in token) and token not in UNIT_TOKENS
+    )
+
+
+def _trigrams(text: str) -> set[str]:
+    """Trigrams of each word padded with spaces (" si", "sin", ..., "on ")."""
+    grams = set()
+    for word in text.split():
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Edit distance between two strings, stopping early once every path
+    exceeds max_distance (returns max_distance + 1 in that case).
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def allowed_edits(term: str) -> int:
+    """
+    Typos tolerated for a term: none up to 3 characters, one up to 5,
+    two beyond (so "sintron" resolves but "ibuprofenoide" does not).
+    """
+    if len(term) <= 3:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+class MedicineIndex:
+    """
+    Resolves free text to one or more canonical medicine names.
+
+    Every product name and active ingredient is indexed as a normalized
+    term pointing to the products it identifies. Lookup runs in two
+    stages:
+
+    1. Exact: terms appearing as whole words (precompiled MedicineMatcher).
+    2. Fuzzy: candidate terms sharing trigrams with the text, scored in one
+       vectorized pass over an inverted index, then verified by edit
+       distance against the text's word windows.
+
+    Both stages cost a few microseconds regardless of catalogue size; the
+    scoring only touches the postings of the text's own trigrams.
+    """
+
+    def __init__(
+        self,
+        medicines: list[str],
+        active_ingredients: dict[str, list[str]] | None = None,
+        max_candidates: int = 8,
+        min_trigram_overlap: float = 0.3,
+    ):
+        """
+        Build index.
+
+        Args:
+            medicines: Canonical medicine names (as stored in the database)
+            active_ingredients: Active ingredients per canonical name
+            max_candidates: Fuzzy candidates verified by edit distance
+            min_trigram_overlap: Fraction of a term's trigrams the text must
+                share for the term to become a candidate
+        """
+        self.max_candidates = max_candidates
+        self.min_trigram_overlap = min_trigram_overlap
+
+        # term -> canonical names, products before ingredient synonyms
+        self._products: dict[str, list[str]] = {}
+        for medicine in medicines:
+            self._add(normalize(medicine), medicine.lower())
+        for medicine, ingredients in (active_ingredients or {}).items():
+            for ingredient in ingredients:
+                term = normalize(ingredient)
+                self._add(term, medicine.lower())
+                base = " ".join(w for w in term.split() if w not in SALT_QUALIFIERS)
+                self._add(base, medicine.lower())
+
+        self.terms = list(self._products)
+        self._matcher = MedicineMatcher(self.terms)
+        self._build_trigram_index()
+
+    def _add(self, term: str, medicine: str) -> None:
+        """Maps a term to a medicine, keeping insertion order."""
+        if not term:
+            return
+        medicines = self._products.setdefault(term, [])
+        if medicine not in medicines:
+            medicines.append(medicine)
+
+    def _build_trigram_index(self) -> None:
+        """Builds CSR-style postings: trigram -> term indices."""
+        postings: dict[str, list[int]] = {}
+        counts = np.zeros(len(self.terms), dtype=np.float32)
+        for term_id, term in enumerate(self.terms):
+            grams = _trigrams(term)
+            counts[term_id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(term_id)
+
+        self._gram_ids = {gram: i for i, gram in enumerate(postings)}
+        lengths = [len(ids) for ids in postings.values()]
+        self._offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        self._postings = np.fromiter(
+            (term_id for ids in postings.values() for term_id in ids),
+            dtype=np.int32,
+            count=int(self._offsets[-1]),
+        )
+        self._term_grams = np.maximum(counts, 1)
+
+    def resolve(self, text: str) -> list[str]:
+        """
+        Resolves text to canonical medicine names.
+
+        Args:
+            text: What the user typed (e.g., "sintron", "nolotil 575mg",
+                "metamizol")
+
+        Returns:
+            Canonical names, best match first (empty if nothing resolves)
+        """
+        normalized = normalize(text)
+        if not normalized:
+            return []
+
+        exact = self._matcher.find_all(normalized)
+        if exact:
+            return self._medicines_for(exact)
+        return self._medicines_for(self._fuzzy_terms(normalized))
+
+    def _medicines_for(self, terms: list[str]) -> list[str]:
+        """Canonical names of the given terms, without duplicates."""
+        return list(
+            dict.fromkeys(medicine for term in terms for medicine in self._products[term])
+        )
+
+    def _fuzzy_terms(self, text: str) -> list[str]:
+        """
+        Terms within their allowed edit distance of some word window of the
+        text, closest first.
+        """
+        gram_ids = [
+            self._gram_ids[gram] for gram in _trigrams(text) if gram in self._gram_ids
+        ]
+        if not gram_ids:
+            return []
+
+        hits = np.concatenate(
+            [self._postings[self._offsets[g] : self._offsets[g + 1]] for g in gram_ids]
+        )
+        shared = np.bincount(hits, minlength=len(self.terms))
+        overlap = shared / self._term_grams
+
+        candidates = np.flatnonzero(overlap >= self.min_trigram_overlap)
+        if len(candidates) > self.max_candidates:
+            top = np.argpartition(-overlap[candidates], self.max_candidates)
+            candidates = candidates[top[: self.max_candidates]]
+
+        words = text.split()
+        scored = []
+        for term_id in candidates:
+            term = self.terms[term_id]
+            limit = allowed_edits(term)
+            size = len(term.split())
+            distance = min(
+                _levenshtein(" ".join(words[i : i + size]), term, limit)
+                for i in range(max(1, len(words) - size + 1))
+            )
+            if distance <= limit:
+                scored.append((distance, -overlap[term_id], term))
+
+        return [term for *_, term in sorted(scored)]
+
+    def __len__(self) -> int:
+        return len(self.terms)
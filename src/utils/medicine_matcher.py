@@ -0,0 +1,91 @@
+"""
+Whole-word matcher for known medicine names.
+Compiles the catalogue into one trie-shaped regex so matching a message
+does not loop over every known name.
+"""
+
+import re
+
+
+def _trie_pattern(names: list[str]) -> str:
+    """
+    Builds a regex alternation with shared prefixes factored out, e.g.
+    ["ibuprofeno", "ibuprofeno cinfa", "inalador"] becomes
+    "i(?:buprofeno(?: cinfa)?|nalador)".
+
+    The engine follows one trie branch per character instead of trying
+    every name, and the greedy optional groups make longer names win.
+    """
+    trie: dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        ends_here = "" in node
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if ends_here else body
+
+    return build(trie)
+
+
+class MedicineMatcher:
+    """
+    Finds known medicine names in text with word-boundary semantics.
+
+    Built once per catalogue; the longest name wins when several match at
+    the same position (e.g., "ibuprofeno cinfa" over "ibuprofeno").
+    """
+
+    def __init__(self, names: list[str]):
+        """
+        Compile matcher.
+
+        Args:
+            names: Known medicine names (matched case-insensitively)
+        """
+        self.names = sorted({name.lower() for name in names if name})
+        self._pattern = (
+            re.compile(rf"\b{_trie_pattern(self.names)}\b") if self.names else None
+        )
+
+    def find(self, text: str) -> str | None:
+        """
+        Returns the first known name appearing as a whole word in text.
+
+        Args:
+            text: Text to search (e.g., medicine extracted by the router)
+
+        Returns:
+            Matched medicine name or None
+        """
+        if self._pattern is None:
+            return None
+        match = self._pattern.search(text.lower())
+        return match.group(0) if match else None
+
+    def find_all(self, text: str) -> list[str]:
+        """
+        Returns every known name appearing as a whole word in text, in order.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Matched medicine names without duplicates
+        """
+        if self._pattern is None:
+            return []
+        return list(dict.fromkeys(self._pattern.findall(text.lower())))
+
+    def __len__(self) -> int:
+        return len(self.names)
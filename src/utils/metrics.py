@@ -1,6 +1,6 @@
 """
 Performance metrics tracking for observability.
-Tracks latency, token usage, and other performance indicators.
+Tracks latency, token usage, LLM cost, and other performance indicators.
 """
 
 import time
@@ -8,6 +8,7 @@ from typing import Any
 from contextvars import ContextVar
 
 from src.utils.logger import get_logger
+from src.utils.pricing import estimate_cost
 
 logger = get_logger(__name__)
 
@@ -25,7 +26,10 @@ class MetricsTracker:
         """Initialize metrics tracker."""
         self.metrics = {
             "node_timings": {},
-            "tokens": {"input": 0, "output": 0, "total": 0},
+            "tokens": {"input": 0, "output": 0, "cached": 0, "total": 0},
+            "llm_calls": [],
+            "cost": 0.0,
+            "context_builds": [],
             "retrieval_stats": {"queries": 0, "documents_retrieved": 0},
             "total_time": 0.0,
             "start_time": time.time(),
@@ -89,6 +93,36 @@ class MetricsTracker:
         self.metrics["tokens"]["output"] += output_tokens
         self.metrics["tokens"]["total"] += input_tokens + output_tokens
 
+    def add_llm_call(
+        self,
+        node: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        elapsed: float,
+        cached_tokens: int = 0,
+    ) -> None:
+        """
+        Record a single LLM call with its tokens, latency, and cost.
+
+        Args:
+            node: Graph node or component that made the call
+            model: Model that served the call
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            elapsed: Call latency in seconds
+            cached_tokens: Input tokens served from the provider prefix cache
+        """
+        _append_llm_call(
+            self.metrics,
+            node,
+            model,
+            input_tokens,
+            output_tokens,
+            elapsed,
+            cached_tokens,
+        )
+
     def add_retrieval(self, num_documents: int) -> None:
         """
         Record a retrieval operation.
@@ -120,13 +154,24 @@ class MetricsTracker:
             }
 
         self.metrics["node_summary"] = node_summary
+        self.metrics["llm_summary"] = {
+            "by_node": _rollup_llm_calls(self.metrics["llm_calls"], "node"),
+            "by_model": _rollup_llm_calls(self.metrics["llm_calls"], "model"),
+        }
+        self.metrics["cache_hit_rate"] = cache_hit_rate(
+            self.metrics["tokens"]["cached"], self.metrics["tokens"]["input"]
+        )
 
         # Log final metrics
         logger.info(
             "conversation_metrics",
             total_time=self.metrics["total_time"],
             total_tokens=self.metrics["tokens"]["total"],
+            cached_tokens=self.metrics["tokens"]["cached"],
+            cache_hit_rate=self.metrics["cache_hit_rate"],
+            cost=self.metrics["cost"],
             node_summary=node_summary,
+            llm_summary=self.metrics["llm_summary"],
         )
 
         return self.metrics
@@ -183,3 +228,193 @@ def end_node_timing(node_name: str) -> float | None:
 
     return elapsed
 
+
+def record_llm_call(
+    node: str,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    elapsed: float,
+    cached_tokens: int = 0,
+) -> None:
+    """
+    Convenience function to record an LLM call in the active metrics.
+    No-op when no MetricsTracker is active in the current context.
+
+    Args:
+        node: Graph node or component that made the call
+        model: Model that served the call
+        input_tokens: Number of input tokens
+        output_tokens: Number of output tokens
+        elapsed: Call latency in seconds
+        cached_tokens: Input tokens served from the provider prefix cache
+    """
+    metrics = metrics_ctx.get()
+    if not metrics or "llm_calls" not in metrics:
+        return
+    _append_llm_call(
+        metrics, node, model, input_tokens, output_tokens, elapsed, cached_tokens
+    )
+
+
+def record_context_usage(report: dict[str, Any]) -> None:
+    """
+    Convenience function to record a context budget report in the active
+    metrics. No-op when no MetricsTracker is active in the current context.
+
+    Args:
+        report: Budget report produced by ContextBuilder.build()
+    """
+    metrics = metrics_ctx.get()
+    if not metrics or "context_builds" not in metrics:
+        return
+    metrics["context_builds"].append(report)
+
+
+def _append_llm_call(
+    metrics: dict[str, Any],
+    node: str,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    elapsed: float,
+    cached_tokens: int = 0,
+) -> None:
+    """Appends an LLM call record and updates token and cost totals."""
+    cost = estimate_cost(model, input_tokens, output_tokens, cached_tokens)
+
+    metrics["llm_calls"].append(
+        {
+            "node": node,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cached_tokens": cached_tokens,
+            "elapsed": elapsed,
+            "cost": cost,
+        }
+    )
+    metrics["tokens"]["input"] += input_tokens
+    metrics["tokens"]["output"] += output_tokens
+    metrics["tokens"]["cached"] += cached_tokens
+    metrics["tokens"]["total"] += input_tokens + output_tokens
+    metrics["cost"] += cost
+
+
+def _rollup_llm_calls(
+    llm_calls: list[dict[str, Any]], key: str
+) -> dict[str, dict[str, Any]]:
+    """
+    Aggregates LLM call records by node or model.
+
+    Args:
+        llm_calls: Records produced by record_llm_call
+        key: Record field to group by ("node" or "model")
+
+    Returns:
+        Mapping of group name to call count, tokens, latency, and cost
+    """
+    rollup: dict[str, dict[str, Any]] = {}
+    for call in llm_calls:
+        group = rollup.setdefault(
+            call[key],
+            {
+                "calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cached_tokens": 0,
+                "total_time": 0.0,
+                "cost": 0.0,
+            },
+        )
+        group["calls"] += 1
+        group["input_tokens"] += call["input_tokens"]
+        group["output_tokens"] += call["output_tokens"]
+        group["cached_tokens"] += call.get("cached_tokens", 0)
+        group["total_time"] += call["elapsed"]
+        group["cost"] += call["cost"]
+    return rollup
+
+
+def cache_hit_rate(cached_tokens: int, input_tokens: int) -> float:
+    """
+    Fraction of input tokens served from the provider prefix cache.
+
+    Args:
+        cached_tokens: Input tokens reported as cache reads
+        input_tokens: Total input tokens
+
+    Returns:
+        Hit rate between 0.0 and 1.0 (0.0 when there were no input tokens)
+    """
+    return round(cached_tokens / input_tokens, 3) if input_tokens else 0.0
+
+
+class ThreadMetrics:
+    """
+    Rolls up finalized per-turn metrics into per-thread totals.
+    Keeps only aggregates, so memory stays flat over long conversations.
+    """
+
+    def __init__(self, thread_id: str):
+        """
+        Initialize thread-level rollup.
+
+        Args:
+            thread_id: Conversation thread identifier
+        """
+        self.thread_id = thread_id
+        self.turns = 0
+        self.total_time = 0.0
+        self.tokens = {"input": 0, "output": 0, "cached": 0, "total": 0}
+        self.cost = 0.0
+        self.by_node: dict[str, dict[str, Any]] = {}
+
+    def add_turn(self, turn_metrics: dict[str, Any]) -> None:
+        """
+        Adds a finalized turn to the thread totals.
+
+        Args:
+            turn_metrics: Dictionary returned by MetricsTracker.finalize()
+        """
+        self.turns += 1
+        self.total_time += turn_metrics["total_time"]
+        self.cost += turn_metrics["cost"]
+        for field in self.tokens:
+            self.tokens[field] += turn_metrics["tokens"][field]
+
+        for node, stats in turn_metrics["llm_summary"]["by_node"].items():
+            totals = self.by_node.setdefault(node, dict.fromkeys(stats, 0))
+            for field, value in stats.items():
+                totals[field] += value
+
+        logger.info(
+            "turn_cost",
+            thread_id=self.thread_id,
+            turn=self.turns,
+            cost=turn_metrics["cost"],
+            tokens=turn_metrics["tokens"]["total"],
+            cache_hit_rate=turn_metrics["cache_hit_rate"],
+            elapsed=turn_metrics["total_time"],
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Returns the per-thread rollup and logs it.
+
+        Returns:
+            Dictionary with turns, tokens, latency, cost, and per-node totals
+        """
+        summary = {
+            "thread_id": self.thread_id,
+            "turns": self.turns,
+            "total_time": self.total_time,
+            "tokens": dict(self.tokens),
+            "cache_hit_rate": cache_hit_rate(
+                self.tokens["cached"], self.tokens["input"]
+            ),
+            "cost": self.cost,
+            "by_node": self.by_node,
+        }
+        logger.info("thread_cost", **summary)
+        return summary
@@ -0,0 +1,81 @@
+"""
+LLM price table loading and cost estimation.
+Loads the price table once from YAML and caches it, like prompts.
+"""
+
+import yaml
+from pathlib import Path
+from functools import lru_cache
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TOKENS_PER_PRICE_UNIT = 1_000_000
+
+
+@lru_cache(maxsize=1)
+def load_pricing() -> dict[str, dict[str, float]]:
+    """
+    Loads the per-model price table (USD per 1M tokens) with LRU cache.
+
+    Returns:
+        Mapping of model name prefix to its input/output prices
+
+    Raises:
+        FileNotFoundError: If pricing.yaml is not found
+    """
+    config_path = Path(__file__).parent.parent.parent / "config" / "pricing.yaml"
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f).get("models", {})
+
+
+@lru_cache(maxsize=64)
+def get_model_prices(model_name: str) -> dict[str, float] | None:
+    """
+    Finds the price entry for a model using longest-prefix matching.
+
+    Args:
+        model_name: Model identifier as reported by the provider
+            (e.g., "gpt-4o-2024-08-06", "models/gemini-2.5-flash")
+
+    Returns:
+        Price entry or None if the model is not in the price table
+    """
+    name = model_name.lower().removeprefix("models/")
+    matches = [prefix for prefix in load_pricing() if name.startswith(prefix)]
+    if not matches:
+        logger.warning("model_price_unknown", model=model_name, cost_assumed=0.0)
+        return None
+    return load_pricing()[max(matches, key=len)]
+
+
+def estimate_cost(
+    model_name: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+) -> float:
+    """
+    Estimates the USD cost of a single LLM call.
+
+    Args:
+        model_name: Model identifier
+        input_tokens: Prompt tokens billed (including cached tokens)
+        output_tokens: Completion tokens billed
+        cached_tokens: Prompt tokens served from the provider prefix cache
+
+    Returns:
+        Estimated cost in USD (0.0 for models without a price entry)
+    """
+    prices = get_model_prices(model_name)
+    if not prices:
+        return 0.0
+
+    input_price = prices.get("input", 0.0)
+    cached_price = prices.get("cached_input", input_price)
+    return (
+        (input_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + output_tokens * prices.get("output", 0.0)
+    ) / TOKENS_PER_PRICE_UNIT
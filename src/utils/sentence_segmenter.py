@@ -0,0 +1,165 @@
+"""
+Abbreviation-aware sentence segmentation for chunking.
+Runs NLTK's Punkt model directly, loaded once per process, with Spanish
+leaflet abbreviations added, instead of going through LangChain's
+NLTKTextSplitter.
+"""
+
+from functools import lru_cache
+
+# Abbreviations common in Spanish leaflets that Punkt must not treat as
+# sentence ends ("p. ej. ácido...", "aprox. 2 horas"). Stored as Punkt
+# abbreviation types: lowercase, without the trailing period.
+SPANISH_ABBREVIATIONS = (
+    "mg",
+    "p",
+    "ej",
+    "aprox",
+    "etc",
+    "máx",
+    "mín",
+    "núm",
+    "pág",
+    "dr",
+    "dra",
+    "sr",
+    "sra",
+)
+
+
+@lru_cache(maxsize=4)
+def _load_punkt(language: str, abbreviations: tuple[str, ...]):
+    """
+    Loads the Punkt model for a language with extra abbreviations.
+
+    Raises:
+        LookupError: If the punkt_tab data is not installed
+    """
+    from nltk.tokenize.punkt import PunktTokenizer
+
+    tokenizer = PunktTokenizer(language)
+    tokenizer._params.abbrev_types.update(abbreviations)
+    return tokenizer
+
+
+def merge_sentences(
+    sentences: list[str],
+    chunk_size: int = 4000,
+    chunk_overlap: int = 200,
+    separator: str = "\n\n",
+) -> list[str]:
+    """
+    Groups sentences into pieces of up to chunk_size characters, exactly as
+    LangChain's TextSplitter._merge_splits does for NLTKTextSplitter, so
+    both splitters yield the same units.
+
+    Args:
+        sentences: Sentences of one paragraph
+        chunk_size: Maximum characters per piece
+        chunk_overlap: Characters carried over between pieces
+        separator: Text joining sentences within a piece
+
+    Returns:
+        Stripped, non-empty pieces
+    """
+    pieces = []
+    current: list[str] = []
+    total = 0
+    separator_len = len(separator)
+
+    def flush():
+        piece = separator.join(current).strip()
+        if piece:
+            pieces.append(piece)
+
+    for sentence in sentences:
+        length = len(sentence)
+        if total + length + (separator_len if current else 0) > chunk_size:
+            if current:
+                flush()
+                while total > chunk_overlap or (
+                    total + length + (separator_len if current else 0) > chunk_size
+                    and total > 0
+                ):
+                    total -= len(current[0]) + (
+                        separator_len if len(current) > 1 else 0
+                    )
+                    current = current[1:]
+        current.append(sentence)
+        total += length + (separator_len if len(current) > 1 else 0)
+    flush()
+    return pieces
+
+
+class SentenceSegmenter:
+    """
+    Punkt sentence segmenter for whole documents.
+
+    The model is loaded once per process and language, not per paragraph.
+    Sentences are grouped with merge_sentences(), so the output matches
+    NLTKTextSplitter.split_text() paragraph by paragraph except where the
+    extra abbreviations keep a sentence whole: on the leaflet fixtures,
+    five breaks after "p. ej." that NLTKTextSplitter makes.
+    """
+
+    def __init__(
+        self,
+        language: str = "spanish",
+        abbreviations: tuple[str, ...] = SPANISH_ABBREVIATIONS,
+        chunk_size: int = 4000,
+        chunk_overlap: int = 200,
+    ):
+        """
+        Initialize segmenter.
+
+        Args:
+            language: Punkt model language
+            abbreviations: Extra abbreviations (lowercase, no final period)
+            chunk_size: Maximum characters per unit (NLTKTextSplitter default)
+            chunk_overlap: Overlap between units (NLTKTextSplitter default)
+
+        Raises:
+            LookupError: If the punkt_tab data is not installed
+        """
+        self.language = language
+        self.abbreviations = tuple(abbreviations)
+        self.tokenizer = _load_punkt(language, self.abbreviations)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def __reduce__(self):
+        """Pickles the settings only; the model is reloaded from the cache."""
+        return (
+            SentenceSegmenter,
+            (self.language, self.abbreviations, self.chunk_size, self.chunk_overlap),
+        )
+
+    def split_text(self, text: str) -> list[str]:
+        """
+        Splits one paragraph.
+
+        Args:
+            text: Paragraph text
+
+        Returns:
+            Sentence units
+        """
+        return merge_sentences(
+            self.tokenizer.tokenize(text), self.chunk_size, self.chunk_overlap
+        )
+
+    def split_paragraphs(self, paragraphs: list[str]) -> list[list[str]]:
+        """
+        Splits each paragraph in turn, as split_text() would.
+
+        Args:
+            paragraphs: Paragraph texts
+
+        Returns:
+            Sentence units per paragraph, in the same order
+        """
+        tokenize = self.tokenizer.tokenize
+        return [
+            merge_sentences(tokenize(text), self.chunk_size, self.chunk_overlap)
+            for text in paragraphs
+        ]
@@ -0,0 +1,91 @@
+"""
+Token counting for context budgeting.
+Provides one cached tokenizer per model, falling back to a character
+estimate when no exact encoding is available.
+"""
+
+import json
+from functools import lru_cache
+from typing import Callable
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Encoding used for models tiktoken does not know (e.g., Gemini). Close
+# enough for budgeting; exact counts come back in usage_metadata.
+DEFAULT_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 4
+# Approximate per-message framing overhead (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _estimate_tokens(text: str) -> int:
+    """Approximates token count (about 4 characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=16)
+def get_token_counter(model_name: str) -> Callable[[str], int]:
+    """
+    Returns a text token counter for a model, loading its encoding once.
+
+    Args:
+        model_name: Model identifier (e.g., "gpt-4o", "gemini-2.5-flash")
+
+    Returns:
+        Function mapping text to its token count
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # tiktoken missing or its encoding files unreachable (offline)
+        logger.warning(
+            "tokenizer_unavailable",
+            model=model_name,
+            error=str(e),
+            fallback="chars_per_token",
+        )
+        return _estimate_tokens
+
+    @lru_cache(maxsize=4096)
+    def count(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    logger.info("tokenizer_loaded", model=model_name, encoding=encoding.name)
+    return count
+
+
+def count_message_tokens(
+    message: BaseMessage, count_text: Callable[[str], int]
+) -> int:
+    """
+    Counts tokens of a message, including tool call arguments.
+
+    Args:
+        message: Message to count
+        count_text: Text token counter (from get_token_counter)
+
+    Returns:
+        Approximate token count of the message
+    """
+    content = message.content
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False)
+
+    tokens = count_text(content) + MESSAGE_OVERHEAD_TOKENS
+    if isinstance(message, AIMessage) and message.tool_calls:
+        tokens += count_text(
+            json.dumps(
+                [(c["name"], c["args"]) for c in message.tool_calls],
+                ensure_ascii=False,
+            )
+        )
+    return tokens
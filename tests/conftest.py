@@ -191,3 +191,16 @@ def sample_chunks() -> list[Document]:
         ),
     ]
 
+
+@pytest.fixture
+def punkt_available():
+    """
+    Downloads the Spanish punkt_tab model if missing; skips the test if it
+    cannot be installed (e.g. offline).
+    """
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("tokenizers/punkt_tab/spanish/")
+    except LookupError:
+        if not nltk.download("punkt_tab", quiet=True):
+            pytest.skip("punkt_tab not installed (nltk.download('punkt_tab'))")
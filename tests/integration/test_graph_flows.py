@@ -16,9 +16,9 @@ class TestGraphGreetingFlow:
     """Tests for greeting/farewell conversation flow."""
 
     @pytest.mark.asyncio
-    @patch("src.graph.builder.create_client")
-    @patch("src.graph.builder.get_embeddings_model")
-    @patch("src.graph.builder.create_llm")
+    @patch("src.graph.container.create_client")
+    @patch("src.graph.container.get_embeddings_model")
+    @patch("src.graph.container.create_llm")
     async def test_greeting_flow_complete(
         self, mock_create_llm, mock_embeddings, mock_supabase
     ):
@@ -48,7 +48,7 @@ class TestGraphGreetingFlow:
         # Mock agent LLM (not used in greeting flow)
         agent_llm = Mock()
 
-        mock_create_llm.side_effect = [agent_llm, router_llm]
+        mock_create_llm.side_effect = [agent_llm, router_llm, Mock(), Mock()]
 
         # Build graph
         graph = build_graph(with_checkpointer=False)
@@ -73,9 +73,9 @@ class TestGraphMedicineQuestionFlow:
     """Tests for medicine question flow (happy path)."""
 
     @pytest.mark.asyncio
-    @patch("src.graph.builder.create_client")
-    @patch("src.graph.builder.get_embeddings_model")
-    @patch("src.graph.builder.create_llm")
+    @patch("src.graph.container.create_client")
+    @patch("src.graph.container.get_embeddings_model")
+    @patch("src.graph.container.create_llm")
     async def test_known_medicine_retrieval_flow(
         self, mock_create_llm, mock_embeddings, mock_supabase
     ):
@@ -137,7 +137,7 @@ class TestGraphMedicineQuestionFlow:
 
         agent_llm.bind_tools.return_value = agent_llm
 
-        mock_create_llm.side_effect = [agent_llm, router_llm]
+        mock_create_llm.side_effect = [agent_llm, router_llm, Mock(), Mock()]
 
         # Mock retriever to return documents
         with patch("src.database.supabase.SupabaseRetriever._aget_relevant_documents") as mock_retriever:
@@ -175,9 +175,9 @@ class TestGraphUnauthorizedFlow:
     """Tests for unauthorized medicine questions."""
 
     @pytest.mark.asyncio
-    @patch("src.graph.builder.create_client")
-    @patch("src.graph.builder.get_embeddings_model")
-    @patch("src.graph.builder.create_llm")
+    @patch("src.graph.container.create_client")
+    @patch("src.graph.container.get_embeddings_model")
+    @patch("src.graph.container.create_llm")
     async def test_unknown_medicine_blocked(
         self, mock_create_llm, mock_embeddings, mock_supabase
     ):
@@ -205,7 +205,7 @@ class TestGraphUnauthorizedFlow:
         )
 
         agent_llm = Mock()
-        mock_create_llm.side_effect = [agent_llm, router_llm]
+        mock_create_llm.side_effect = [agent_llm, router_llm, Mock(), Mock()]
 
         # Build graph
         graph = build_graph(with_checkpointer=False)
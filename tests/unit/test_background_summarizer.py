@@ -0,0 +1,149 @@
+"""
+Unit tests for BackgroundSummarizer.
+Tests that summaries are applied between turns without blocking them.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, END
+
+from src.models.domain import AgentState
+from src.graph.background import BackgroundSummarizer
+
+
+def _build_turn_graph():
+    """Compiles a graph that answers and counts turns, never summarizing inline."""
+    workflow = StateGraph(AgentState)
+    workflow.add_node(
+        "agent",
+        lambda state: {"messages": [AIMessage(content="respuesta")]},
+    )
+    workflow.add_node(
+        "end_of_turn",
+        lambda state: {
+            "turn_count": state.get("turn_count", 0) + 1,
+            "window_tokens": 1000 * len(state["messages"]),
+        },
+    )
+    workflow.add_node("summarizer", lambda state: {})
+    workflow.set_entry_point("agent")
+    workflow.add_edge("agent", "end_of_turn")
+    workflow.add_edge("end_of_turn", END)
+    workflow.add_edge("summarizer", END)
+    return workflow.compile(checkpointer=InMemorySaver())
+
+
+async def _run_turns(graph, run_config, count: int) -> None:
+    """Runs several turns on one thread."""
+    for i in range(count):
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content=f"pregunta {i}")]}, run_config
+        )
+
+
+def _memory_service(delay: float = 0.0) -> Mock:
+    """Mock MemoryService that clears the window and stores a summary."""
+
+    async def summarize(state):
+        await asyncio.sleep(delay)
+        return {
+            "summary": "resumen",
+            "messages": [RemoveMessage(id=m.id) for m in state["messages"]],
+            "turn_count": 0,
+        }
+
+    service = Mock()
+    service.summarize_conversation = AsyncMock(side_effect=summarize)
+    return service
+
+
+@pytest.fixture(autouse=True)
+def trigger_tokens(monkeypatch):
+    """Summarize once the window exceeds two turns (4000 tokens)."""
+    monkeypatch.setattr("src.graph.edges.config.SUMMARIZATION_TRIGGER_TOKENS", 4000)
+
+
+@pytest.fixture
+def run_config():
+    """Run config for a single thread."""
+    return {"configurable": {"thread_id": "thread-1"}}
+
+
+class TestBackgroundSummarizer:
+    """Tests for scheduling and applying background summaries."""
+
+    @pytest.mark.asyncio
+    async def test_summary_written_before_next_turn(self, run_config):
+        """Should store the summary in the checkpoint once awaited."""
+        # Arrange
+        graph = _build_turn_graph()
+        summarizer = BackgroundSummarizer(graph, _memory_service(delay=0.05))
+        await _run_turns(graph, run_config, 3)
+
+        # Act
+        summarizer.schedule(run_config)
+        await summarizer.wait(run_config)
+
+        # Assert
+        state = (await graph.aget_state(run_config)).values
+        assert state["summary"] == "resumen"
+        assert state["messages"] == []
+        assert state["turn_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_schedule_does_not_block(self, run_config):
+        """Should return before the summarization call finishes."""
+        # Arrange
+        graph = _build_turn_graph()
+        summarizer = BackgroundSummarizer(graph, _memory_service(delay=0.2))
+        await _run_turns(graph, run_config, 3)
+
+        # Act
+        task = summarizer.schedule(run_config)
+
+        # Assert
+        assert not task.done()
+        await summarizer.aclose()
+        assert task.result() is True
+
+    @pytest.mark.asyncio
+    async def test_skips_when_below_threshold(self, run_config):
+        """Should not call the summarizer before the threshold is reached."""
+        # Arrange
+        graph = _build_turn_graph()
+        memory_service = _memory_service()
+        summarizer = BackgroundSummarizer(graph, memory_service)
+        await _run_turns(graph, run_config, 1)
+
+        # Act
+        summarizer.schedule(run_config)
+        await summarizer.wait(run_config)
+
+        # Assert
+        memory_service.summarize_conversation.assert_not_called()
+        assert "summary" not in (await graph.aget_state(run_config)).values
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_block_next_turn(self, run_config):
+        """Should log a failed summary and keep the history unchanged."""
+        # Arrange
+        graph = _build_turn_graph()
+        memory_service = Mock()
+        memory_service.summarize_conversation = AsyncMock(
+            side_effect=RuntimeError("provider down")
+        )
+        summarizer = BackgroundSummarizer(graph, memory_service)
+        await _run_turns(graph, run_config, 3)
+
+        # Act
+        summarizer.schedule(run_config)
+        await summarizer.wait(run_config)
+
+        # Assert
+        state = (await graph.aget_state(run_config)).values
+        assert len(state["messages"]) == 6
+        assert state["turn_count"] == 3
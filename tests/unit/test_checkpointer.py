@@ -0,0 +1,135 @@
+"""
+Unit tests for checkpointers.
+Tests backend dispatch, the local SQLite stand-in, and the bounds of the
+in-memory checkpointer.
+"""
+
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import StateGraph, END
+
+from src.database.checkpointer import BoundedMemorySaver, open_checkpointer
+
+
+class CounterState(TypedDict):
+    """Minimal state accumulating one entry per run."""
+
+    items: Annotated[list[str], operator.add]
+
+
+def _build_counter_graph(checkpointer):
+    """Compiles a one-node graph that appends a large item per run."""
+    workflow = StateGraph(CounterState)
+    workflow.add_node("append", lambda state: {"items": ["x" * 1000]})
+    workflow.set_entry_point("append")
+    workflow.add_edge("append", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def _run(graph, thread_id: str) -> None:
+    """Runs one turn on a thread."""
+    graph.invoke({"items": []}, {"configurable": {"thread_id": thread_id}})
+
+
+class TestOpenCheckpointer:
+    """Tests for the checkpointer factory."""
+
+    @pytest.mark.asyncio
+    async def test_memory_backend(self):
+        """Should yield an in-memory saver."""
+        # Act
+        async with open_checkpointer("memory") as checkpointer:
+            # Assert
+            assert isinstance(checkpointer, BoundedMemorySaver)
+
+    @pytest.mark.asyncio
+    async def test_unknown_backend_raises(self):
+        """Should reject unsupported backends."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unsupported checkpointer backend"):
+            async with open_checkpointer("redis"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_sqlite_backend_persists_checkpoints(self, tmp_path, monkeypatch):
+        """Should store checkpoints in the configured SQLite file."""
+        # Arrange
+        pytest.importorskip("langgraph.checkpoint.sqlite.aio")
+        db_path = tmp_path / "checkpoints.sqlite"
+        monkeypatch.setattr(
+            "src.database.checkpointer.config.CHECKPOINTER_SQLITE_PATH", str(db_path)
+        )
+
+        # Act
+        async with open_checkpointer("sqlite") as checkpointer:
+            checkpoints = [c async for c in checkpointer.alist(None)]
+
+        # Assert
+        assert checkpoints == []
+        assert db_path.exists()
+
+
+class TestBoundedMemorySaver:
+    """Tests for eviction and retention in the in-memory checkpointer."""
+
+    def test_retains_latest_checkpoints_per_thread(self):
+        """Should keep only the newest checkpoints and the blobs they use."""
+        # Arrange
+        saver = BoundedMemorySaver(max_checkpoints_per_thread=3)
+        graph = _build_counter_graph(saver)
+
+        # Act
+        for _ in range(10):
+            _run(graph, "thread-1")
+
+        # Assert
+        state = graph.get_state({"configurable": {"thread_id": "thread-1"}})
+        assert len(state.values["items"]) == 10
+        assert saver.get_stats()["checkpoints"] == 3
+        assert len([key for key in saver.blobs if key[2] == "items"]) <= 3
+
+    def test_evicts_least_recently_used_thread(self):
+        """Should drop the least recently used thread beyond max_threads."""
+        # Arrange
+        saver = BoundedMemorySaver(max_threads=2)
+        graph = _build_counter_graph(saver)
+
+        # Act
+        for thread_id in ("a", "b", "c"):
+            _run(graph, thread_id)
+
+        # Assert
+        assert set(saver.storage) == {"b", "c"}
+        assert all(key[0] != "a" for key in saver.blobs)
+        assert saver.get_stats()["evicted_threads"] == 1
+
+    def test_evicts_idle_threads_after_ttl(self):
+        """Should drop threads idle for longer than the TTL."""
+        # Arrange
+        saver = BoundedMemorySaver(thread_ttl=0.0)
+        graph = _build_counter_graph(saver)
+        _run(graph, "idle")
+
+        # Act
+        _run(graph, "active")
+
+        # Assert
+        assert "idle" not in saver.storage
+        assert "active" in saver.storage
+
+    def test_stats_report_resident_size(self):
+        """Should count resident threads and serialized bytes."""
+        # Arrange
+        saver = BoundedMemorySaver()
+        graph = _build_counter_graph(saver)
+
+        # Act
+        _run(graph, "thread-1")
+        _run(graph, "thread-2")
+        stats = saver.get_stats()
+
+        # Assert
+        assert stats["threads"] == 2
+        assert stats["bytes"] > 2000
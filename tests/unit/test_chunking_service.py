@@ -3,10 +3,38 @@ Unit tests for ChunkingService.
 Tests markdown parsing, semantic chunking, and medicine name extraction.
 """
 
+import pickle
+import random
+import re
+import time
+from pathlib import Path
+
 import pytest
 from langchain_core.documents import Document
+from langchain.text_splitter import NLTKTextSplitter
 
 from src.services.chunking_service import ChunkingService
+from src.utils.sentence_segmenter import merge_sentences
+
+MARKDOWN_FIXTURES = sorted(
+    str(path)
+    for path in (Path(__file__).parents[2] / "data_markdown").glob("*.md")
+)
+
+# Breaks NLTKTextSplitter makes after "p. ej." and punkt mode keeps inside
+# the sentence, per fixture; every other sentence boundary is identical
+ABBREVIATION_BREAKS = {
+    "parsed_by_docling_nolotil_575.md": 2,
+    "parsed_by_gemini-2-5-flash_nolotil_575.md": 2,
+    "parsed_by_gemini-2-5-flash_sintrom_4.md": 1,
+}
+
+
+def _chunk_fixture(service: ChunkingService, path: str) -> list[Document]:
+    """Chunks one markdown fixture."""
+    with open(path, "r", encoding="utf-8") as f:
+        blocks = service.markdown_to_semantic_blocks(f.read())
+    return service.create_sentence_window_chunks(blocks, path, "test")
 
 
 @pytest.fixture
@@ -119,6 +147,40 @@ Items:
         assert "Item 1" in content
         assert "Item 2" in content
 
+    def test_nested_lists_and_paths(self, chunking_service):
+        """Should indent nested items and rebuild header paths per block."""
+        # Arrange
+        markdown = """# 4. Efectos adversos
+
+## Frecuentes
+
+- Náuseas
+    - Vómitos
+-
+    - Mareo
+
+# 5. Conservación
+
+Guardar por debajo de 25 ºC.
+"""
+
+        # Act
+        blocks = chunking_service.markdown_to_semantic_blocks(markdown)
+
+        # Assert
+        assert [block["path"] for block in blocks] == [
+            "4. Efectos adversos",
+            "4. Efectos adversos > Frecuentes",
+            "5. Conservación",
+        ]
+        items = [line for line in blocks[1]["content"].splitlines() if line]
+        assert items[1:] == [
+            "- Náuseas",
+            "    - Vómitos",
+            "- Mareo",  # an item without text takes its first nested one
+            "    - Mareo",
+        ]
+
     def test_handle_empty_sections(self, chunking_service):
         """Should handle sections with no content gracefully."""
         # Arrange
@@ -326,3 +388,139 @@ Este medicamento está indicado para el tratamiento de la inflamación.
         assert len(chunks) == 1
         assert chunks[0].page_content.strip() == "Single sentence."
 
+
+
+class TestPunktSentenceSplitter:
+    """Tests for the Punkt sentence splitter mode."""
+
+    def test_merge_matches_langchain(self):
+        """Should group sentences exactly like NLTKTextSplitter does."""
+        # Arrange
+        splitter = NLTKTextSplitter()
+        rng = random.Random(0)
+        cases = [
+            ["x" * rng.randint(0, 1500) for _ in range(rng.randint(0, 12))]
+            for _ in range(500)
+        ]
+
+        # Act & Assert
+        for sentences in cases:
+            assert merge_sentences(sentences) == splitter._merge_splits(
+                sentences, "\n\n"
+            )
+
+    def test_unknown_splitter(self):
+        """Should reject unknown sentence splitters."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            ChunkingService(sentence_splitter="spacy")
+
+    @pytest.mark.parametrize("path", MARKDOWN_FIXTURES)
+    def test_same_chunks_as_nltk_splitter(self, punkt_available, path):
+        """Should keep every boundary except the listed "p. ej." breaks."""
+        # Act
+        expected = [
+            c.metadata["main_sentence"]
+            for c in _chunk_fixture(ChunkingService(), path)
+        ]
+        result = [
+            c.metadata["main_sentence"]
+            for c in _chunk_fixture(ChunkingService(sentence_splitter="punkt"), path)
+        ]
+
+        # Assert
+        breaks = sum(
+            len(re.findall(r"p\. +ej\.\n\n", s)) for s in expected
+        ) - sum(len(re.findall(r"p\. +ej\.\n\n", s)) for s in result)
+        assert breaks == ABBREVIATION_BREAKS.get(Path(path).name, 0)
+        assert [s.split() for s in result] == [s.split() for s in expected]
+
+    def test_pickles_without_the_model(self, punkt_available):
+        """Should reuse the cached model when unpickled in the same process."""
+        # Arrange
+        segmenter = ChunkingService(sentence_splitter="punkt").sentence_splitter
+
+        # Act
+        copy = pickle.loads(pickle.dumps(segmenter))
+
+        # Assert
+        assert copy.tokenizer is segmenter.tokenizer
+        assert (copy.chunk_size, copy.chunk_overlap) == (4000, 200)
+
+    def test_keeps_abbreviations_inside_sentences(self, punkt_available):
+        """Should not split after Spanish abbreviations."""
+        # Arrange
+        service = ChunkingService(sentence_splitter="punkt")
+
+        # Act
+        sentences = service.sentence_splitter.tokenizer.tokenize(
+            "Evite los anticoagulantes, p. ej. warfarina. Tome aprox. 2 dosis."
+        )
+
+        # Assert
+        assert sentences == [
+            "Evite los anticoagulantes, p. ej. warfarina.",
+            "Tome aprox. 2 dosis.",
+        ]
+
+
+@pytest.mark.slow
+class TestSemanticBlocksBenchmark:
+    """Microbenchmark: block building must scale linearly with size."""
+
+    def test_time_linear_in_document_size(self, chunking_service):
+        """Should parse the corpus scaled 100x in about 10x the 10x time."""
+        # Arrange
+        corpus = "\n\n".join(
+            Path(path).read_text(encoding="utf-8") for path in MARKDOWN_FIXTURES
+        )
+        side_effects = "# 4. Efectos adversos\n\n" + "\n".join(
+            f"- Efecto adverso {i}" for i in range(20_000)
+        )
+
+        def parse_time(markdown):
+            start = time.perf_counter()
+            blocks = chunking_service.markdown_to_semantic_blocks(markdown)
+            return time.perf_counter() - start, blocks
+
+        # Act
+        small_time, _ = parse_time("\n\n".join([corpus] * 10))
+        large_time, blocks = parse_time("\n\n".join([corpus] * 100))
+        short_list_time, _ = parse_time(side_effects[: len(side_effects) // 10])
+        long_list_time, _ = parse_time(side_effects)
+
+        # Assert
+        assert len(blocks) > 100 * len(MARKDOWN_FIXTURES)
+        assert large_time < 20 * small_time, (
+            f"corpus x10: {small_time:.2f}s, x100: {large_time:.2f}s"
+        )
+        assert long_list_time < 20 * short_list_time, (
+            f"list /10: {short_list_time:.2f}s, full: {long_list_time:.2f}s"
+        )
+
+
+@pytest.mark.slow
+class TestSentenceSplitterBenchmark:
+    """Microbenchmark: Punkt mode against NLTKTextSplitter."""
+
+    def test_punkt_not_slower_than_nltk_splitter(self, punkt_available):
+        """Should chunk the fixture corpus about as fast in punkt mode."""
+        # Arrange
+        nltk_service = ChunkingService()
+        punkt_service = ChunkingService(sentence_splitter="punkt")
+        _chunk_fixture(nltk_service, MARKDOWN_FIXTURES[0])  # warm up the model
+
+        def corpus_time(service):
+            start = time.perf_counter()
+            for path in MARKDOWN_FIXTURES:
+                _chunk_fixture(service, path)
+            return time.perf_counter() - start
+
+        # Act
+        nltk_time = min(corpus_time(nltk_service) for _ in range(3))
+        punkt_time = min(corpus_time(punkt_service) for _ in range(3))
+
+        # Assert
+        assert punkt_time < 1.5 * nltk_time, (
+            f"nltk: {nltk_time:.3f}s, punkt: {punkt_time:.3f}s"
+        )
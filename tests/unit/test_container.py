@@ -0,0 +1,103 @@
+"""
+Unit tests for ServiceContainer.
+Tests lazy construction and sharing of components between graphs.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.graph.builder import build_graph
+from src.database.postgres_retriever import PostgresRetriever
+from src.graph.container import ServiceContainer
+
+
+@pytest.fixture
+def patched_clients():
+    """Patches every external client factory used by the container."""
+    with (
+        patch("src.graph.container.create_client") as mock_supabase,
+        patch("src.graph.container.get_embeddings_model") as mock_embeddings,
+        patch("src.graph.container.create_llm") as mock_create_llm,
+        patch("src.graph.container.SupabaseRetriever"),
+    ):
+        mock_supabase.return_value.rpc.return_value.execute.return_value = Mock(
+            data=[{"medicine_name": "ibuprofeno"}]
+        )
+        mock_embeddings.return_value = Mock()
+        mock_create_llm.side_effect = lambda model_name, api_key: Mock(
+            model_name=model_name
+        )
+        yield mock_supabase, mock_embeddings, mock_create_llm
+
+
+class TestServiceContainer:
+    """Tests for lazy, shared component construction."""
+
+    def test_nothing_built_until_accessed(self, patched_clients):
+        """Should not create clients when the container is created."""
+        # Arrange
+        mock_supabase, mock_embeddings, mock_create_llm = patched_clients
+
+        # Act
+        ServiceContainer()
+
+        # Assert
+        mock_supabase.assert_not_called()
+        mock_embeddings.assert_not_called()
+        mock_create_llm.assert_not_called()
+
+    def test_graphs_share_components(self, patched_clients):
+        """Should build clients and load medicines once for several graphs."""
+        # Arrange
+        mock_supabase, mock_embeddings, mock_create_llm = patched_clients
+        container = ServiceContainer()
+
+        # Act
+        studio_graph = build_graph(container=container)
+        console_graph = build_graph(with_checkpointer=True, container=container)
+
+        # Assert
+        assert studio_graph is not console_graph
+        mock_supabase.assert_called_once()
+        mock_embeddings.assert_called_once()
+        assert mock_create_llm.call_count == 4  # agent, router, two fallbacks
+        rpc_names = [c.args[0] for c in mock_supabase.return_value.rpc.call_args_list]
+        assert rpc_names == [
+            "get_catalogue_version",
+            "get_distinct_medicine_names",
+            "get_medicine_active_ingredients",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_postgres_retriever_backend(self, patched_clients, monkeypatch):
+        """Should search over a direct pool and close it with the container."""
+        # Arrange
+        monkeypatch.setattr("src.graph.container.config.RETRIEVER_BACKEND", "postgres")
+        pool = Mock(close=AsyncMock())
+        container = ServiceContainer()
+
+        # Act
+        with (
+            patch("src.graph.container.create_retriever_pool", return_value=pool),
+            patch("src.graph.container.PostgresRetriever") as mock_retriever,
+        ):
+            mock_retriever.return_value = Mock(spec=PostgresRetriever, pool=pool)
+            retriever = container.retriever
+        await container.aclose()
+
+        # Assert
+        assert retriever is mock_retriever.return_value
+        assert mock_retriever.call_args.kwargs["pool"] is pool
+        pool.close.assert_awaited_once()
+
+    def test_default_search_needs_no_embedding_migration(self, patched_clients):
+        """Should not request chunk embeddings unless re-ranking is enabled."""
+        # Arrange
+        container = ServiceContainer()
+
+        # Act
+        with patch("src.graph.container.SupabaseRetriever") as mock_retriever:
+            container.retriever
+
+        # Assert
+        assert mock_retriever.call_args.kwargs["include_embeddings"] is False
@@ -0,0 +1,162 @@
+"""
+Unit tests for ContextBuilder.
+Tests token budgeting, tool output compression, and turn dropping.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.services.context_service import ContextBuilder, TRUNCATION_MARKER
+from src.utils.metrics import MetricsTracker
+
+
+def _tool_turn(question: str, tool_output: str, turn: int) -> list:
+    """Builds one turn with a tool call, its result, and a final answer."""
+    call_id = f"call_{turn}"
+    return [
+        HumanMessage(content=question, id=f"h{turn}"),
+        AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "get_information_about_medicine",
+                    "args": {"query": question},
+                    "id": call_id,
+                }
+            ],
+            id=f"a{turn}",
+        ),
+        ToolMessage(content=tool_output, tool_call_id=call_id, id=f"t{turn}"),
+    ]
+
+
+@pytest.fixture
+def long_output():
+    """Tool output of a few thousand tokens."""
+    return "[Source 1]\n" + "El ibuprofeno alivia el dolor. " * 400
+
+
+class TestWithinBudget:
+    """Tests for conversations that already fit."""
+
+    def test_keeps_all_messages(self):
+        """Should pass system prompt, summary, and history through unchanged."""
+        # Arrange
+        builder = ContextBuilder("gpt-4o", max_input_tokens=10000)
+        messages = [HumanMessage(content="Hola"), AIMessage(content="¿En qué te ayudo?")]
+
+        # Act
+        context, report = builder.build("Eres un asistente.", messages, summary="Previo")
+
+        # Assert
+        assert isinstance(context[0], SystemMessage)
+        assert "Previo" in context[1].content
+        assert context[2:] == messages
+        assert report["tool_messages_compressed"] == 0
+        assert report["messages_dropped"] == 0
+        assert report["tokens_used"] == report["tokens_before"]
+
+
+class TestBudgetEnforcement:
+    """Tests for trimming when the budget is exceeded."""
+
+    def test_compresses_older_tool_outputs_first(self, long_output):
+        """Should shrink the oldest tool output and keep the latest intact."""
+        # Arrange
+        builder = ContextBuilder("gpt-4o", max_input_tokens=1000, compressed_tool_tokens=50)
+        latest = "[Source 1]\nDosis: 400 mg."
+        messages = _tool_turn(
+            "¿Para qué sirve el ibuprofeno?", long_output, 1
+        ) + _tool_turn("¿Y la dosis?", latest, 2)
+
+        # Act
+        context, report = builder.build("Sistema", messages)
+
+        # Assert
+        tool_messages = [m for m in context if isinstance(m, ToolMessage)]
+        assert tool_messages[0].content.endswith(TRUNCATION_MARKER)
+        assert tool_messages[-1].content == latest
+        assert report["tool_messages_compressed"] == 1
+        assert report["tokens_used"] <= 1000
+        assert report["over_budget"] is False
+
+    def test_drops_oldest_turns_at_human_boundary(self, long_output):
+        """Should drop whole earlier turns and keep the current one."""
+        # Arrange
+        builder = ContextBuilder("gpt-4o", max_input_tokens=600, compressed_tool_tokens=200)
+        messages = (
+            _tool_turn("Pregunta uno", long_output, 1)
+            + [AIMessage(content="Respuesta uno " * 200, id="r1")]
+            + _tool_turn("Pregunta dos", long_output, 2)
+        )
+
+        # Act
+        context, report = builder.build("Sistema", messages)
+
+        # Assert
+        history = context[1:]
+        assert isinstance(history[0], HumanMessage)
+        assert history[0].content == "Pregunta dos"
+        assert isinstance(history[-1], ToolMessage)
+        assert report["messages_dropped"] == 4
+
+    def test_never_trims_current_turn_tool_output(self):
+        """Should drop an old chat turn instead of cutting the current leaflet."""
+        # Arrange
+        builder = ContextBuilder("gpt-4o", max_input_tokens=1000, compressed_tool_tokens=50)
+        leaflet = "[Source 1]\n" + "Tome un comprimido cada 8 horas. " * 60
+        messages = [
+            HumanMessage(content="Cuéntame del ibuprofeno " * 200, id="h1"),
+            AIMessage(content="El ibuprofeno es un antiinflamatorio. " * 150, id="r1"),
+        ] + _tool_turn("¿Y la dosis?", leaflet, 2)
+
+        # Act
+        context, report = builder.build("Sistema", messages)
+
+        # Assert
+        assert builder.count_message_tokens(messages[0]) > 1000
+        tool_messages = [m for m in context if isinstance(m, ToolMessage)]
+        assert tool_messages[0].content == leaflet
+        assert report["tool_messages_compressed"] == 0
+        assert report["messages_dropped"] == 2
+        assert report["over_budget"] is False
+
+    def test_reports_over_budget_when_current_turn_too_large(self, long_output):
+        """Should never drop the current turn, and flag the overflow instead."""
+        # Arrange
+        builder = ContextBuilder("gpt-4o", max_input_tokens=1000, compressed_tool_tokens=50)
+        question = HumanMessage(content="Pregunta " * 2000)
+
+        # Act
+        context, report = builder.build("Sistema", [question])
+
+        # Assert
+        assert context[-1] is question
+        assert report["over_budget"] is True
+
+    def test_does_not_mutate_state_messages(self, long_output):
+        """Should compress copies so checkpointed messages stay intact."""
+        # Arrange
+        builder = ContextBuilder("gpt-4o", max_input_tokens=300, compressed_tool_tokens=50)
+        messages = _tool_turn("Pregunta", long_output, 1) + [
+            HumanMessage(content="Otra pregunta", id="h2")
+        ]
+
+        # Act
+        _, report = builder.build("Sistema", messages)
+
+        # Assert
+        assert report["tool_messages_compressed"] == 1
+        assert messages[2].content == long_output
+
+    def test_records_report_in_metrics(self):
+        """Should store the budget report in the active tracker."""
+        # Arrange
+        tracker = MetricsTracker()
+        builder = ContextBuilder("gpt-4o", max_input_tokens=5000)
+
+        # Act
+        _, report = builder.build("Sistema", [HumanMessage(content="Hola")])
+
+        # Assert
+        assert tracker.finalize()["context_builds"] == [report]
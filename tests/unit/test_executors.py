@@ -0,0 +1,124 @@
+"""
+Unit tests for the bounded executors.
+Tests queue and wait metrics, context propagation, and pool isolation.
+"""
+
+import time
+import asyncio
+import threading
+import contextvars
+
+import pytest
+
+from src.utils.executors import (
+    DATABASE,
+    EMBEDDINGS,
+    BoundedExecutor,
+    executor_stats,
+    get_executor,
+    shutdown_executors,
+)
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+
+
+@pytest.fixture
+def executor():
+    """Single-worker pool, shut down after the test."""
+    executor = BoundedExecutor("test", max_workers=1, slow_wait=0)
+    yield executor
+    executor.shutdown()
+
+
+class TestBoundedExecutor:
+    """Tests for metrics and call semantics."""
+
+    def test_records_queue_depth_and_wait(self, executor):
+        """Should count calls waiting for the busy worker and their wait."""
+        # Arrange
+        release = threading.Event()
+        blocker = executor.submit(release.wait)
+        waiting = [executor.submit(time.sleep, 0) for _ in range(3)]
+
+        # Act
+        time.sleep(0.05)
+        busy = executor.stats()
+        release.set()
+        for future in [blocker, *waiting]:
+            future.result()
+        done = executor.stats()
+
+        # Assert
+        assert busy["active"] == 1
+        assert busy["queued"] == 3
+        assert done["max_queue_depth"] == 3
+        assert done["queued"] == 0 and done["active"] == 0
+        assert done["completed"] == 4
+        assert done["max_wait"] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_run_propagates_context_and_errors(self, executor):
+        """Should see the caller's context vars and re-raise failures."""
+        # Arrange
+        request_id.set("abc")
+
+        # Act
+        seen = await executor.run(request_id.get)
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(lambda: 1 / 0)
+
+        # Assert
+        assert seen == "abc"
+        assert executor.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_call_leaves_queue(self, executor):
+        """Should take a call cancelled while waiting for a thread off the queue."""
+        # Arrange
+        release = threading.Event()
+        blocker = executor.submit(release.wait)
+
+        # Act
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run(time.sleep, 0), 0.05)
+        release.set()
+        blocker.result()
+        stats = executor.stats()
+
+        # Assert
+        assert stats["queued"] == 0 and stats["active"] == 0
+        assert stats["cancelled"] == 1
+        assert stats["completed"] == 1
+
+    def test_submit_after_shutdown(self, executor):
+        """Should reject calls after shutdown without leaking queued counts."""
+        # Arrange
+        executor.shutdown()
+
+        # Act & Assert
+        with pytest.raises(RuntimeError):
+            executor.submit(time.sleep, 0)
+        assert executor.stats()["queued"] == 0
+
+
+class TestExecutorRegistry:
+    """Tests for the named process-wide pools."""
+
+    def test_pools_are_shared_and_isolated(self):
+        """Should reuse a pool per name and keep names on separate pools."""
+        # Act
+        embeddings = get_executor(EMBEDDINGS)
+        database = get_executor(DATABASE)
+
+        # Assert
+        assert get_executor(EMBEDDINGS) is embeddings
+        assert database is not embeddings
+        assert set(executor_stats()) >= {EMBEDDINGS, DATABASE}
+        shutdown_executors()
+        assert executor_stats() == {}
+
+    def test_unknown_pool(self):
+        """Should reject names without a configured size."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            get_executor("cohere")
@@ -0,0 +1,162 @@
+"""
+Unit tests for FakeChatModel.
+Tests rule-based responses, scripted mode, usage metadata, and injected
+latency and failures.
+"""
+
+import time
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.models.fake_llm import FakeChatModel, FakeLLMError
+from src.models.schemas import MedicineToolInput, UserIntent
+from src.services.llm_service import LLMService, create_llm
+
+
+@pytest.fixture
+def fake_llm():
+    """Rule-based fake model without latency."""
+    return FakeChatModel(seed=0)
+
+
+class TestRuleBasedResponses:
+    """Tests for role-specific rule-based behavior."""
+
+    @pytest.mark.asyncio
+    async def test_router_emits_valid_user_intent(self, fake_llm):
+        """Should return a UserIntent tool call that validates against the schema."""
+        # Act
+        service = LLMService(fake_llm)
+        tool_call = await service.invoke_with_structured_output(
+            "Pregunta: '¿Puedo tomar nolotil con alcohol?'", UserIntent
+        )
+
+        # Assert
+        intent = UserIntent(**tool_call["args"])
+        assert intent.intent == "pregunta_medicamento"
+        assert intent.medicine_name == "nolotil"
+
+    @pytest.mark.asyncio
+    async def test_router_detects_greeting(self, fake_llm):
+        """Should classify greetings as saludo_despedida."""
+        # Act
+        response = await fake_llm.ainvoke("Pregunta: 'Hola'", tools=[UserIntent])
+
+        # Assert
+        assert response.tool_calls[0]["args"]["intent"] == "saludo_despedida"
+
+    @pytest.mark.asyncio
+    async def test_agent_calls_medicine_tool_then_answers(self, fake_llm):
+        """Should call the medicine tool first and answer from the tool output."""
+        # Arrange
+        medicine_tool = MedicineToolInput.model_json_schema() | {
+            "title": "get_information_about_medicine"
+        }
+        agent = fake_llm.bind_tools([medicine_tool])
+        question = HumanMessage(content="¿Qué dosis de ibuprofeno?")
+
+        # Act
+        first = await agent.ainvoke([SystemMessage(content="sistema"), question])
+        tool_call = first.tool_calls[0]
+        second = await agent.ainvoke(
+            [
+                question,
+                first,
+                ToolMessage(content="[Source 1]\n600 mg cada 8 horas", tool_call_id=tool_call["id"]),
+            ]
+        )
+
+        # Assert
+        assert tool_call["name"] == "get_information_about_medicine"
+        assert MedicineToolInput(**tool_call["args"]).query == question.content
+        assert not second.tool_calls
+        assert "600 mg" in second.content
+
+    @pytest.mark.asyncio
+    async def test_rewriter_returns_query(self, fake_llm):
+        """Should echo the query to rewrite."""
+        # Arrange
+        prompt = (
+            "**Consulta Simple a Reescribir:**\nefectos del sintrom\n\n"
+            "**Consulta Reescrita:**"
+        )
+
+        # Act
+        response = await fake_llm.ainvoke(prompt)
+
+        # Assert
+        assert response.content == "efectos del sintrom"
+
+
+class TestScriptedAndUsage:
+    """Tests for scripted responses and usage metadata."""
+
+    def test_scripted_responses_cycle(self):
+        """Should replay scripted responses in order."""
+        # Arrange
+        llm = FakeChatModel(responses=["uno", AIMessage(content="dos")])
+
+        # Act
+        contents = [llm.invoke("x").content for _ in range(3)]
+
+        # Assert
+        assert contents == ["uno", "dos", "uno"]
+
+    def test_usage_metadata_reported(self, fake_llm):
+        """Should attach token usage like a real provider."""
+        # Act
+        response = fake_llm.invoke("Hola, ¿qué tal?" * 10)
+
+        # Assert
+        usage = response.usage_metadata
+        assert usage["input_tokens"] > 0
+        assert usage["total_tokens"] == usage["input_tokens"] + usage["output_tokens"]
+
+
+class TestInjection:
+    """Tests for latency and failure injection."""
+
+    @pytest.mark.asyncio
+    async def test_constant_latency(self):
+        """Should wait the configured latency."""
+        # Arrange
+        llm = FakeChatModel(latency_mean=0.05)
+
+        # Act
+        start = time.perf_counter()
+        await llm.ainvoke("Hola")
+
+        # Assert
+        assert time.perf_counter() - start >= 0.05
+
+    def test_lognormal_latency_is_reproducible(self):
+        """Should draw the same latencies for the same seed."""
+        # Arrange
+        params = {"latency_distribution": "lognormal", "latency_mean": 0.2,
+                  "latency_stddev": 0.1, "seed": 42}
+
+        # Act
+        first = FakeChatModel(**params)._sample_latency()
+        second = FakeChatModel(**params)._sample_latency()
+
+        # Assert
+        assert first == second
+        assert first > 0
+
+    def test_failure_injection(self):
+        """Should raise injected errors at the configured rate."""
+        # Arrange
+        llm = FakeChatModel(failure_rate=1.0)
+
+        # Act & Assert
+        with pytest.raises(FakeLLMError):
+            llm.invoke("Hola")
+
+    def test_create_llm_selects_fake_model(self):
+        """Should build FakeChatModel for model names starting with 'fake'."""
+        # Act
+        llm = create_llm(model_name="fake-router", api_key="")
+
+        # Assert
+        assert isinstance(llm, FakeChatModel)
+        assert llm.model_name == "fake-router"
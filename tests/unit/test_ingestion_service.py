@@ -0,0 +1,162 @@
+"""
+Unit tests for IngestionService.
+Tests multi-document ingestion with inline and process-pool chunking.
+"""
+
+import re
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.services.chunking_service import ChunkingService
+from src.services.ingestion_service import IngestionService
+from src.services.pdf_service import PDFParsingError
+
+FIXTURES = Path(__file__).parents[2] / "data_markdown"
+NOLOTIL = FIXTURES / "parsed_by_gemini-2-5-flash_nolotil_575.md"
+SINTROM = FIXTURES / "parsed_by_gemini-2-5-flash_sintrom_4.md"
+
+
+def _regex_sentences(text: str) -> list[str]:
+    """Stand-in sentence splitter that needs no NLTK data."""
+    return re.split(r"(?<=\.)\s+", text)
+
+
+@pytest.fixture
+def ingestion_service(mock_supabase):
+    """Service with mocked PDF parsing, embeddings, and database."""
+    chunking_service = ChunkingService()
+    chunking_service.sentence_splitter.split_text = _regex_sentences
+
+    pdf_service = Mock()
+    pdf_service.parse_pdf_to_markdown.side_effect = PDFParsingError("no pdf")
+    embeddings = Mock()
+    embeddings.embed_documents.side_effect = lambda texts: [[3.0, 4.0]] * len(texts)
+    mock_supabase.rpc.return_value.execute.return_value = Mock(data=2)
+
+    return IngestionService(
+        pdf_service=pdf_service,
+        chunking_service=chunking_service,
+        embeddings_model=embeddings,
+        supabase_client=mock_supabase,
+    )
+
+
+class TestRunPipelines:
+    """Tests for multi-document ingestion."""
+
+    def test_stores_each_document_and_reports_failures(
+        self, ingestion_service, mock_supabase, tmp_path
+    ):
+        """Should store every chunked document and keep going on failures."""
+        # Arrange
+        documents = [
+            ("data/nolotil_575.pdf", str(NOLOTIL)),
+            ("data/missing.pdf", str(tmp_path / "missing.md")),
+            ("data/sintrom_4.pdf", str(SINTROM)),
+        ]
+
+        # Act
+        results = ingestion_service.run_pipelines(documents)
+
+        # Assert
+        assert [r["status"] for r in results] == ["success", "failed", "success"]
+        assert [r.get("medicine_name") for r in results] == [
+            "nolotil",
+            None,
+            "sintrom",
+        ]
+        inserts = mock_supabase.table.return_value.insert.call_args_list
+        assert len(inserts) == 2
+        assert inserts[0].args[0][0]["embedding"] == pytest.approx([0.6, 0.8])
+
+
+class TestRegisterMedicine:
+    """Tests for registering ingested medicines in the catalogue."""
+
+    @staticmethod
+    def _fail_registration(mock_supabase, error):
+        """Makes the register_medicine RPC raise error; other RPCs succeed."""
+
+        def rpc(name, params):
+            call = Mock()
+            if name == "register_medicine":
+                call.execute.side_effect = error
+            else:
+                call.execute.return_value = Mock(data=2)
+            return call
+
+        mock_supabase.rpc.side_effect = rpc
+
+    def test_missing_function_bumps_version(self, ingestion_service, mock_supabase):
+        """Should only bump the version on databases without migration 006."""
+        # Arrange
+        self._fail_registration(
+            mock_supabase,
+            APIError(
+                {
+                    "code": "PGRST202",
+                    "message": "Could not find the function "
+                    "public.register_medicine",
+                }
+            ),
+        )
+
+        # Act
+        results = ingestion_service.run_pipelines(
+            [("data/nolotil_575.pdf", str(NOLOTIL))]
+        )
+
+        # Assert
+        assert results[0]["status"] == "success"
+        assert [c.args[0] for c in mock_supabase.rpc.call_args_list] == [
+            "register_medicine",
+            "bump_catalogue_version",
+        ]
+
+    def test_registration_error_fails_document(
+        self, ingestion_service, mock_supabase
+    ):
+        """Should report the document as failed instead of masking the error."""
+        # Arrange
+        self._fail_registration(
+            mock_supabase, APIError({"code": "23505", "message": "duplicate key"})
+        )
+
+        # Act
+        results = ingestion_service.run_pipelines(
+            [("data/nolotil_575.pdf", str(NOLOTIL))]
+        )
+
+        # Assert
+        assert results[0]["status"] == "failed"
+        assert "register medicine" in results[0]["error"]
+        assert [c.args[0] for c in mock_supabase.rpc.call_args_list] == [
+            "register_medicine"
+        ]
+
+
+class TestParallelChunking:
+    """Tests for chunking in worker processes."""
+
+    def test_same_chunks_as_inline(self, ingestion_service):
+        """Should yield every document with the chunks inline chunking makes."""
+        # Arrange
+        documents = [
+            ("data/nolotil_575.pdf", str(NOLOTIL)),
+            ("data/sintrom_4.pdf", str(SINTROM)),
+        ]
+
+        # Act
+        inline = dict(ingestion_service.chunk_documents(documents))
+        parallel = dict(ingestion_service.chunk_documents(documents, max_workers=2))
+
+        # Assert
+        assert set(parallel) == {"nolotil_575.pdf", "sintrom_4.pdf"}
+        for pdf_filename, (md_filename, name, ingredients, chunks) in inline.items():
+            assert parallel[pdf_filename][:3] == (md_filename, name, ingredients)
+            assert [c.page_content for c in parallel[pdf_filename][3]] == [
+                c.page_content for c in chunks
+            ]
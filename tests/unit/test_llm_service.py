@@ -0,0 +1,267 @@
+"""
+Unit tests for LLMService.
+Tests circuit breaker transitions and provider failover.
+"""
+
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from langchain_core.messages import AIMessage
+
+from src.services.llm_service import LLMService, LLMError
+from src.utils.metrics import MetricsTracker
+from src.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+
+
+@pytest.fixture
+def breaker():
+    """Circuit breaker that opens after two failures and probes immediately."""
+    return CircuitBreaker(
+        "primary", failure_threshold=2, recovery_timeout=0, half_open_successes=2
+    )
+
+
+@pytest.fixture
+def failing_model():
+    """Mock model whose calls always fail."""
+    model = Mock()
+    model.ainvoke = AsyncMock(side_effect=RuntimeError("provider down"))
+    return model
+
+
+@pytest.fixture
+def healthy_model():
+    """Mock model whose calls always succeed."""
+    model = Mock()
+    model.ainvoke = AsyncMock(return_value=AIMessage(content="fallback answer"))
+    return model
+
+
+class TestCircuitBreaker:
+    """Tests for circuit breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Should open once the failure threshold is reached."""
+        # Arrange
+        breaker = CircuitBreaker("model", failure_threshold=3, recovery_timeout=60)
+
+        # Act
+        for _ in range(3):
+            breaker.record_failure()
+
+        # Assert
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow_request() is False
+
+    def test_success_resets_failure_count(self):
+        """Should only count consecutive failures."""
+        # Arrange
+        breaker = CircuitBreaker("model", failure_threshold=2, recovery_timeout=60)
+
+        # Act
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        # Assert
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_probes_close_circuit(self, breaker):
+        """Should close again after enough successful half-open probes."""
+        # Arrange
+        breaker.record_failure()
+        breaker.record_failure()
+
+        # Act & Assert
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False  # Probe budget exhausted
+        breaker.record_success()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_failure_reopens_circuit(self):
+        """Should reopen if a half-open probe fails."""
+        # Arrange
+        breaker = CircuitBreaker("model", failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.allow_request() is True  # Half-open probe
+
+        # Act
+        breaker.recovery_timeout = 60
+        breaker.record_failure()
+
+        # Assert
+        assert breaker.state == CircuitState.OPEN
+
+
+class TestProviderFailover:
+    """Tests for routing calls to the fallback model."""
+
+    @pytest.mark.asyncio
+    async def test_switches_to_fallback_when_circuit_opens(
+        self, failing_model, healthy_model, breaker
+    ):
+        """Should send the remaining attempts to the fallback model."""
+        # Arrange
+        breaker.recovery_timeout = 60
+        service = LLMService(
+            failing_model,
+            max_retries=3,
+            fallback_model=healthy_model,
+            circuit_breaker=breaker,
+            fallback_circuit_breaker=CircuitBreaker("fallback"),
+        )
+
+        # Act
+        response = await service.invoke_with_retry("¿Qué es el ibuprofeno?")
+
+        # Assert
+        assert response.content == "fallback answer"
+        assert failing_model.ainvoke.await_count == 2
+        assert healthy_model.ainvoke.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_primary(self, failing_model, healthy_model):
+        """Should not call the primary model while its circuit is open."""
+        # Arrange
+        breaker = CircuitBreaker("primary", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        service = LLMService(
+            failing_model,
+            fallback_model=healthy_model,
+            circuit_breaker=breaker,
+            fallback_circuit_breaker=CircuitBreaker("fallback"),
+        )
+
+        # Act
+        await service.invoke_with_retry("Hola")
+
+        # Assert
+        failing_model.ainvoke.assert_not_awaited()
+        healthy_model.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fails_fast_without_fallback(self, failing_model):
+        """Should raise immediately when the circuit is open and no fallback exists."""
+        # Arrange
+        breaker = CircuitBreaker("primary", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        service = LLMService(failing_model, circuit_breaker=breaker)
+
+        # Act & Assert
+        with pytest.raises(CircuitOpenError):
+            await service.invoke_with_retry("Hola")
+        failing_model.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_structured_output_uses_fallback(
+        self, failing_model, healthy_model
+    ):
+        """Should request structured output from the fallback model as well."""
+        # Arrange
+        breaker = CircuitBreaker("primary", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        healthy_model.ainvoke = AsyncMock(
+            return_value=AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "UserIntent",
+                        "args": {"intent": "saludo_despedida"},
+                        "id": "call_1",
+                    }
+                ],
+            )
+        )
+        service = LLMService(
+            failing_model,
+            fallback_model=healthy_model,
+            circuit_breaker=breaker,
+            fallback_circuit_breaker=CircuitBreaker("fallback"),
+        )
+
+        # Act
+        tool_call = await service.invoke_with_structured_output("Hola", Mock(__name__="UserIntent"))
+
+        # Assert
+        assert tool_call["args"]["intent"] == "saludo_despedida"
+
+    @pytest.mark.asyncio
+    async def test_without_fallback_errors_propagate(self, failing_model):
+        """Should keep the original retry behavior when no fallback is configured."""
+        # Arrange
+        service = LLMService(
+            failing_model,
+            max_retries=1,
+            circuit_breaker=CircuitBreaker("primary", failure_threshold=5),
+        )
+
+        # Act & Assert
+        with pytest.raises(LLMError):
+            await service.invoke_with_retry("Hola")
+
+
+class TestUsageAccounting:
+    """Tests for usage metadata capture."""
+
+    @pytest.mark.asyncio
+    async def test_records_cached_prompt_tokens(self, healthy_model):
+        """Should record provider cache reads alongside input tokens."""
+        # Arrange
+        healthy_model.ainvoke = AsyncMock(
+            return_value=AIMessage(
+                content="ok",
+                usage_metadata={
+                    "input_tokens": 1500,
+                    "output_tokens": 20,
+                    "total_tokens": 1520,
+                    "input_token_details": {"cache_read": 1024},
+                },
+            )
+        )
+        tracker = MetricsTracker()
+        service = LLMService(healthy_model, circuit_breaker=CircuitBreaker("cached"))
+
+        # Act
+        await service.invoke_with_retry("Hola", node="agent")
+
+        # Assert
+        call = tracker.finalize()["llm_calls"][0]
+        assert call["cached_tokens"] == 1024
+        assert call["input_tokens"] == 1500
+
+
+class TestLazyProviderImports:
+    """Tests that provider SDKs load only when their provider is selected."""
+
+    def test_fake_model_loads_no_provider_sdk(self):
+        """Should create a fake model without importing OpenAI or Google SDKs."""
+        # Arrange
+        code = (
+            "import sys\n"
+            "from src.services.llm_service import create_llm\n"
+            "create_llm('fake', api_key='')\n"
+            "print(sorted(m for m in ('langchain_openai', 'langchain_google_genai')"
+            " if m in sys.modules))"
+        )
+
+        # Act
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            text=True,
+        )
+
+        # Assert
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
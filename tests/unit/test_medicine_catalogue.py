@@ -0,0 +1,160 @@
+"""
+Unit tests for MedicineCatalogue.
+Tests versioned refresh, background reloads, and the atomic swap into
+MedicineService.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from src.database.catalogue import MedicineCatalogue
+from src.services.llm_service import LLMService
+from src.services.medicine_service import MedicineService
+
+
+class FakeDatabase:
+    """Supabase client stub answering the catalogue RPCs."""
+
+    def __init__(self, medicines: list[str], version: str = "1:100"):
+        self.medicines = medicines
+        self.version = version
+        self.fail = False
+        self.calls: list[str] = []
+
+    def rpc(self, name: str, params: dict):  # noqa: ARG002
+        self.calls.append(name)
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        data = {
+            "get_catalogue_version": self.version,
+            "get_distinct_medicine_names": [
+                {"medicine_name": name} for name in self.medicines
+            ],
+            "get_medicine_active_ingredients": [],
+        }[name]
+        return Mock(execute=Mock(return_value=Mock(data=data)))
+
+
+@pytest.fixture
+def database():
+    """Database holding two leaflets."""
+    return FakeDatabase(["nolotil", "sintrom"])
+
+
+@pytest.fixture
+def catalogue(database):
+    """Loaded catalogue probing on every turn, without TTL."""
+    catalogue = MedicineCatalogue(database, ttl=0, probe_interval=0.001)
+    catalogue.load()
+    return catalogue
+
+
+class TestMedicineCatalogue:
+    """Tests for versioned catalogue refresh."""
+
+    def test_load_notifies_subscribers(self, database):
+        """Should load medicines and version and notify subscribers."""
+        # Arrange
+        catalogue = MedicineCatalogue(database)
+        listener = Mock()
+        catalogue.subscribe(listener)
+
+        # Act
+        catalogue.load()
+
+        # Assert
+        assert catalogue.medicines == ["nolotil", "sintrom"]
+        assert catalogue.version == "1:100"
+        listener.assert_called_once_with(catalogue)
+
+    def test_unchanged_version_only_probes(self, catalogue, database):
+        """Should not reload when the version is unchanged."""
+        # Arrange
+        database.calls.clear()
+
+        # Act
+        reloaded = catalogue.refresh()
+
+        # Assert
+        assert reloaded is False
+        assert database.calls == ["get_catalogue_version"]
+
+    def test_new_version_reloads(self, catalogue, database):
+        """Should reload when ingestion bumped the version."""
+        # Arrange
+        database.medicines.append("lexatin")
+        database.version = "2:140"
+
+        # Act
+        reloaded = catalogue.refresh()
+
+        # Assert
+        assert reloaded is True
+        assert catalogue.version == "2:140"
+        assert "lexatin" in catalogue.medicines
+
+    def test_expired_ttl_reloads_without_probe(self, database):
+        """Should reload after the TTL even if the version is unchanged."""
+        # Arrange
+        catalogue = MedicineCatalogue(database, ttl=0.001, probe_interval=0)
+        catalogue.load()
+        catalogue._loaded_at -= 1
+        database.calls.clear()
+
+        # Act
+        reloaded = catalogue.refresh()
+
+        # Assert
+        assert reloaded is True
+        assert "get_distinct_medicine_names" in database.calls
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_snapshot(self, catalogue, database):
+        """Should keep serving the previous catalogue if a reload fails."""
+        # Arrange
+        catalogue._probed_at -= 1
+        database.fail = True
+
+        # Act
+        reloaded = await catalogue.maybe_refresh()
+
+        # Assert
+        assert reloaded is False
+        assert catalogue.medicines == ["nolotil", "sintrom"]
+        assert catalogue.version == "1:100"
+
+
+class TestCatalogueHotReload:
+    """Tests for new leaflets going live in MedicineService."""
+
+    @pytest.mark.asyncio
+    async def test_new_medicine_accepted_after_background_refresh(
+        self, catalogue, database
+    ):
+        """Should resolve a newly ingested medicine without a restart."""
+        # Arrange
+        service = MedicineService(Mock(spec=LLMService), catalogue.medicines)
+        catalogue.subscribe(
+            lambda c: service.update_catalogue(c.medicines, c.active_ingredients)
+        )
+        assert service._resolve_medicines("lexatin") == []
+        database.medicines.append("lexatin")
+        database.version = "2:140"
+        catalogue._probed_at -= 1
+
+        # Act
+        await catalogue.maybe_refresh()
+
+        # Assert
+        assert service._resolve_medicines("lexatin") == ["lexatin"]
+        assert "lexatin" in service.known_medicines
+
+    @pytest.mark.asyncio
+    async def test_refresh_not_due_is_not_scheduled(self, database):
+        """Should not schedule anything before the probe interval."""
+        # Arrange
+        catalogue = MedicineCatalogue(database, ttl=300, probe_interval=30)
+        catalogue.load()
+
+        # Act & Assert
+        assert catalogue.maybe_refresh() is None
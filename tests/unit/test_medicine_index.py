@@ -0,0 +1,117 @@
+"""
+Unit tests for MedicineIndex.
+Tests resolution of misspellings, strengths, and active ingredients to
+canonical medicine names, and lookup cost at catalogue scale.
+"""
+
+import random
+import string
+import time
+
+import pytest
+
+from src.utils.medicine_index import MedicineIndex, normalize
+
+MEDICINES = ["espidifen", "ibuprofeno cinfa", "lexatin", "nolotil", "sintrom"]
+ACTIVE_INGREDIENTS = {
+    "espidifen": ["ibuprofeno"],
+    "ibuprofeno cinfa": ["ibuprofeno"],
+    "lexatin": ["bromazepam"],
+    "nolotil": ["metamizol magnésico"],
+    "sintrom": ["acenocumarol"],
+}
+
+
+@pytest.fixture
+def index():
+    """Index over the leaflets in data/."""
+    return MedicineIndex(MEDICINES, ACTIVE_INGREDIENTS)
+
+
+class TestNormalize:
+    """Tests for text normalization."""
+
+    def test_drops_accents_strengths_and_units(self):
+        """Should keep only the name words."""
+        # Act & Assert
+        assert normalize("Nolotil 575mg Cápsulas") == "nolotil"
+        assert normalize("Lexatín 3 mg") == "lexatin"
+
+
+class TestMedicineIndex:
+    """Tests for resolving user text to canonical names."""
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("nolotil 575mg", ["nolotil"]),
+            ("Ibuprofeno Cinfa 600", ["ibuprofeno cinfa"]),
+            ("sintron", ["sintrom"]),
+            ("bromacepam", ["lexatin"]),
+            ("metamizol", ["nolotil"]),
+            ("acenocumarol 4mg", ["sintrom"]),
+        ],
+    )
+    def test_resolves_to_canonical_name(self, index, text, expected):
+        """Should resolve brands, typos, and ingredients to the product."""
+        # Act & Assert
+        assert index.resolve(text) == expected
+
+    def test_ingredient_resolves_to_every_product(self, index):
+        """Should return all products sharing an active ingredient."""
+        # Act
+        result = index.resolve("ibuprofeno")
+
+        # Assert
+        assert result == ["espidifen", "ibuprofeno cinfa"]
+
+    def test_exact_match_wins_over_fuzzy(self, index):
+        """Should not add fuzzy candidates when a name matches exactly."""
+        # Act
+        result = index.resolve("¿puedo tomar sintrom con nolotil?")
+
+        # Assert
+        assert result == ["sintrom", "nolotil"]
+
+    @pytest.mark.parametrize("text", ["aspirina", "ibuprofenoide", "", "600 mg"])
+    def test_unknown_text_resolves_to_nothing(self, index, text):
+        """Should not resolve unknown names or words beyond the typo budget."""
+        # Act & Assert
+        assert index.resolve(text) == []
+
+
+def _catalogue(size: int, seed: int = 0) -> list[str]:
+    """Synthetic product names with a laboratory suffix."""
+    rng = random.Random(seed)
+    labs = ["", " cinfa", " kern", " normon", " sandoz"]
+    return [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12)))
+        + rng.choice(labs)
+        for _ in range(size)
+    ] + MEDICINES
+
+
+@pytest.mark.slow
+class TestMedicineIndexBenchmark:
+    """Microbenchmark: lookups stay sub-millisecond at 10k products."""
+
+    @pytest.mark.parametrize(
+        "text", ["nolotil 575mg", "sintron", "dosis de bromacepam para dormir"]
+    )
+    def test_lookup_under_one_millisecond(self, text):
+        """Should resolve exact and fuzzy lookups in under 1 ms."""
+        # Arrange
+        index = MedicineIndex(_catalogue(10_000), ACTIVE_INGREDIENTS)
+        repeats = 200
+
+        # Act
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                result = index.resolve(text)
+            timings.append((time.perf_counter() - start) / repeats)
+
+        # Assert
+        assert result
+        assert min(timings) < 1e-3
@@ -0,0 +1,104 @@
+"""
+Unit tests for MedicineMatcher.
+Tests whole-word matching semantics and that lookup cost does not grow with
+catalogue size.
+"""
+
+import random
+import string
+import time
+
+import pytest
+
+from src.utils.medicine_matcher import MedicineMatcher
+
+
+def _catalogue(size: int, seed: int = 0) -> list[str]:
+    """Synthetic product names, half of them with a strength suffix."""
+    rng = random.Random(seed)
+    names = []
+    for _ in range(size):
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12)))
+        if rng.random() < 0.5:
+            name += f" {rng.choice([5, 10, 400, 600])}"
+        names.append(name)
+    return names + ["ibuprofeno", "ibuprofeno cinfa"]
+
+
+def _lookup_time(matcher: MedicineMatcher, text: str, repeats: int = 2000) -> float:
+    """Best-of-five seconds per lookup."""
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            matcher.find(text)
+        timings.append((time.perf_counter() - start) / repeats)
+    return min(timings)
+
+
+class TestMedicineMatcher:
+    """Tests for matching semantics."""
+
+    def test_matches_whole_words_only(self):
+        """Should match names as whole words, not inside other words."""
+        # Arrange
+        matcher = MedicineMatcher(["ibuprofeno", "nolotil"])
+
+        # Act & Assert
+        assert matcher.find("ibuprofeno 600 mg") == "ibuprofeno"
+        assert matcher.find("ibuprofenoide") is None
+
+    def test_longest_name_wins(self):
+        """Should prefer the longest name starting at the same position."""
+        # Arrange
+        matcher = MedicineMatcher(["ibuprofeno", "ibuprofeno cinfa"])
+
+        # Act & Assert
+        assert matcher.find("ibuprofeno cinfa 600") == "ibuprofeno cinfa"
+        assert matcher.find("ibuprofeno cinfalux") == "ibuprofeno"
+
+    def test_case_insensitive_and_escaped(self):
+        """Should ignore case and treat regex characters literally."""
+        # Arrange
+        matcher = MedicineMatcher(["Paracetamol EFG", "a.b"])
+
+        # Act & Assert
+        assert matcher.find("dosis de PARACETAMOL efg") == "paracetamol efg"
+        assert matcher.find("axb") is None
+
+    def test_find_all_in_order(self):
+        """Should return every match once, in order of appearance."""
+        # Arrange
+        matcher = MedicineMatcher(["ibuprofeno", "paracetamol"])
+
+        # Act
+        result = matcher.find_all("paracetamol o ibuprofeno, o paracetamol")
+
+        # Assert
+        assert result == ["paracetamol", "ibuprofeno"]
+
+    def test_empty_catalogue(self):
+        """Should match nothing without a catalogue."""
+        # Act & Assert
+        assert MedicineMatcher([]).find("ibuprofeno") is None
+
+
+@pytest.mark.slow
+class TestMedicineMatcherBenchmark:
+    """Microbenchmark: lookup cost must not scale with the catalogue."""
+
+    def test_lookup_time_independent_of_catalogue_size(self):
+        """Should keep lookups at 10k names close to lookups at 100 names."""
+        # Arrange
+        text = "¿cuál es la dosis de ibuprofeno cinfa 600 para niños pequeños?"
+        small = MedicineMatcher(_catalogue(100))
+        large = MedicineMatcher(_catalogue(10_000))
+
+        # Act
+        small_time = _lookup_time(small, text)
+        large_time = _lookup_time(large, text)
+
+        # Assert
+        assert large.find(text) == "ibuprofeno cinfa"
+        assert large_time < 5 * small_time
+        assert large_time < 1e-4
@@ -7,7 +7,7 @@ import pytest
 from unittest.mock import Mock
 from langchain_core.messages import HumanMessage
 
-from src.services.medicine_service import MedicineService
+from src.services.medicine_service import MedicineService, ROUTER_SYSTEM_MESSAGE
 from src.services.llm_service import LLMService
 from src.models.domain import AgentState
 
@@ -21,7 +21,9 @@ def llm_service():
 @pytest.fixture
 def medicine_service(llm_service, known_medicines):
     """Create MedicineService with mocked dependencies."""
-    return MedicineService(llm_service, known_medicines)
+    return MedicineService(
+        llm_service, known_medicines, {"nolotil": ["metamizol magnésico"]}
+    )
 
 
 class TestMedicineMatching:
@@ -33,10 +35,10 @@ class TestMedicineMatching:
         medicine = "ibuprofeno"
         
         # Act
-        result = medicine_service._find_matching_medicine(medicine)
+        result = medicine_service._resolve_medicines(medicine)
         
         # Assert
-        assert result == "ibuprofeno"
+        assert result == ["ibuprofeno"]
 
     def test_case_insensitive_match(self, medicine_service):
         """Should match regardless of case."""
@@ -44,10 +46,10 @@ class TestMedicineMatching:
         medicine = "IBUPROFENO"
         
         # Act
-        result = medicine_service._find_matching_medicine(medicine.lower())
+        result = medicine_service._resolve_medicines(medicine.lower())
         
         # Assert
-        assert result == "ibuprofeno"
+        assert result == ["ibuprofeno"]
 
     def test_partial_match_with_word_boundaries(self, medicine_service):
         """Should match medicine name within longer string."""
@@ -55,10 +57,10 @@ class TestMedicineMatching:
         medicine = "ibuprofeno 600 mg"
         
         # Act
-        result = medicine_service._find_matching_medicine(medicine)
+        result = medicine_service._resolve_medicines(medicine)
         
         # Assert
-        assert result == "ibuprofeno"
+        assert result == ["ibuprofeno"]
 
     def test_no_partial_substring_match(self, medicine_service):
         """Should NOT match if medicine is substring without word boundary."""
@@ -66,10 +68,10 @@ class TestMedicineMatching:
         medicine = "ibuprofenoide"  # Contains "ibuprofeno" but not as word
         
         # Act
-        result = medicine_service._find_matching_medicine(medicine)
+        result = medicine_service._resolve_medicines(medicine)
         
         # Assert
-        assert result is None
+        assert result == []
 
     def test_no_match_unknown_medicine(self, medicine_service):
         """Should return None for unknown medicine."""
@@ -77,10 +79,10 @@ class TestMedicineMatching:
         medicine = "aspirina"  # Not in known_medicines
         
         # Act
-        result = medicine_service._find_matching_medicine(medicine)
+        result = medicine_service._resolve_medicines(medicine)
         
         # Assert
-        assert result is None
+        assert result == []
 
     def test_match_with_brand_name(self, medicine_service):
         """Should match medicine by brand name if in known list."""
@@ -88,10 +90,26 @@ class TestMedicineMatching:
         medicine = "nolotil 575"
         
         # Act
-        result = medicine_service._find_matching_medicine(medicine)
+        result = medicine_service._resolve_medicines(medicine)
         
         # Assert
-        assert result == "nolotil"
+        assert result == ["nolotil"]
+
+    def test_misspelled_medicine(self, medicine_service):
+        """Should resolve a name within a couple of typos."""
+        # Act
+        result = medicine_service._resolve_medicines("lexatim 3mg")
+
+        # Assert
+        assert result == ["lexatin"]
+
+    def test_match_by_active_ingredient(self, medicine_service):
+        """Should resolve an active ingredient to its medicines."""
+        # Act
+        result = medicine_service._resolve_medicines("metamizol")
+
+        # Assert
+        assert result == ["nolotil"]
 
 
 class TestIntentValidation:
@@ -171,6 +189,7 @@ class TestIntentClassification:
         # Assert
         assert result["intent"] == "pregunta_medicamento"
         assert "ibuprofeno" in result["current_medicines"]
+        assert result["resolved_medicines"] == ["ibuprofeno"]
 
     @pytest.mark.asyncio
     async def test_classify_unknown_medicine_question(self, medicine_service, llm_service):
@@ -197,6 +216,7 @@ class TestIntentClassification:
         # Assert
         assert result["intent"] == "pregunta_no_autorizada"
         assert len(result["current_medicines"]) == 0
+        assert result["resolved_medicines"] == []
 
     @pytest.mark.asyncio
     async def test_classify_general_question(self, medicine_service, llm_service):
@@ -223,6 +243,31 @@ class TestIntentClassification:
         # Assert
         assert result["intent"] == "saludo_despedida"
 
+    @pytest.mark.asyncio
+    async def test_prompt_prefix_is_stable(self, medicine_service, llm_service):
+        """Should send the same static system prefix with the question after it."""
+        # Arrange
+        llm_service.invoke_with_structured_output.return_value = {
+            "args": {"intent": "saludo_despedida", "medicine_name": None}
+        }
+        prompts = []
+
+        # Act
+        for question in ("Hola", "¿Qué es el ibuprofeno?"):
+            state: AgentState = {
+                "messages": [HumanMessage(content=question)],
+                "intent": None,
+                "current_medicines": [],
+                "summary": "",
+                "turn_count": 0,
+            }
+            await medicine_service.classify_intent_and_validate(state)
+            prompts.append(llm_service.invoke_with_structured_output.call_args.args[0])
+
+        # Assert
+        assert prompts[0][0] == prompts[1][0] == ROUTER_SYSTEM_MESSAGE
+        assert "¿Qué es el ibuprofeno?" in prompts[1][-1].content
+
     @pytest.mark.asyncio
     async def test_fallback_on_llm_error(self, medicine_service, llm_service):
         """Should fallback to general question on LLM error."""
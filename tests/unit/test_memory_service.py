@@ -1,6 +1,6 @@
 """
 Unit tests for MemoryService.
-Tests conversation summarization, message pruning, and turn counting.
+Tests incremental summarization, message pruning, and turn counting.
 """
 
 import pytest
@@ -25,8 +25,8 @@ def llm_service():
 
 @pytest.fixture
 def memory_service(llm_service):
-    """Create MemoryService with mocked dependencies."""
-    return MemoryService(llm_service)
+    """Create MemoryService that keeps only the latest turn verbatim."""
+    return MemoryService(llm_service, keep_recent_tokens=0)
 
 
 class TestConversationSummarization:
@@ -40,6 +40,8 @@ class TestConversationSummarization:
             "messages": [
                 HumanMessage(content="¿Qué es el ibuprofeno?", id="msg1"),
                 AIMessage(content="Es un AINE...", id="msg2"),
+                HumanMessage(content="¿Y la dosis?", id="msg3"),
+                AIMessage(content="400 mg cada 8 horas...", id="msg4"),
             ],
             "intent": None,
             "current_medicines": [],
@@ -70,6 +72,8 @@ class TestConversationSummarization:
             "messages": [
                 HumanMessage(content="¿Tiene efectos secundarios?", id="msg3"),
                 AIMessage(content="Sí, puede causar...", id="msg4"),
+                HumanMessage(content="¿Y con alcohol?", id="msg5"),
+                AIMessage(content="No se recomienda...", id="msg6"),
             ],
             "intent": None,
             "current_medicines": [],
@@ -88,8 +92,8 @@ class TestConversationSummarization:
         assert "efectos secundarios" in result["summary"].lower()
 
     @pytest.mark.asyncio
-    async def test_summarize_clears_all_messages(self, memory_service, llm_service):
-        """Should remove all messages from state."""
+    async def test_summarize_keeps_latest_turn(self, memory_service, llm_service):
+        """Should remove only the messages before the latest turn."""
         # Arrange
         state: AgentState = {
             "messages": [
@@ -110,8 +114,118 @@ class TestConversationSummarization:
         result = await memory_service.summarize_conversation(state)
 
         # Assert
-        assert len(result["messages"]) == 4
+        assert [msg.id for msg in result["messages"]] == ["msg1", "msg2"]
         assert all(isinstance(msg, RemoveMessage) for msg in result["messages"])
+        assert result["window_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_keeps_recent_turns_within_budget(self, llm_service):
+        """Should keep as many newest turns as fit in keep_recent_tokens."""
+        # Arrange
+        memory_service = MemoryService(llm_service, keep_recent_tokens=40)
+        state: AgentState = {
+            "messages": [
+                HumanMessage(content="Pregunta antigua " * 20, id="msg1"),
+                AIMessage(content="Respuesta antigua " * 20, id="msg2"),
+                HumanMessage(content="Pregunta 2", id="msg3"),
+                AIMessage(content="Respuesta 2", id="msg4"),
+                HumanMessage(content="Pregunta 3", id="msg5"),
+                AIMessage(content="Respuesta 3", id="msg6"),
+            ],
+            "summary": "",
+        }
+        llm_service.invoke_with_retry.return_value = AIMessage(content="Summary")
+
+        # Act
+        result = await memory_service.summarize_conversation(state)
+
+        # Assert
+        assert [msg.id for msg in result["messages"]] == ["msg1", "msg2"]
+
+    @pytest.mark.asyncio
+    async def test_skips_single_turn(self, memory_service, llm_service):
+        """Should not call the LLM when only the latest turn is in the window."""
+        # Arrange
+        state: AgentState = {
+            "messages": [
+                HumanMessage(content="¿Qué es el ibuprofeno?", id="msg1"),
+                AIMessage(content="Es un AINE...", id="msg2"),
+            ],
+            "summary": "",
+        }
+
+        # Act
+        result = await memory_service.summarize_conversation(state)
+
+        # Assert
+        assert result == {}
+        llm_service.invoke_with_retry.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_excludes_tool_messages_from_prompt(
+        self, memory_service, llm_service
+    ):
+        """Should summarize questions and answers but not tool traffic."""
+        # Arrange
+        state: AgentState = {
+            "messages": [
+                HumanMessage(content="¿Dosis del ibuprofeno?", id="msg1"),
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": "get_information_about_medicine",
+                            "args": {"query": "dosis ibuprofeno"},
+                            "id": "call_1",
+                        }
+                    ],
+                    id="msg2",
+                ),
+                ToolMessage(
+                    content="FRAGMENTO DEL PROSPECTO", tool_call_id="call_1", id="msg3"
+                ),
+                AIMessage(content="400 mg cada 8 horas", id="msg4"),
+                HumanMessage(content="Gracias", id="msg5"),
+                AIMessage(content="De nada", id="msg6"),
+            ],
+            "summary": "",
+        }
+        llm_service.invoke_with_retry.return_value = AIMessage(content="Summary")
+
+        # Act
+        result = await memory_service.summarize_conversation(state)
+
+        # Assert
+        prompt = llm_service.invoke_with_retry.call_args.args[0][1].content
+        assert "400 mg cada 8 horas" in prompt
+        assert "FRAGMENTO DEL PROSPECTO" not in prompt
+        assert len(result["messages"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_caps_long_summary(self, llm_service):
+        """Should truncate summaries longer than max_summary_tokens."""
+        # Arrange
+        memory_service = MemoryService(
+            llm_service, keep_recent_tokens=0, max_summary_tokens=50
+        )
+        state: AgentState = {
+            "messages": [
+                HumanMessage(content="Pregunta 1", id="msg1"),
+                AIMessage(content="Respuesta 1", id="msg2"),
+                HumanMessage(content="Pregunta 2", id="msg3"),
+                AIMessage(content="Respuesta 2", id="msg4"),
+            ],
+            "summary": "",
+        }
+        llm_service.invoke_with_retry.return_value = AIMessage(
+            content="Resumen muy largo. " * 100
+        )
+
+        # Act
+        result = await memory_service.summarize_conversation(state)
+
+        # Assert
+        assert memory_service._count_text(result["summary"]) <= 50
 
 
 class TestMessagePruning:
@@ -155,6 +269,65 @@ class TestMessagePruning:
         assert len(result["messages"]) == 2  # Should remove AIMessage + ToolMessage
         assert all(isinstance(msg, RemoveMessage) for msg in result["messages"])
 
+    def test_retains_tool_results_as_chunk_records(self, llm_service):
+        """Should keep pruned tool artifacts as compact records in state."""
+        # Arrange
+        memory_service = MemoryService(llm_service, retain_tool_results=True)
+        record = {
+            "id": "42",
+            "medicine_name": "ibuprofeno",
+            "path": "3. Cómo tomar",
+            "similarity": 0.8,
+            "query": "dosis ibuprofeno",
+        }
+        state: AgentState = {
+            "messages": [
+                HumanMessage(content="¿Dosis del ibuprofeno?", id="msg1"),
+                AIMessage(
+                    content="",
+                    id="msg2",
+                    tool_calls=[
+                        {
+                            "name": "get_info",
+                            "args": {"query": "dosis ibuprofeno"},
+                            "id": "call1",
+                        }
+                    ],
+                ),
+                ToolMessage(
+                    content="[Source 1] 400 mg...",
+                    artifact=[record],
+                    tool_call_id="call1",
+                    id="msg3",
+                ),
+                AIMessage(content="400 mg cada 8 horas", id="msg4"),
+            ],
+            "retrieved_chunks": [{**record, "similarity": 0.5}],
+        }
+
+        # Act
+        result = memory_service.prune_tool_messages(state)
+
+        # Assert
+        assert len(result["messages"]) == 2
+        assert result["retrieved_chunks"] == [record]
+
+    def test_retained_embeddings_are_capped(self, llm_service):
+        """Should drop embeddings from all but the newest chunk records."""
+        # Arrange
+        memory_service = MemoryService(
+            llm_service, retain_tool_results=True, max_embedded_chunks=1
+        )
+        retained = [{"id": "1", "embedding": [0.1]}]
+
+        # Act
+        merged = memory_service._merge_retained(
+            retained, [{"id": "2", "embedding": [0.2]}]
+        )
+
+        # Assert
+        assert merged == [{"id": "1"}, {"id": "2", "embedding": [0.2]}]
+
     def test_no_pruning_if_agent_still_has_tool_calls(self, memory_service):
         """Should not prune if last message has tool_calls."""
         # Arrange
@@ -0,0 +1,137 @@
+"""
+Unit tests for metrics tracking.
+Tests LLM call accounting, cost estimation, and per-thread rollups.
+"""
+
+import pytest
+
+from src.utils.metrics import MetricsTracker, ThreadMetrics, record_llm_call
+from src.utils.pricing import estimate_cost
+
+
+class TestCostEstimation:
+    """Tests for price table lookups."""
+
+    def test_known_model_cost(self):
+        """Should price input and output tokens per 1M tokens."""
+        # Act
+        cost = estimate_cost("gpt-4o", 1_000_000, 1_000_000)
+
+        # Assert
+        assert cost == pytest.approx(12.50)
+
+    def test_longest_prefix_wins(self):
+        """Should use the most specific price entry for dated snapshots."""
+        # Act
+        mini_cost = estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0)
+
+        # Assert
+        assert mini_cost == pytest.approx(0.15)
+
+    def test_gemini_models_prefix_is_ignored(self):
+        """Should match Gemini model names reported with 'models/' prefix."""
+        # Act
+        cost = estimate_cost("models/gemini-2.5-flash", 1_000_000, 0)
+
+        # Assert
+        assert cost == pytest.approx(0.30)
+
+    def test_cached_tokens_use_cached_price(self):
+        """Should bill cache reads at the discounted cached-input price."""
+        # Act
+        cost = estimate_cost("gpt-4o", 1_000_000, 0, cached_tokens=800_000)
+
+        # Assert
+        assert cost == pytest.approx(0.2 * 2.50 + 0.8 * 1.25)
+
+    def test_unknown_model_costs_zero(self):
+        """Should not fail for models missing from the price table."""
+        # Act & Assert
+        assert estimate_cost("some-local-model", 1000, 1000) == 0.0
+
+
+class TestLLMCallAccounting:
+    """Tests for recording LLM calls in the active tracker."""
+
+    def test_record_llm_call_updates_active_tracker(self):
+        """Should add tokens and cost to the tracker in context."""
+        # Arrange
+        tracker = MetricsTracker()
+
+        # Act
+        record_llm_call("router", "gemini-2.5-flash", 200, 20, 0.4)
+        record_llm_call("agent", "gpt-4o", 3000, 150, 1.8)
+        metrics = tracker.finalize()
+
+        # Assert
+        assert metrics["tokens"] == {
+            "input": 3200,
+            "output": 170,
+            "cached": 0,
+            "total": 3370,
+        }
+        assert len(metrics["llm_calls"]) == 2
+        assert metrics["cost"] == pytest.approx(
+            estimate_cost("gemini-2.5-flash", 200, 20)
+            + estimate_cost("gpt-4o", 3000, 150)
+        )
+
+    def test_finalize_rolls_up_by_node_and_model(self):
+        """Should aggregate calls per node and per model."""
+        # Arrange
+        tracker = MetricsTracker()
+        tracker.add_llm_call("router", "gemini-2.5-flash", 100, 10, 0.3)
+        tracker.add_llm_call("query_rewriter", "gemini-2.5-flash", 300, 30, 0.5)
+        tracker.add_llm_call("agent", "gpt-4o", 2000, 100, 1.5)
+
+        # Act
+        metrics = tracker.finalize()
+
+        # Assert
+        by_node = metrics["llm_summary"]["by_node"]
+        by_model = metrics["llm_summary"]["by_model"]
+        assert set(by_node) == {"router", "query_rewriter", "agent"}
+        assert by_model["gemini-2.5-flash"]["calls"] == 2
+        assert by_model["gemini-2.5-flash"]["input_tokens"] == 400
+        assert by_node["agent"]["total_time"] == pytest.approx(1.5)
+
+
+    def test_cache_hit_rate(self):
+        """Should report the share of input tokens served from the prefix cache."""
+        # Arrange
+        tracker = MetricsTracker()
+        tracker.add_llm_call("agent", "gpt-4o", 2000, 100, 1.2, cached_tokens=1536)
+        tracker.add_llm_call("router", "gemini-2.5-flash", 2000, 10, 0.3)
+
+        # Act
+        metrics = tracker.finalize()
+
+        # Assert
+        assert metrics["tokens"]["cached"] == 1536
+        assert metrics["cache_hit_rate"] == pytest.approx(0.384)
+        assert metrics["llm_summary"]["by_node"]["agent"]["cached_tokens"] == 1536
+
+
+class TestThreadMetrics:
+    """Tests for per-thread rollups across turns."""
+
+    def test_accumulates_turns(self):
+        """Should sum tokens, cost, and per-node totals over turns."""
+        # Arrange
+        thread_metrics = ThreadMetrics("thread-1")
+
+        for _ in range(2):
+            tracker = MetricsTracker()
+            tracker.add_llm_call("agent", "gpt-4o", 1000, 100, 1.0)
+            thread_metrics.add_turn(tracker.finalize())
+
+        # Act
+        summary = thread_metrics.summary()
+
+        # Assert
+        assert summary["turns"] == 2
+        assert summary["tokens"]["total"] == 2200
+        assert summary["by_node"]["agent"]["calls"] == 2
+        assert summary["cost"] == pytest.approx(
+            2 * estimate_cost("gpt-4o", 1000, 100)
+        )
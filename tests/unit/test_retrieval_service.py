@@ -0,0 +1,324 @@
+"""
+Unit tests for RetrievalService.
+Tests chunk records, re-materialization of retained sections, and
+re-ranking of retained chunks by embedding.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from src.database.chunk_store import ChunkStore
+from src.graph.nodes import GraphNodes
+from src.services.llm_service import LLMService
+from src.services.retrieval_service import RetrievalService, chunk_records
+
+
+def _doc(chunk_id: str, path: str, similarity: float) -> Document:
+    """Retrieved chunk of the ibuprofen leaflet."""
+    return Document(
+        id=chunk_id,
+        page_content=f"Contenido {chunk_id}",
+        metadata={
+            "medicine_name": "ibuprofeno cinfa",
+            "path": path,
+            "similarity": similarity,
+        },
+    )
+
+
+DOSAGE_DOCS = [
+    _doc("1", "3. Cómo tomar Ibuprofeno > Uso en niños", 0.82),
+    _doc("2", "3. Cómo tomar Ibuprofeno > Uso en niños", 0.79),
+]
+SIDE_EFFECT_DOCS = [_doc("3", "4. Posibles efectos adversos", 0.75)]
+
+
+@pytest.fixture
+def chunk_store():
+    """Chunk store holding the retrieved chunks."""
+    store = ChunkStore(max_size=10)
+    store.put_many(DOSAGE_DOCS + SIDE_EFFECT_DOCS)
+    return store
+
+
+@pytest.fixture
+def retrieval_service(chunk_store):
+    """RetrievalService with a mocked retriever."""
+    retriever = Mock()
+    retriever.ainvoke = AsyncMock(return_value=DOSAGE_DOCS)
+    return RetrievalService(retriever, Mock(spec=LLMService), chunk_store=chunk_store)
+
+
+@pytest.fixture
+def retained():
+    """Records kept in state after earlier turns."""
+    return chunk_records(DOSAGE_DOCS, "dosis ibuprofeno niños") + chunk_records(
+        SIDE_EFFECT_DOCS, "efectos adversos ibuprofeno"
+    )
+
+
+class TestChunkRecords:
+    """Tests for compact records of retrieved chunks."""
+
+    def test_records_keep_ids_paths_and_similarity(self):
+        """Should keep only the identifying fields of each chunk."""
+        # Act
+        records = chunk_records(SIDE_EFFECT_DOCS, "efectos adversos")
+
+        # Assert
+        assert records == [
+            {
+                "id": "3",
+                "medicine_name": "ibuprofeno cinfa",
+                "path": "4. Posibles efectos adversos",
+                "similarity": 0.75,
+                "query": "efectos adversos",
+            }
+        ]
+
+
+class TestResolveRetained:
+    """Tests for answering follow-ups from retained chunks."""
+
+    def test_follow_up_resolves_to_retrieved_section(
+        self, retrieval_service, retained
+    ):
+        """Should return the section's chunks ordered by similarity."""
+        # Act
+        docs = retrieval_service.resolve_retained(
+            "¿Cómo tomar ibuprofeno en niños pequeños?", retained
+        )
+
+        # Assert
+        assert [doc.id for doc in docs] == ["1", "2"]
+
+    def test_other_section_is_not_resolved(self, retrieval_service, retained):
+        """Should fall through to search for sections not retrieved yet."""
+        # Act
+        docs = retrieval_service.resolve_retained(
+            "¿Cómo conservar el ibuprofeno?", retained
+        )
+
+        # Assert
+        assert docs is None
+
+    def test_other_medicine_is_not_resolved(self, retrieval_service, retained):
+        """Should require the query to name the retained medicine."""
+        # Act
+        docs = retrieval_service.resolve_retained(
+            "Posibles efectos adversos del paracetamol", retained
+        )
+
+        # Assert
+        assert docs is None
+
+    def test_resolved_medicine_filters_sections(self, retrieval_service, retained):
+        """Should not serve another product sharing a keyword with the query."""
+        # Arrange
+        query = "¿Cómo tomar ibuprofeno kern en niños?"
+
+        # Act
+        unfiltered = retrieval_service.resolve_retained(query, retained)
+        filtered = retrieval_service.resolve_retained(
+            query, retained, ["ibuprofeno kern"]
+        )
+
+        # Assert
+        assert unfiltered is not None
+        assert filtered is None
+
+    def test_evicted_chunks_fall_through(self, retained):
+        """Should return None when the chunks left the chunk store."""
+        # Arrange
+        service = RetrievalService(
+            Mock(), Mock(spec=LLMService), chunk_store=ChunkStore(max_size=10)
+        )
+
+        # Act
+        docs = service.resolve_retained("efectos adversos ibuprofeno", retained)
+
+        # Assert
+        assert docs is None
+
+    @pytest.mark.asyncio
+    async def test_search_fills_chunk_store(self):
+        """Should store searched documents for later turns."""
+        # Arrange
+        store = ChunkStore(max_size=10)
+        retriever = Mock()
+        retriever.ainvoke = AsyncMock(return_value=DOSAGE_DOCS)
+        service = RetrievalService(retriever, Mock(spec=LLMService), chunk_store=store)
+
+        # Act
+        await service.search_medicine_info("dosis ibuprofeno niños")
+
+        # Assert
+        assert store.get_many(["1", "2"]) == DOSAGE_DOCS
+
+    @pytest.mark.asyncio
+    async def test_search_filters_by_resolved_medicines(self, retrieval_service):
+        """Should restrict the vector search to the resolved medicines."""
+        # Act
+        await retrieval_service.search_medicine_info(
+            "dosis en niños", ["ibuprofeno cinfa"]
+        )
+
+        # Assert
+        retrieval_service.retriever.ainvoke.assert_awaited_once_with(
+            "dosis en niños", filter_medicines=["ibuprofeno cinfa"]
+        )
+
+
+class TestRerankRetained:
+    """Tests for cosine re-ranking of retained chunk embeddings."""
+
+    @pytest.fixture
+    def embedded(self):
+        """Records with 2-d embeddings: two dosage chunks, one side effect."""
+        records = chunk_records(DOSAGE_DOCS + SIDE_EFFECT_DOCS, "consulta")
+        embeddings = ([1.0, 0.0], [0.9, 0.1], [0.0, 1.0])
+        for record, embedding in zip(records, embeddings):
+            record["embedding"] = embedding
+        return records
+
+    def _service(self, chunk_store, query_embedding):
+        """RetrievalService whose embeddings return a fixed query vector."""
+        embeddings = Mock()
+        embeddings.embed_query.return_value = query_embedding
+        return RetrievalService(
+            Mock(),
+            Mock(spec=LLMService),
+            chunk_store=chunk_store,
+            embeddings=embeddings,
+            cache_min_similarity=0.8,
+        )
+
+    @pytest.mark.asyncio
+    async def test_returns_similar_chunks_best_first(self, chunk_store, embedded):
+        """Should return retained chunks above the threshold, best first."""
+        # Arrange
+        service = self._service(chunk_store, [0.95, 0.05])
+
+        # Act
+        docs = await service.rerank_retained("¿y para niños?", embedded)
+
+        # Assert
+        assert [doc.id for doc in docs] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_falls_through_below_threshold(self, chunk_store, embedded):
+        """Should return None when no retained chunk is similar enough."""
+        # Arrange
+        service = self._service(chunk_store, [0.7, 0.7])
+
+        # Act
+        docs = await service.rerank_retained("¿cómo se conserva?", embedded)
+
+        # Assert
+        assert docs is None
+
+    @pytest.mark.asyncio
+    async def test_search_retained_prefers_section_match(
+        self, chunk_store, embedded
+    ):
+        """Should not embed the query when a section already matches."""
+        # Arrange
+        service = self._service(chunk_store, [0.0, 1.0])
+
+        # Act
+        docs = await service.search_retained(
+            "Cómo tomar ibuprofeno en niños", embedded
+        )
+
+        # Assert
+        assert [doc.id for doc in docs] == ["1", "2"]
+        service.embeddings.embed_query.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_other_medicine_skips_retained_chunks(
+        self, chunk_store, embedded
+    ):
+        """Should not answer a follow-up about another medicine from cache."""
+        # Arrange
+        service = self._service(chunk_store, [1.0, 0.0])
+
+        # Act
+        docs = await service.search_retained(
+            "¿y el sintrom para niños?", embedded, ["sintrom"]
+        )
+
+        # Assert
+        assert docs is None
+        service.embeddings.embed_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rerank_only_considers_given_medicines(
+        self, chunk_store, embedded
+    ):
+        """Should re-rank only the chunks of the turn's medicines."""
+        # Arrange
+        service = self._service(chunk_store, [1.0, 0.0])
+        embedded[0]["medicine_name"] = "sintrom"
+
+        # Act
+        docs = await service.rerank_retained(
+            "¿y para niños?", embedded, ["Ibuprofeno Cinfa"]
+        )
+
+        # Assert
+        assert [doc.id for doc in docs] == ["2"]
+
+
+class TestRetrievalCacheNode:
+    """Tests for answering tool calls from retained chunks."""
+
+    @pytest.mark.parametrize(
+        ("resolved", "current", "expected"),
+        [
+            (["sintrom"], ["ibuprofeno cinfa", "sintrom"], ["sintrom"]),
+            ([], ["ibuprofeno cinfa"], ["ibuprofeno cinfa"]),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_filters_by_turn_medicines(self, resolved, current, expected):
+        """Should pass this turn's medicines, else the conversation's."""
+        # Arrange
+        retrieval_service = Mock()
+        retrieval_service.search_retained = AsyncMock(return_value=None)
+        nodes = GraphNodes(Mock(), retrieval_service, Mock(), Mock(), Mock(), Mock())
+        tool_call = {"name": "tool", "args": {"query": "dosis"}, "id": "c1"}
+        state = {
+            "messages": [AIMessage(content="", tool_calls=[tool_call])],
+            "retrieved_chunks": [{"id": "1"}],
+            "resolved_medicines": resolved,
+            "current_medicines": current,
+        }
+
+        # Act
+        result = await nodes.retrieval_cache_node(state)
+
+        # Assert
+        assert result == {}
+        retrieval_service.search_retained.assert_awaited_once_with(
+            "dosis", [{"id": "1"}], expected
+        )
+
+
+class TestChunkStore:
+    """Tests for the process-local chunk store."""
+
+    def test_evicts_least_recently_used(self):
+        """Should drop the oldest chunks beyond max_size."""
+        # Arrange
+        store = ChunkStore(max_size=2)
+
+        # Act
+        store.put_many(DOSAGE_DOCS + SIDE_EFFECT_DOCS)
+
+        # Assert
+        assert len(store) == 2
+        assert store.get_many(["1"]) is None
+        assert store.get_many(["2", "3"]) is not None
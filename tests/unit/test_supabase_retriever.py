@@ -0,0 +1,172 @@
+"""
+Unit tests for SupabaseRetriever and PostgresRetriever.
+Tests RPC selection and parameters for filtered and adaptive searches.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from supabase import Client
+from langchain_core.embeddings import Embeddings
+
+from src.database.supabase import DatabaseError, SupabaseRetriever
+from src.database.postgres_retriever import PostgresRetriever
+from src.utils.executors import EMBEDDINGS, get_executor
+
+ROWS = [
+    {"id": 1, "content": "Dosis", "metadata": {"path": "3."}, "similarity": 0.81},
+    {"id": 2, "content": "Niños", "metadata": {"path": "3."}, "similarity": 0.74},
+]
+
+
+@pytest.fixture
+def client():
+    """Supabase client returning two matches."""
+    client = Mock(spec=Client)
+    client.rpc.return_value.execute.return_value = Mock(data=ROWS)
+    return client
+
+
+def _retriever(client, **kwargs) -> SupabaseRetriever:
+    """Retriever with a fixed 2-d query embedding."""
+    embeddings = Mock(spec=Embeddings)
+    embeddings.embed_query.return_value = [0.6, 0.8]
+    return SupabaseRetriever(supabase_client=client, embeddings_model=embeddings, **kwargs)
+
+
+class TestSupabaseRetriever:
+    """Tests for the match_documents RPC calls."""
+
+    @pytest.mark.asyncio
+    async def test_default_search_keeps_similarity(self, client):
+        """Should call match_documents and keep ids and similarity."""
+        # Act
+        docs = await _retriever(client).ainvoke("dosis")
+
+        # Assert
+        client.rpc.assert_called_once_with(
+            "match_documents", {"query_embedding": [0.6, 0.8], "match_count": 5}
+        )
+        assert [doc.id for doc in docs] == ["1", "2"]
+        assert docs[0].metadata["similarity"] == 0.81
+
+    @pytest.mark.asyncio
+    async def test_tuned_search_uses_adaptive_rpc(self, client):
+        """Should send ef_search and cutoffs to match_documents_adaptive."""
+        # Arrange
+        retriever = _retriever(
+            client, top_k=10, ef_search=100, max_similarity_gap=0.2
+        )
+
+        # Act
+        await retriever.ainvoke("dosis", filter_medicines=["nolotil"])
+
+        # Assert
+        client.rpc.assert_called_once_with(
+            "match_documents_adaptive",
+            {
+                "query_embedding": [0.6, 0.8],
+                "match_count": 10,
+                "filter_medicines": ["nolotil"],
+                "ef_search": 100,
+                "max_relative_gap": 0.2,
+            },
+        )
+
+    def test_per_call_override(self, client):
+        """Should let a call path override the configured search quality."""
+        # Arrange
+        retriever = _retriever(client, ef_search=40)
+
+        # Act
+        retriever.invoke("dosis", ef_search=200, min_similarity=0.5)
+
+        # Assert
+        name, params = client.rpc.call_args.args
+        assert name == "match_documents_adaptive"
+        assert params["ef_search"] == 200
+        assert params["min_similarity"] == 0.5
+
+
+@pytest.fixture
+def pool():
+    """Async connection pool whose connection returns the two matches."""
+    conn = Mock()
+    conn.execute = AsyncMock()
+    conn.execute.return_value.fetchall = AsyncMock(
+        return_value=[
+            {**ROWS[0], "embedding": np.array([0.6, 0.8], dtype=np.float32)},
+            ROWS[1],
+        ]
+    )
+    pool = Mock()
+    pool.open = AsyncMock()
+    pool.connection.return_value = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = conn
+    return pool
+
+
+def _postgres_retriever(pool, **kwargs) -> PostgresRetriever:
+    """Postgres retriever with a fixed 2-d query embedding."""
+    embeddings = Mock(spec=Embeddings)
+    embeddings.embed_query.return_value = [0.6, 0.8]
+    return PostgresRetriever(pool=pool, embeddings_model=embeddings, **kwargs)
+
+
+class TestPostgresRetriever:
+    """Tests for the direct connection pool backend."""
+
+    @pytest.mark.asyncio
+    async def test_sends_binary_vector_with_named_arguments(self, pool):
+        """Should call the same function with a binary float32 query vector."""
+        # Arrange
+        retriever = _postgres_retriever(pool, min_similarity=0.5)
+
+        # Act
+        await retriever.ainvoke("dosis", filter_medicines=["nolotil"])
+
+        # Assert
+        conn = pool.connection.return_value.__aenter__.return_value
+        sql, params = conn.execute.call_args.args
+        assert sql == (
+            "select * from match_documents_adaptive(query_embedding => "
+            "%(query_embedding)b, match_count => %(match_count)s, "
+            "filter_medicines => %(filter_medicines)s, "
+            "min_similarity => %(min_similarity)s)"
+        )
+        assert params["query_embedding"].dtype == np.float32
+        assert params["filter_medicines"] == ["nolotil"]
+        pool.open.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_builds_serializable_documents(self, pool):
+        """Should return the same documents as the PostgREST backend."""
+        # Act
+        docs = await _postgres_retriever(pool).ainvoke("dosis")
+
+        # Assert
+        assert [doc.id for doc in docs] == ["1", "2"]
+        assert docs[0].metadata["similarity"] == 0.81
+        assert docs[0].metadata["embedding"] == pytest.approx([0.6, 0.8])
+        assert isinstance(docs[0].metadata["embedding"], list)
+
+    @pytest.mark.asyncio
+    async def test_embeds_on_embeddings_pool(self, pool):
+        """Should embed on the bounded embeddings pool like SupabaseRetriever."""
+        # Arrange
+        retriever = _postgres_retriever(pool)
+        submitted = get_executor(EMBEDDINGS).stats()["submitted"]
+
+        # Act
+        await retriever.ainvoke("dosis")
+
+        # Assert
+        assert get_executor(EMBEDDINGS).stats()["submitted"] == submitted + 1
+        retriever.embeddings_model.embed_query.assert_called_once_with("dosis")
+        retriever.embeddings_model.aembed_query.assert_not_called()
+
+    def test_sync_invoke_not_supported(self, pool):
+        """Should refuse sync calls instead of blocking on the async pool."""
+        # Act & Assert
+        with pytest.raises(DatabaseError):
+            _postgres_retriever(pool).invoke("dosis")